@@ -1,46 +1,179 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, request, jsonify, render_template, Response, stream_with_context
 from flask_cors import CORS
 import os
-from werkzeug.utils import secure_filename
+import json
+import itertools
+import multiprocessing
+import signal
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
 import re
-from syllabus_checker import SyllabusChecker
+from syllabus_checker import (SyllabusChecker, check_file_reporting_start, configure_bulletin_cache,
+                              get_bulletin_status, init_check_worker)
+from syllabus_jobs import JobStore, JobRunner, JobQueueFull
+from result_cache import ResultCache
 
 app = Flask(__name__)
 CORS(app)
 
 # Configuration
-UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'pdf', 'docx', 'txt'}
 MAX_FILE_SIZE = 16 * 1024 * 1024  # 16MB
+CHECK_WORKERS = os.cpu_count() or 1  # Processes per multi-file batch (1 = check inline)
+CHECK_TIMEOUT = 120  # Seconds each file's check may run
+CHECK_START_POLL = 0.5  # Seconds between checks for queued files that have started
+JOB_WORKERS = 2  # Background jobs processed at the same time
+JOB_QUEUE_LIMIT = 50  # Maximum queued plus running jobs
+JOB_RESULTS_PAGE_SIZE = 20
+RESULT_CACHE_SIZE = 256  # Results kept in memory per process
+RESULT_CACHE_TTL = 24 * 3600  # Seconds; results include VCU Bulletin data
+BULLETIN_CACHE_TTL_HOURS = 1
+BULLETIN_RATE_LIMIT = 2.0  # Requests per second to bulletin.vcu.edu, across all processes
+BULLETIN_RATE_BURST = 2
 
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
+app.config['CHECK_WORKERS'] = int(os.environ.get('CHECK_WORKERS', CHECK_WORKERS))
+app.config['CHECK_TIMEOUT'] = float(os.environ.get('CHECK_TIMEOUT', CHECK_TIMEOUT))
+app.config['JOB_WORKERS'] = int(os.environ.get('JOB_WORKERS', JOB_WORKERS))
+app.config['JOB_QUEUE_LIMIT'] = int(os.environ.get('JOB_QUEUE_LIMIT', JOB_QUEUE_LIMIT))
+app.config['JOBS_DB'] = os.environ.get('JOBS_DB', os.path.join(app.instance_path, 'jobs.db'))
+app.config['RESULT_CACHE_SIZE'] = int(os.environ.get('RESULT_CACHE_SIZE', RESULT_CACHE_SIZE))
+app.config['RESULT_CACHE_TTL'] = float(os.environ.get('RESULT_CACHE_TTL', RESULT_CACHE_TTL))
+app.config['RESULT_CACHE_DB'] = os.environ.get('RESULT_CACHE_DB')  # Optional shared on-disk tier
+app.config['BULLETIN_CACHE_DB'] = os.environ.get('BULLETIN_CACHE_DB', os.path.join(app.instance_path, 'bulletin_cache.db'))
+app.config['BULLETIN_CACHE_TTL_HOURS'] = float(os.environ.get('BULLETIN_CACHE_TTL_HOURS', BULLETIN_CACHE_TTL_HOURS))
+app.config['BULLETIN_RATE_LIMIT'] = float(os.environ.get('BULLETIN_RATE_LIMIT', BULLETIN_RATE_LIMIT))
+app.config['BULLETIN_RATE_BURST'] = int(os.environ.get('BULLETIN_RATE_BURST', BULLETIN_RATE_BURST))
 
-# Create uploads directory if it doesn't exist
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+# One checker per process: its ruleset is immutable and all per-file state
+# lives in a per-call context, so it is safe to share across request threads
+checker = SyllabusChecker()
+
+# Result cache keyed by file content, created on first use
+_result_cache = None
+_result_cache_lock = threading.Lock()
+
+# Background job runner, started with the app (see the end of this module)
+_job_runner = None
+_job_runner_lock = threading.Lock()
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-@app.route('/')
-def index():
-    return render_template('index.html')
+def bulletin_cache_settings():
+    """Bulletin cache and rate limit arguments shared by this process and pool workers"""
+    return (
+        app.config['BULLETIN_CACHE_DB'],
+        app.config['BULLETIN_CACHE_TTL_HOURS'],
+        app.config['BULLETIN_RATE_LIMIT'],
+        app.config['BULLETIN_RATE_BURST']
+    )
 
-@app.route('/api/check-syllabus', methods=['POST'])
-def check_syllabus():
-    # Check if files were uploaded
-    if 'files' not in request.files:
-        return jsonify({'error': 'No files uploaded'}), 400
+# Bulletin lookups made by inline checks share the same cache file as the pool
+configure_bulletin_cache(*bulletin_cache_settings())
+
+def start_check_pool(size):
+    """
+    Start a process pool for one batch.
     
-    files = request.files.getlist('files')
+    Each batch owns its pool, so a crash or a timeout kill in one batch
+    never touches checks of other requests or jobs.
     
-    # Check if any files were selected
-    if not files or all(f.filename == '' for f in files):
-        return jsonify({'error': 'No files selected'}), 400
+    Returns:
+        tuple: (ProcessPoolExecutor, queue on which its workers report each
+               check they start; see check_file_reporting_start)
+    """
+    started = multiprocessing.SimpleQueue()
+    pool = ProcessPoolExecutor(
+        max_workers=size,
+        initializer=init_check_worker,
+        initargs=(started, *bulletin_cache_settings())
+    )
+    return pool, started
+
+def stop_check_pool(pool, started, pids=()):
+    """Shut a batch's pool down, first killing the workers in pids (checks that must not finish)"""
+    for pid in pids:
+        try:
+            os.kill(pid, getattr(signal, 'SIGKILL', signal.SIGTERM))
+        except OSError:
+            pass  # Already gone
+    pool.shutdown(wait=False, cancel_futures=True)
+    started.close()
+
+class BatchStats:
+    """Accumulates batch statistics one file result at a time"""
+    
+    def __init__(self):
+        self.total_files = 0
+        self.failed = 0
+        self.required_percentages = []
+        self.required_found = []
     
-    results_list = []
-    checker = SyllabusChecker()
+    def add(self, result):
+        self.total_files += 1
+        if 'error' in result:
+            self.failed += 1
+        else:
+            self.required_percentages.append(result['required']['percentage'])
+            self.required_found.append(result['required']['found'])
     
+    def to_dict(self):
+        successful = len(self.required_percentages)
+        batch_stats = {
+            'total_files': self.total_files,
+            'successful': successful,
+            'failed': self.failed
+        }
+        
+        if successful:
+            batch_stats['average_required_percentage'] = round(sum(self.required_percentages) / successful, 1)
+            batch_stats['average_required_found'] = round(sum(self.required_found) / successful, 1)
+        
+        return batch_stats
+
+def get_result_cache():
+    """Get the process-wide result cache, creating it on first use"""
+    global _result_cache
+    with _result_cache_lock:
+        if _result_cache is None:
+            _result_cache = ResultCache(
+                checker.fingerprint,
+                max_entries=app.config['RESULT_CACHE_SIZE'],
+                disk_path=app.config['RESULT_CACHE_DB'],
+                ttl_seconds=app.config['RESULT_CACHE_TTL']
+            )
+        return _result_cache
+
+def get_job_runner():
+    """Get the background job runner, starting it (and resuming unfinished jobs) if needed"""
+    global _job_runner
+    with _job_runner_lock:
+        if _job_runner is None:
+            _job_runner = JobRunner(
+                JobStore(app.config['JOBS_DB']),
+                iter_check_results,
+                workers=app.config['JOB_WORKERS'],
+                queue_limit=app.config['JOB_QUEUE_LIMIT']
+            )
+        return _job_runner
+
+def calculate_batch_stats(results_list):
+    """Aggregate per-file results into batch statistics"""
+    stats = BatchStats()
+    for result in results_list:
+        stats.add(result)
+    return stats.to_dict()
+
+def file_error(filename, message):
+    return {'filename': filename, 'error': f'Error processing file: {message}'}
+
+def collect_uploads(files):
+    """Turn uploaded files into batch entries (rejected types carry an error)"""
+    entries = []
     for file in files:
         # Skip empty filenames
         if file.filename == '':
@@ -48,55 +181,314 @@ def check_syllabus():
             
         # Check if file type is allowed
         if not allowed_file(file.filename):
-            results_list.append({
+            entries.append({
                 'filename': file.filename,
                 'error': 'File type not allowed. Please upload PDF, DOCX, or TXT files.'
             })
             continue
         
+        entries.append({'filename': file.filename, 'source': file.stream})
+    return entries
+
+def iter_check_results(entries):
+    """
+    Check a batch and yield (index, result) as soon as each file is scored.
+    
+    Entries with a 'source' (bytes or binary stream) are checked; entries
+    without one are passed through as-is (e.g. rejected file types).
+    Results arrive in completion order, not upload order; index is the
+    file's position in the batch. One file failing never affects the others.
+    A pooled file still running CHECK_TIMEOUT seconds after its check
+    started is reported as timed out.
+    
+    Files already in the result cache are answered without checking, and
+    files with identical content in one batch are checked only once.
+    Successful results carry 'cache_hit' to say which path produced them.
+    """
+    cache = get_result_cache()
+    cache_keys = {}
+    duplicates = {}
+    first_index_for_key = {}
+    to_check = []
+    
+    for index, entry in enumerate(entries):
+        if 'source' not in entry:
+            yield index, entry
+            continue
+        
+        source = entry['source']
+        data = source if isinstance(source, bytes) else source.read()
+        key = cache.key_for(data, entry['filename'])
+        cached = cache.get(key)
+        if cached is not None:
+            yield index, dict(cached, filename=entry['filename'], cache_hit=True)
+        elif key in first_index_for_key:
+            # Same content earlier in this batch: check it once and share the result
+            duplicates[first_index_for_key[key]].append(index)
+        else:
+            first_index_for_key[key] = index
+            cache_keys[index] = key
+            duplicates[index] = []
+            to_check.append((index, data))
+    
+    def finished(index, result):
+        """Yield a checked result for its file and any duplicates of it"""
+        if 'error' not in result:
+            # Pattern-only scores from a failed bulletin lookup are not kept,
+            # so a re-upload gets the bulletin check once it is back
+            if not result.get('bulletin_validation', {}).get('lookup_failed'):
+                cache.set(cache_keys[index], result)
+            result['cache_hit'] = False
+        result['filename'] = entries[index]['filename']
+        yield index, result
+        for duplicate in duplicates[index]:
+            shared = dict(result, filename=entries[duplicate]['filename'])
+            if 'error' not in result:
+                shared['cache_hit'] = True
+            yield duplicate, shared
+    
+    if len(to_check) > 1 and app.config['CHECK_WORKERS'] > 1:
+        files = [(index, entries[index]['filename'], data) for index, data in to_check]
+        for index, result in iter_pool_results(files):
+            yield from finished(index, result)
+        return
+    
+    for index, data in to_check:
         try:
-            # Save the file temporarily
-            filename = secure_filename(file.filename)
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(filepath)
+            result = checker.check_syllabus(data, entries[index]['filename'])
+        except Exception as e:
+            result = file_error(entries[index]['filename'], str(e))
+        yield from finished(index, result)
+
+def iter_pool_results(files):
+    """
+    Check files on a process pool of their own and yield (index, result) as each finishes.
+    
+    Args:
+        files: List of (index, filename, data) tuples
+    
+    At most CHECK_WORKERS files are in flight, so when a worker crashes and
+    takes the pool down, only the files in flight can have caused it; files
+    still waiting are simply submitted to a fresh pool. The files that were
+    in flight are checked again one at a time, so a second crash is pinned on
+    the file that caused it and only that file reports an error.
+    
+    Each file gets CHECK_TIMEOUT seconds from when its worker reports that
+    the check started. A running check cannot be cancelled, so when one
+    overruns, this batch's busy workers are killed and its pool is replaced;
+    the other files that were in flight are checked again on the new pool.
+    Other batches run on pools of their own and are never affected.
+    """
+    timeout = app.config['CHECK_TIMEOUT']
+    workers = min(app.config['CHECK_WORKERS'], len(files))
+    waiting = deque(files)
+    suspects = deque()
+    # future -> [ticket, file, isolated, worker pid, deadline]; pid and deadline once started
+    in_flight = {}
+    tickets = itertools.count()
+    pool, started = start_check_pool(workers)
+    
+    try:
+        while waiting or suspects or in_flight:
+            # Suspects run alone, after everything else in flight has finished
+            while True:
+                if suspects:
+                    if in_flight:
+                        break
+                    file, isolated = suspects.popleft(), True
+                elif waiting and len(in_flight) < workers:
+                    file, isolated = waiting.popleft(), False
+                else:
+                    break
+                _, filename, data = file
+                ticket = next(tickets)
+                # Workers receive the file bytes; nothing is written to disk
+                future = pool.submit(check_file_reporting_start, ticket, data, filename)
+                in_flight[future] = [ticket, file, isolated, None, None]
             
-            # Check the syllabus
-            results = checker.check_syllabus(filepath)
-            results['filename'] = file.filename
+            # A submitted check may wait in the pool's queues before a worker
+            # takes it; its deadline counts from the worker's start report
+            now, wall_now = time.monotonic(), time.time()
+            by_ticket = {state[0]: state for state in in_flight.values()}
+            while not started.empty():
+                ticket, pid, started_at = started.get()
+                if ticket in by_ticket:
+                    by_ticket[ticket][3:] = [pid, now + timeout - max(wall_now - started_at, 0)]
+            deadlines = [state[4] for state in in_flight.values() if state[4] is not None]
+            if len(deadlines) < len(in_flight):
+                deadlines.append(now + CHECK_START_POLL)
             
-            # Clean up the uploaded file
-            os.remove(filepath)
+            done, _ = wait(in_flight, timeout=max(min(deadlines) - now, 0), return_when=FIRST_COMPLETED)
+            broken = any(isinstance(future.exception(), BrokenProcessPool) for future in done)
+            if broken:
+                # A crash fails every call left in the pool at once; collect them all
+                done, _ = wait(in_flight)
             
-            results_list.append(results)
-        
-        except Exception as e:
-            results_list.append({
-                'filename': file.filename,
-                'error': f'Error processing file: {str(e)}'
-            })
+            for future in done:
+                _, file, isolated, _, _ = in_flight.pop(future)
+                index, filename, _ = file
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    if not isolated:
+                        suspects.append(file)
+                        continue
+                    result = file_error(filename, 'worker process terminated unexpectedly')
+                except Exception as e:
+                    result = file_error(filename, str(e))
+                yield index, result
+            
+            if broken:
+                stop_check_pool(pool, started)
+                pool, started = start_check_pool(workers)
+                continue
+            
+            now = time.monotonic()
+            overdue = [future for future, state in in_flight.items() if state[4] is not None and state[4] <= now]
+            if overdue:
+                # Kill the overdue workers along with the other busy ones, which
+                # go down with the pool anyway, and start those files over
+                busy = [state[3] for state in in_flight.values() if state[3] is not None]
+                timed_out = [in_flight.pop(future)[1] for future in overdue]
+                for _, file, isolated, _, _ in in_flight.values():
+                    (suspects if isolated else waiting).appendleft(file)
+                in_flight.clear()
+                stop_check_pool(pool, started, busy)
+                pool, started = start_check_pool(workers)
+                for index, filename, _ in timed_out:
+                    yield index, file_error(filename, f"timed out after {timeout:g} seconds")
+    finally:
+        # Also reached when the consumer stops early; nobody wants those results
+        stop_check_pool(pool, started, [state[3] for state in in_flight.values() if state[3] is not None])
+
+def requested_stream_format():
+    """Streaming is opt-in: ?stream=ndjson|sse or a matching Accept header"""
+    stream = request.args.get('stream', '').lower()
+    if stream in ('ndjson', 'sse'):
+        return stream
+    accept = request.accept_mimetypes
+    if accept.best_match(['application/json', 'application/x-ndjson']) == 'application/x-ndjson':
+        return 'ndjson'
+    if accept.best_match(['application/json', 'text/event-stream']) == 'text/event-stream':
+        return 'sse'
+    return None
+
+def stream_check_results(entries, stream_format):
+    """Stream each file's result as it is scored, then the batch statistics"""
+    def format_record(record_type, payload):
+        if stream_format == 'sse':
+            return f"event: {record_type}\ndata: {json.dumps(payload)}\n\n"
+        return json.dumps({'type': record_type, **payload}) + "\n"
+    
+    def generate():
+        stats = BatchStats()
+        for index, result in iter_check_results(entries):
+            stats.add(result)
+            yield format_record('result', {'index': index, 'result': result})
+        yield format_record('batch_stats', {'success': True, 'batch_stats': stats.to_dict()})
+    
+    mimetype = 'text/event-stream' if stream_format == 'sse' else 'application/x-ndjson'
+    response = Response(stream_with_context(generate()), mimetype=mimetype)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Ask proxies not to buffer the stream
+    return response
+
+@app.route('/')
+def index():
+    return render_template('index.html')
+
+@app.route('/api/check-syllabus', methods=['POST'])
+def check_syllabus():
+    # Check if files were uploaded
+    if 'files' not in request.files:
+        return jsonify({'error': 'No files uploaded'}), 400
     
-    # Calculate batch statistics
-    successful_checks = [r for r in results_list if 'error' not in r]
-    failed_checks = [r for r in results_list if 'error' in r]
+    files = request.files.getlist('files')
+    
+    # Check if any files were selected
+    if not files or all(f.filename == '' for f in files):
+        return jsonify({'error': 'No files selected'}), 400
     
-    batch_stats = {
-        'total_files': len(results_list),
-        'successful': len(successful_checks),
-        'failed': len(failed_checks)
-    }
+    entries = collect_uploads(files)
     
-    if successful_checks:
-        avg_required_percentage = sum(r['required']['percentage'] for r in successful_checks) / len(successful_checks)
-        avg_required_found = sum(r['required']['found'] for r in successful_checks) / len(successful_checks)
-        batch_stats['average_required_percentage'] = round(avg_required_percentage, 1)
-        batch_stats['average_required_found'] = round(avg_required_found, 1)
+    stream_format = requested_stream_format()
+    if stream_format:
+        return stream_check_results(entries, stream_format)
+    
+    # Uploads are checked straight from memory; results keep upload order
+    results_list = [None] * len(entries)
+    for index, result in iter_check_results(entries):
+        results_list[index] = result
     
     return jsonify({
         'success': True,
-        'batch_stats': batch_stats,
+        'batch_stats': calculate_batch_stats(results_list),
         'results': results_list
     })
 
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """Queue a batch check and return a job id to poll"""
+    if 'files' not in request.files:
+        return jsonify({'error': 'No files uploaded'}), 400
+    
+    files = request.files.getlist('files')
+    if not files or all(f.filename == '' for f in files):
+        return jsonify({'error': 'No files selected'}), 400
+    
+    # Job files are stored with the job so they survive a restart
+    job_files = []
+    for entry in collect_uploads(files):
+        if 'source' in entry:
+            job_files.append({'filename': entry['filename'], 'data': entry['source'].read()})
+        else:
+            job_files.append(entry)
+    
+    try:
+        job_id = get_job_runner().submit(job_files)
+    except JobQueueFull as e:
+        return jsonify({'error': str(e)}), 503
+    
+    return jsonify({
+        'success': True,
+        'job_id': job_id,
+        'status': 'queued',
+        'total_files': len(job_files),
+        'status_url': f'/api/jobs/{job_id}',
+        'results_url': f'/api/jobs/{job_id}/results'
+    }), 202
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Return a job's status, progress and batch statistics so far"""
+    job = get_job_runner().store.get_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+@app.route('/api/jobs/<job_id>/results', methods=['GET'])
+def get_job_results(job_id):
+    """Return completed results of a job, paginated with offset/limit"""
+    store = get_job_runner().store
+    job = store.get_job(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    limit = min(max(request.args.get('limit', JOB_RESULTS_PAGE_SIZE, type=int), 1), 100)
+    results = store.get_results(job_id, offset, limit)
+    next_offset = offset + len(results)
+    
+    return jsonify({
+        'job_id': job_id,
+        'status': job['status'],
+        'offset': offset,
+        'limit': limit,
+        'completed_files': job['completed_files'],
+        'results': results,
+        'next_offset': next_offset if next_offset < job['completed_files'] else None
+    })
+
 @app.route('/api/requirements', methods=['GET'])
 def get_requirements():
     """Return the list of requirements"""
@@ -123,5 +515,14 @@ def get_requirements():
         ]
     })
 
+@app.route('/api/bulletin-status', methods=['GET'])
+def bulletin_status():
+    """Return bulletin cache and circuit breaker state (of this server process)"""
+    return jsonify(get_bulletin_status())
+
+# Start the job runner now, so jobs interrupted by a restart resume without
+# waiting for the first jobs API request
+get_job_runner()
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
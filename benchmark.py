@@ -0,0 +1,1013 @@
+#!/usr/bin/env python3
+"""
+Performance benchmarks for the syllabus checker
+Usage: python3 benchmark.py <benchmark> [options]
+"""
+
+import argparse
+import copy
+import difflib
+import io
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from syllabus_checker import TXT_MMAP_MIN_BYTES, SyllabusChecker
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+SAMPLE_HEADER = """INFO 370-003 Introduction to Data Systems
+Course Title: Introduction to Data Systems and Analysis
+Fall 2024, 3 credit hours
+Meets Monday and Wednesday 2:00 PM - 3:15 PM, Room: Harris Hall 2101
+Instructor: Dr. Jane Smith
+Email: jsmith@vcu.edu  Phone: (804) 555-1234
+Office Hours: Tue 10:00-11:00 or by appointment
+Course Description: This course introduces students to relational databases.
+Learning Outcomes: Students will be able to model data.
+Grading Scale: A = 90-100%, B = 80-89%, C = 70-79%, F 59 and below
+Exams: 40%  Homework: 30%  Participation: 10%
+Use VCU Libraries to find and access library resources (https://www.library.vcu.edu/)
+"""
+
+# The rest of a syllabus that meets every requirement on its first page
+SAMPLE_POLICIES = """Prerequisite: INFO 300 and MATH 211.
+Required Textbook: Database Systems, ISBN 978-0-13-468599-1
+Final Exam: December 12, 2:00 PM. Final Project: schema design.
+Attendance Policy: Absences beyond three will lower your grade.
+Technology Policy: Recording of lectures is not permitted. AI use policy: tools allowed with citation.
+VCU Syllabus Policy Statements: https://provost.vcu.edu/faculty/syllabus/
+Course Schedule: see the weekly schedule below.
+"""
+
+SAMPLE_PAGE = """Week {week}: Topic: relational design and normalization, reading chapter {chapter}.
+Assignment due {month}/{day}. Lorem ipsum dolor sit amet, consectetur adipiscing elit,
+sed do eiusmod tempor incididunt ut labore et dolore magna aliqua. Ut enim ad minim
+veniam, quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo.
+"""
+
+
+def print_separator(char='=', length=80):
+    """Print a separator line"""
+    print(char * length)
+
+
+def synthetic_syllabus(pages, header=SAMPLE_HEADER):
+    """Build a long syllabus: a short header followed by a reading schedule"""
+    # Roughly 3,000 characters of schedule per printed page
+    body = []
+    for week in range(1, pages * 8 + 1):
+        body.append(SAMPLE_PAGE.format(week=week, chapter=week % 12 + 1,
+                                       month=week % 12 + 1, day=week % 28 + 1))
+    return header + "\n".join(body)
+
+
+def load_documents(checker, files, pages):
+    """Load the benchmark corpus: given files, or a synthetic syllabus"""
+    if files:
+        return [(os.path.basename(path), checker.extract_text(path)) for path in files]
+    return [(f"synthetic-{pages}p", synthetic_syllabus(pages))]
+
+
+SAMPLE_COURSE = """<div class="courseblock">
+<p class="courseblocktitle"><strong>{prefix} {number}. Topics in Information Systems {index}. 3 Hours.</strong></p>
+<p class="courseblockdesc">Semester course; 3 lecture hours. 3 credits. Prerequisite: {prefix} {previous} with a minimum grade of C. Enrollment is restricted to majors. Students study data modeling, databases and analytics through hands-on projects and case studies.</p>
+</div>"""
+
+
+def synthetic_bulletin_page(prefix='INFO', courses=150):
+    """Build a bulletin /azcourses/<prefix>/ page with the given number of courses"""
+    blocks = [SAMPLE_COURSE.format(prefix=prefix, number=100 + i * 3, previous=97 + i * 3, index=i)
+              for i in range(courses)]
+    return (f"<html><head><title>{prefix} Courses</title></head><body>"
+            f"<div id=\"content\"><h1>{prefix} Courses</h1>" + "\n".join(blocks) + "</div></body></html>")
+
+
+def synthetic_pdf(pages, header=SAMPLE_HEADER):
+    """Build a minimal text PDF with the given number of pages of synthetic syllabus"""
+    lines = [line[:100] for line in synthetic_syllabus(pages, header).splitlines() if line]
+    
+    def escape(line):
+        return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+    
+    objects = {1: "<< /Type /Catalog /Pages 2 0 R >>",
+               3: "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"}
+    page_ids = []
+    for page in range(pages):
+        page_lines = lines[page * 40:(page + 1) * 40] or lines[:40]
+        stream = "BT /F1 10 Tf 40 780 Td 12 TL " + " ".join(f"({escape(line)}) '" for line in page_lines) + " ET"
+        page_id = 4 + page * 2
+        page_ids.append(page_id)
+        objects[page_id] = ("<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>")
+        objects[page_id + 1] = f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream"
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {pages} >>"
+    
+    data = b"%PDF-1.4\n"
+    offsets = {}
+    for number in sorted(objects):
+        offsets[number] = len(data)
+        data += f"{number} 0 obj\n{objects[number]}\nendobj\n".encode('latin-1')
+    xref = len(data)
+    data += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('latin-1')
+    for number in sorted(objects):
+        data += f"{offsets[number]:010d} 00000 n \n".encode('latin-1')
+    data += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode('latin-1')
+    return data
+
+
+def synthetic_docx(pages, schedule_table=False):
+    """
+    Build a DOCX with the given number of pages of synthetic syllabus.
+    
+    With schedule_table the weekly schedule is a table (one row per week)
+    instead of paragraphs, the way many syllabi lay it out.
+    """
+    from docx import Document
+    from docx.oxml.ns import qn
+    document = Document()
+    if not schedule_table:
+        for line in synthetic_syllabus(pages).splitlines():
+            document.add_paragraph(line)
+    else:
+        for line in SAMPLE_HEADER.splitlines():
+            document.add_paragraph(line)
+        # Copy one finished row; table.add_row() is quadratic in the row count
+        table = document.add_table(rows=1, cols=3)
+        template = table.rows[0]._tr
+        for cell in table.rows[0].cells:
+            cell.text = "-"
+        for week in range(1, pages * 8 + 1):
+            row = copy.deepcopy(template)
+            texts = [f"Week {week}", f"{week % 12 + 1}/{week % 28 + 1}",
+                     SAMPLE_PAGE.format(week=week, chapter=week % 12 + 1,
+                                        month=week % 12 + 1, day=week % 28 + 1).split(": ", 1)[1]]
+            for t, text in zip(row.iter(qn('w:t')), texts):
+                t.text = text
+            template.addprevious(row)
+        table._tbl.remove(template)
+    output = io.BytesIO()
+    document.save(output)
+    return output.getvalue()
+
+
+def best_time(func, repeat):
+    """Run func repeat times and return the fastest wall time in seconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+# ============================================================================
+# Reference Bulletin Parser
+# ============================================================================
+
+# The BeautifulSoup parser vcu_bulletin_scraper used before its single-pass
+# lxml parser; bench_parse checks both give the same course index
+
+def _heading_paragraph_text(course_heading):
+    """
+    Build the full course paragraph text around a course heading.
+    
+    Args:
+        course_heading: The <strong> tag holding "PREFIX NUMBER. Title. N Hours."
+    
+    Returns:
+        str or None: Heading plus details text, or None if not in a paragraph
+    """
+    # The course info is split across two paragraphs:
+    # 1. Parent <p> contains the heading
+    # 2. Next sibling <p> contains the details (credits, prerequisites, description)
+    heading_paragraph = course_heading.find_parent('p')
+    
+    if not heading_paragraph:
+        return None
+    
+    # Get the heading text
+    heading_text = heading_paragraph.get_text(strip=True)
+    
+    # Get the next sibling paragraph with the details
+    details_paragraph = heading_paragraph.find_next_sibling('p')
+    
+    if details_paragraph:
+        details_text = details_paragraph.get_text(strip=True)
+        # Combine both paragraphs
+        return heading_text + " " + details_text
+    else:
+        # If no sibling, just return the heading (edge case)
+        return heading_text
+
+
+def extract_course_paragraph(soup, prefix, number):
+    """
+    Extract the full course paragraph from bulletin HTML.
+    
+    Args:
+        soup: BeautifulSoup object of the bulletin page
+        prefix: Course prefix (e.g., "INFO")
+        number: Course number (e.g., "370")
+    
+    Returns:
+        str or None: Full paragraph text or None if not found
+    """
+    # Find the course heading: <strong>INFO 370. Course Title. 3 Hours.</strong>
+    course_pattern = re.compile(rf'{prefix}\s+{number}\.', re.IGNORECASE)
+    course_heading = soup.find('strong', string=course_pattern)
+    
+    if not course_heading:
+        return None
+    
+    return _heading_paragraph_text(course_heading)
+
+
+def extract_course_paragraphs(soup, prefix):
+    """
+    Extract the paragraph of every course on a bulletin prefix page.
+    
+    Args:
+        soup: BeautifulSoup object of the bulletin page
+        prefix: Course prefix (e.g., "INFO")
+    
+    Returns:
+        dict: {'370': 'INFO 370. Course Title. 3 Hours. ...', ...}
+              Each paragraph is what extract_course_paragraph returns
+              for that number.
+    """
+    course_pattern = re.compile(rf'{prefix}\s+(\d+)\.', re.IGNORECASE)
+    paragraphs = {}
+    
+    for course_heading in soup.find_all('strong', string=course_pattern):
+        for number in course_pattern.findall(course_heading.string):
+            # Like soup.find(), the first heading mentioning a number wins
+            if number not in paragraphs:
+                paragraphs[number] = _heading_paragraph_text(course_heading)
+    
+    return {number: text for number, text in paragraphs.items() if text}
+
+
+def build_course_index(soup, prefix):
+    """
+    Parse a bulletin prefix page into an index of all its courses.
+    
+    Args:
+        soup: BeautifulSoup object of the bulletin page
+        prefix: Course prefix (e.g., "INFO")
+    
+    Returns:
+        dict: {'370': {'full_paragraph', 'title', 'credits',
+                       'prerequisites', 'description'}, ...}
+    """
+    from vcu_bulletin_scraper import parse_course_paragraph
+    return {
+        number: parse_course_paragraph(paragraph, prefix, number)
+        for number, paragraph in extract_course_paragraphs(soup, prefix).items()
+    }
+
+
+# ============================================================================
+# Benchmarks
+# ============================================================================
+
+def bench_scan(args):
+    """Compare per-pattern regex searches with the anchored match table"""
+    checker = SyllabusChecker()
+    ruleset = checker.ruleset
+    keys = [key for rule_keys in ruleset.rule_patterns.values() for key in rule_keys]
+    keys = list(dict.fromkeys(keys))
+
+    print_separator()
+    print(f"PATTERN SCAN BENCHMARK ({len(keys)} unique patterns)")
+    print_separator()
+
+    for name, text in load_documents(checker, args.files, args.pages):
+        text_lower = text.lower()
+
+        def per_pattern():
+            # One full regex search per pattern, as check_requirement_enhanced used to do
+            return {(p, f): re.search(p, text if f else text_lower, f) for p, f in keys}
+
+        def match_table():
+            return ruleset.match_table(text).scan()
+
+        # Results must agree exactly before timings mean anything
+        expected = per_pattern()
+        table = match_table()
+        for pattern, flags in keys:
+            got = table.search(pattern, flags) if flags else table.search_lower(pattern)
+            want = expected[(pattern, flags)]
+            if (got and got.span()) != (want and want.span()):
+                print(f"[ERROR] Result mismatch for pattern {pattern!r}")
+                sys.exit(1)
+
+        baseline = best_time(per_pattern, args.repeat)
+        scanned = best_time(match_table, args.repeat)
+
+        print(f"\n{name}: {len(text):,} characters")
+        print(f"  Per-pattern search:  {baseline * 1000:8.1f} ms")
+        print(f"  Match table scan:    {scanned * 1000:8.1f} ms")
+        print(f"  Speedup:             {baseline / scanned:8.1f}x")
+
+
+class BulletinStandIn:
+    """
+    Local HTTP server standing in for bulletin.vcu.edu.
+    
+    Serves a synthetic prefix page for every path with HTTP/1.1 keep-alive
+    and counts the connections opened. Each new connection sleeps
+    handshake_ms to model the TCP + TLS setup cost of the real server.
+    """
+    
+    def __init__(self, handshake_ms=20):
+        body = synthetic_bulletin_page().encode('utf-8')
+        stand_in = self
+        self.connections = 0
+        self._lock = threading.Lock()
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out in separate writes; without this, Nagle's
+            # algorithm plus delayed ACKs add ~40 ms to every keep-alive reply
+            disable_nagle_algorithm = True
+            
+            def setup(self):
+                super().setup()
+                with stand_in._lock:
+                    stand_in.connections += 1
+                time.sleep(handshake_ms / 1000)
+            
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/azcourses/info/"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+    
+    def reset(self):
+        with self._lock:
+            self.connections = 0
+    
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def bench_bulletin(args):
+    """Compare one connection per fetch with the pooled keep-alive session"""
+    import vcu_bulletin_scraper as scraper
+    
+    stand_in = BulletinStandIn(handshake_ms=args.handshake_ms)
+    scraper.configure_session(pool_size=args.threads)
+    # The stand-in is local; only connection handling should show in the timings
+    scraper.configure_rate_limiter(rate=1e6, burst=args.lookups)
+    
+    def fresh_connection():
+        # What scrape_course_data used to do for every fetch
+        return requests.get(stand_in.url, timeout=5).text
+    
+    def pooled():
+        return scraper.fetch_page(stand_in.url)
+    
+    print_separator()
+    print(f"BULLETIN FETCH BENCHMARK ({args.lookups} lookups, "
+          f"{args.handshake_ms} ms simulated handshake)")
+    print_separator()
+    
+    try:
+        for label, threads in (('Sequential', 1), (f"Concurrent ({args.threads} threads)", args.threads)):
+            print(f"\n{label}:")
+            for name, fetch in (('New connection each', fresh_connection), ('Pooled session', pooled)):
+                # Start from a cold pool so its connection setup is counted
+                scraper.configure_session(pool_size=args.threads)
+                stand_in.reset()
+                start = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=threads) as executor:
+                    pages = list(executor.map(lambda _: fetch(), range(args.lookups)))
+                elapsed = time.perf_counter() - start
+                
+                if any(len(page) != len(pages[0]) for page in pages):
+                    print("[ERROR] Incomplete page received")
+                    sys.exit(1)
+                print(f"  {name:<20} {elapsed * 1000:8.1f} ms  "
+                      f"{elapsed / args.lookups * 1000:6.2f} ms/lookup  "
+                      f"{stand_in.connections:4d} connections")
+    finally:
+        stand_in.close()
+
+
+def bench_parse(args):
+    """Compare BeautifulSoup bulletin page parsing with the single-pass lxml parser"""
+    from bs4 import BeautifulSoup
+    import vcu_bulletin_scraper as scraper
+    
+    print_separator()
+    print("BULLETIN PAGE PARSE BENCHMARK")
+    print_separator()
+    
+    for prefix, courses in (('INFO', 60), ('MATH', args.courses // 2), ('BIOL', args.courses)):
+        html = synthetic_bulletin_page(prefix, courses)
+        
+        def per_course():
+            # Before prefix indexing: one soup.find() per course looked up
+            soup = BeautifulSoup(html, 'lxml')
+            index = {}
+            for number in re.findall(rf'{prefix} (\d+)\.', html):
+                paragraph = extract_course_paragraph(soup, prefix, number)
+                if paragraph:
+                    index[number] = scraper.parse_course_paragraph(paragraph, prefix, number)
+            return index
+        
+        def soup_index():
+            return build_course_index(BeautifulSoup(html, 'lxml'), prefix)
+        
+        def lxml_index():
+            return scraper.parse_course_index(html, prefix)
+        
+        # Results must agree exactly before timings mean anything
+        expected = soup_index()
+        if lxml_index() != expected or per_course() != expected:
+            print(f"[ERROR] Parser output differs for {prefix}")
+            sys.exit(1)
+        
+        timings = [(name, best_time(func, args.repeat)) for name, func in (
+            ('BeautifulSoup, find per course', per_course),
+            ('BeautifulSoup, one pass', soup_index),
+            ('lxml single pass', lxml_index),
+        )]
+        
+        print(f"\n{prefix}: {len(expected)} courses, {len(html) / 1024:,.0f} KB")
+        fastest = timings[-1][1]
+        for name, elapsed in timings:
+            print(f"  {name:<32} {elapsed * 1000:8.1f} ms  {elapsed / fastest:6.1f}x")
+
+
+def bench_pdf(args):
+    """Compare serial and page-parallel PDF text extraction"""
+    import PyPDF2
+    
+    serial = SyllabusChecker(pdf_workers=1)
+    parallel = SyllabusChecker(pdf_workers=args.workers, pdf_parallel_pages=1)
+    
+    if args.files:
+        documents = [(os.path.basename(path), open(path, 'rb').read()) for path in args.files]
+    else:
+        documents = [(f"synthetic-{pages}p", synthetic_pdf(pages)) for pages in (5, 50, 300)]
+    
+    print_separator()
+    print(f"PDF EXTRACTION BENCHMARK ({args.workers} workers, {os.cpu_count()} CPUs)")
+    print_separator()
+    
+    # Start the pool before timing so process startup is not counted
+    parallel.extract_text(documents[0][1], 'warmup.pdf')
+    
+    for name, data in documents:
+        def concatenated():
+            # The old loop: grow the text with += page by page
+            text = ""
+            for page in PyPDF2.PdfReader(io.BytesIO(data)).pages:
+                page_text = page.extract_text()
+                if page_text:
+                    text += page_text + "\n"
+            return text
+        
+        expected = concatenated()
+        if serial.extract_text(data, 'x.pdf') != expected or parallel.extract_text(data, 'x.pdf') != expected:
+            print(f"[ERROR] Extracted text differs for {name}")
+            sys.exit(1)
+        
+        pages = len(PyPDF2.PdfReader(io.BytesIO(data)).pages)
+        timings = [(label, best_time(func, args.repeat)) for label, func in (
+            ('Serial, += concatenation', concatenated),
+            ('Serial, join', lambda: serial.extract_text(data, 'x.pdf')),
+            (f"Parallel ({args.workers} processes)", lambda: parallel.extract_text(data, 'x.pdf')),
+        )]
+        
+        print(f"\n{name}: {pages} pages, {len(expected):,} characters")
+        baseline = timings[0][1]
+        for label, elapsed in timings:
+            print(f"  {label:<28} {elapsed * 1000:8.1f} ms  {baseline / elapsed:5.2f}x")
+
+
+def bench_early_exit(args):
+    """Compare full-document scoring with early-exit page-by-page scoring"""
+    import syllabus_checker
+    
+    # Keep bulletin lookups (and the network) out of the timings
+    syllabus_checker.BULLETIN_SCRAPER_AVAILABLE = False
+    full = SyllabusChecker(pdf_workers=1)
+    early = SyllabusChecker(pdf_workers=1, early_exit=True)
+    
+    if args.files:
+        documents = [(os.path.basename(path), open(path, 'rb').read()) for path in args.files]
+    else:
+        documents = [(f"synthetic-{pages}p", synthetic_pdf(pages, SAMPLE_HEADER + SAMPLE_POLICIES))
+                     for pages in (5, 50, 300)]
+    
+    print_separator()
+    print("EARLY EXIT BENCHMARK")
+    print_separator()
+    
+    def verdicts(result):
+        # Everything early exit promises to keep identical
+        return (result.get('error'), result.get('required', {}).get('found'),
+                [(item['name'], item['found'], item.get('partial_credit'))
+                 for group in ('required', 'recommended') for item in result.get(group, {}).get('items', [])])
+    
+    for name, data in documents:
+        full_result = full.check_syllabus(data, 'x.pdf')
+        early_result = early.check_syllabus(data, 'x.pdf')
+        if verdicts(full_result) != verdicts(early_result):
+            print(f"[ERROR] Early exit changed the result for {name}")
+            sys.exit(1)
+        
+        full_time = best_time(lambda: full.check_syllabus(data, 'x.pdf'), args.repeat)
+        early_time = best_time(lambda: early.check_syllabus(data, 'x.pdf'), args.repeat)
+        
+        print(f"\n{name}: score {full_result.get('required', {}).get('percentage')}%, "
+              f"read {early_result.get('pages_read')} of {full_result.get('pages_read')} pages "
+              f"(early exit: {early_result.get('early_exit')})")
+        print(f"  {'Full document':<28} {full_time * 1000:8.1f} ms")
+        print(f"  {'Early exit':<28} {early_time * 1000:8.1f} ms  {full_time / early_time:5.2f}x")
+
+
+def measure_peak_rss(func, *args):
+    """
+    Peak resident memory growth (MB) while running func(*args).
+    
+    Call it in a fresh process so earlier work does not hide the peak;
+    C-level allocations are counted too.
+    """
+    import resource
+    
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    try:
+        # ru_maxrss also carries the RSS of the parent this process was
+        # forked from, so reset the kernel's high-water mark (VmHWM) and
+        # measure from the current RSS instead
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        with open('/proc/self/statm') as f:
+            before = int(f.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    func(*args)
+    try:
+        with open('/proc/self/status') as f:
+            after = next(int(line.split()[1]) * 1024 for line in f if line.startswith('VmHWM:'))
+    except (OSError, StopIteration):
+        after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+    return max(0, after - before) / 1e6
+
+
+def extraction_peak_rss(filename, data, backend_name):
+    """Peak resident memory growth (MB) while one backend extracts one file"""
+    import importlib
+    
+    extension = os.path.splitext(filename)[1]
+    checker = SyllabusChecker(pdf_workers=1, **{f"{extension[1:]}_backend": backend_name})
+    # Import the backend's library first so its size is not counted
+    for module in (checker.pdf_backend if extension == '.pdf' else checker.docx_backend).requires:
+        importlib.import_module(module)
+    return measure_peak_rss(checker.extract_text, data, filename)
+
+
+def bench_backends(args):
+    """Run every installed extraction backend over a corpus"""
+    import multiprocessing
+    from extraction_backends import DEFAULT_BACKENDS, available_backends, get_backend
+    
+    if args.files:
+        documents = [(os.path.basename(path), open(path, 'rb').read()) for path in args.files]
+    else:
+        documents = [(f"synthetic-{pages}p.pdf", synthetic_pdf(pages)) for pages in (5, 50, 300)]
+        documents.append(("synthetic-50p.docx", synthetic_docx(50)))
+    
+    print_separator()
+    print("EXTRACTION BACKEND BENCHMARK")
+    print_separator()
+    
+    spawn = multiprocessing.get_context('spawn')
+    for filename, data in documents:
+        extension = os.path.splitext(filename)[1].lower()
+        if extension not in DEFAULT_BACKENDS:
+            print(f"\n[SKIP] {filename}: no extraction backends for {extension}")
+            continue
+        
+        reference = None
+        print(f"\n{filename}: {len(data) / 1e6:.2f} MB")
+        print(f"  {'Backend':<14} {'Tier':<9} {'Time':>10} {'Pages/s':>9} {'MB/s':>7} {'Peak RSS':>9}  Text vs default")
+        for name in available_backends(extension):
+            backend = get_backend(extension, name)
+            checker = SyllabusChecker(pdf_workers=1, **{f"{extension[1:]}_backend": name})
+            text = checker.extract_text(data, filename)
+            elapsed = best_time(lambda: checker.extract_text(data, filename), args.repeat)
+            
+            document = backend.open(io.BytesIO(data))
+            pages = backend.page_count(document)
+            backend.close(document)
+            
+            with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+                peak_mb = pool.submit(extraction_peak_rss, filename, data, name).result()
+            
+            if reference is None:
+                reference = text
+                difference = "(default)"
+            elif text == reference:
+                difference = "identical"
+            else:
+                similarity = difflib.SequenceMatcher(None, reference.splitlines(), text.splitlines()).ratio()
+                difference = f"{similarity * 100:.1f}% of lines match, {len(text) - len(reference):+,} chars"
+            
+            print(f"  {name:<14} {backend.tier:<9} {elapsed * 1000:8.1f}ms {pages / elapsed:9.1f} "
+                  f"{len(data) / 1e6 / elapsed:7.2f} {peak_mb:7.1f}MB  {difference}")
+
+
+def bench_docx(args):
+    """Compare python-docx with the streaming DOCX extractors"""
+    import multiprocessing
+    import zipfile
+    
+    if args.files:
+        documents = [(os.path.basename(path), open(path, 'rb').read()) for path in args.files]
+    else:
+        documents = [(f"synthetic-{pages}p.docx", synthetic_docx(pages)) for pages in (5, 50, 300)]
+        documents.append(("synthetic-300p-table.docx", synthetic_docx(300, schedule_table=True)))
+    
+    print_separator()
+    print("DOCX EXTRACTION BENCHMARK")
+    print_separator()
+    
+    spawn = multiprocessing.get_context('spawn')
+    for filename, data in documents:
+        # Throughput is measured against the uncompressed document XML
+        with zipfile.ZipFile(io.BytesIO(data)) as package:
+            xml_size = package.getinfo('word/document.xml').file_size
+        print(f"\n{filename}: {len(data) / 1e6:.2f} MB, document.xml {xml_size / 1e6:.2f} MB")
+        print(f"  {'Backend':<14} {'Time':>10} {'XML MB/s':>9} {'Peak RSS':>9}")
+        texts = {}
+        for name in ('python-docx', 'docx-stream', 'docx-tables'):
+            checker = SyllabusChecker(docx_backend=name)
+            texts[name] = checker.extract_text(data, filename)
+            elapsed = best_time(lambda: checker.extract_text(data, filename), args.repeat)
+            with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+                peak_mb = pool.submit(extraction_peak_rss, filename, data, name).result()
+            print(f"  {name:<14} {elapsed * 1000:8.1f}ms {xml_size / 1e6 / elapsed:9.2f} {peak_mb:7.1f}MB")
+        
+        # Without tables the streaming text must be python-docx's, character for character
+        matches = texts['docx-stream'] == texts['python-docx']
+        print(f"  docx-stream matches python-docx: {'yes' if matches else 'NO'}")
+        print(f"  Table text added by docx-tables: {len(texts['docx-tables']) - len(texts['python-docx']):,} chars")
+
+
+def read_txt_twice(path):
+    """The old TXT reader: whole file as UTF-8, reread as latin-1 on failure"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except UnicodeDecodeError:
+        with open(path, 'r', encoding='latin-1') as f:
+            return f.read()
+
+
+def read_txt(path):
+    """The checker's TXT reader (module-level so a process pool can run it)"""
+    return SyllabusChecker().extract_text_from_txt(path)
+
+
+def bench_txt(args):
+    """Compare the old read-twice TXT reader with single-pass, memory-mapped ingestion"""
+    import multiprocessing
+    import tempfile
+    
+    checker = SyllabusChecker()
+    spawn = multiprocessing.get_context('spawn')
+    with tempfile.TemporaryDirectory() as directory:
+        files = list(args.files)
+        if not files:
+            page = synthetic_syllabus(1)
+            for megabytes in args.sizes:
+                text = page * (megabytes * 1_000_000 // len(page) + 1)
+                path = os.path.join(directory, f"synthetic-{megabytes}mb.txt")
+                with open(path, 'w', encoding='utf-8', newline='\r\n') as f:
+                    f.write(text)
+                files.append(path)
+                # One latin-1 byte near the end: the old reader decodes the
+                # whole file, fails, and reads it all again
+                path = os.path.join(directory, f"synthetic-{megabytes}mb-latin1.txt")
+                with open(path, 'w', encoding='latin-1') as f:
+                    f.write(text + "Caf\xe9\n")
+                files.append(path)
+        
+        print_separator()
+        print("TXT INGESTION BENCHMARK")
+        print_separator()
+        print(f"Memory-mapped from {TXT_MMAP_MIN_BYTES / 1e6:.1f} MB (TXT_MMAP_MIN_BYTES)")
+        
+        for path in files:
+            size = os.path.getsize(path)
+            print(f"\n{os.path.basename(path)}: {size / 1e6:.1f} MB")
+            print(f"  {'Reader':<12} {'Time':>10} {'MB/s':>8} {'Peak RSS':>9} {'RSS/file':>9}")
+            texts = {}
+            for name, reader, timed in (('read-twice', read_txt_twice, read_txt_twice),
+                                        ('single-pass', read_txt, checker.extract_text_from_txt)):
+                texts[name] = timed(path)
+                elapsed = best_time(lambda: timed(path), args.repeat)
+                with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+                    peak_mb = pool.submit(measure_peak_rss, reader, path).result()
+                print(f"  {name:<12} {elapsed * 1000:8.1f}ms {size / 1e6 / elapsed:8.1f} "
+                      f"{peak_mb:7.1f}MB {peak_mb * 1e6 / size:8.2f}x")
+            print(f"  Same text: {'yes' if texts['read-twice'] == texts['single-pass'] else 'NO'}")
+
+
+def bench_text_cache(args):
+    """Re-score documents after a rule change with and without the text cache"""
+    import tempfile
+    import syllabus_checker
+    from syllabus_rules import CompiledRuleset
+    from text_cache import TextCache
+    
+    # Keep bulletin lookups (and the network) out of the timings
+    syllabus_checker.BULLETIN_SCRAPER_AVAILABLE = False
+    
+    if args.files:
+        documents = [(os.path.basename(path), open(path, 'rb').read()) for path in args.files]
+    else:
+        documents = [(f"synthetic-{pages}p.pdf", synthetic_pdf(pages)) for pages in (5, 50, 300)]
+        documents.append(("synthetic-300p.docx", synthetic_docx(300)))
+    
+    # An edited rule: one extra course code pattern gives a new ruleset fingerprint
+    requirements = copy.deepcopy(syllabus_checker.REQUIREMENTS)
+    requirements['course_info']['sub_items']['course_code']['primary_patterns'].append(r'(?i)course\s+code\s*:')
+    edited = CompiledRuleset(requirements, syllabus_checker.RECOMMENDED)
+    
+    print_separator()
+    print("TEXT CACHE BENCHMARK")
+    print_separator()
+    
+    with tempfile.TemporaryDirectory() as directory:
+        cache = TextCache(os.path.join(directory, 'text_cache.db'))
+        original = SyllabusChecker(pdf_workers=1, text_cache=cache)
+        uncached = SyllabusChecker(edited, pdf_workers=1)
+        cached = SyllabusChecker(edited, pdf_workers=1, text_cache=cache)
+        
+        for filename, data in documents:
+            # Checked once under the old rules, which fills the cache
+            original.check_syllabus(data, filename)
+            if uncached.check_syllabus(data, filename) != cached.check_syllabus(data, filename):
+                print(f"[ERROR] Cached text changed the result for {filename}")
+                sys.exit(1)
+            
+            text = uncached.extract_text(data, filename)
+            extract_time = best_time(lambda: uncached.extract_text(data, filename), args.repeat)
+            full_time = best_time(lambda: uncached.check_syllabus(data, filename), args.repeat)
+            cached_time = best_time(lambda: cached.check_syllabus(data, filename), args.repeat)
+            
+            print(f"\n{filename}: {len(data) / 1e6:.2f} MB, {len(text):,} chars of text")
+            print(f"  {'Extraction alone':<30} {extract_time * 1000:8.1f} ms")
+            print(f"  {'New rules, no text cache':<30} {full_time * 1000:8.1f} ms")
+            print(f"  {'New rules, cached text':<30} {cached_time * 1000:8.1f} ms  {full_time / cached_time:5.2f}x")
+        
+        stats = cache.stats()
+        print(f"\nCache: {stats['entries']} entries, {stats['bytes'] / 1e3:.1f} KB compressed, "
+              f"{stats['hits']} hits, {stats['misses']} misses")
+
+
+# Bulletin entry whose title and description are not verbatim in the sample syllabus
+SAMPLE_BULLETIN = {
+    'found': True,
+    'title': 'Database Systems and Data Analysis',
+    'description': 'Introduces relational database design, SQL and data analysis with modern tools.',
+    'prerequisites': 'INFO 300 and MATH 211',
+    'full_paragraph': 'Introduces relational database design, SQL and data analysis with modern tools. '
+                      'Prerequisites: INFO 300 and MATH 211.'
+}
+
+
+def score_document(checker, text, bulletin_data, shared):
+    """
+    Score every rule and run the bulletin checks the way check_syllabus does.
+
+    With shared=False each scorer and validator derives its own lowercase,
+    normalized and joined-URL text, as before documents had one analysis.
+    """
+    from syllabus_rules import EvaluationContext, iter_rules
+    urls = checker.extract_urls(text)
+    context = EvaluationContext(checker.ruleset, text, urls)
+    analysis = context if shared else None
+    for _, rule_data in iter_rules(checker.requirements, checker.recommended):
+        if shared:
+            checker.check_requirement_enhanced(text, rule_data, context=context)
+        else:
+            checker.check_requirement_enhanced(text, rule_data, urls, context.matches)
+    title = bulletin_data['title']
+    if title.lower() not in (context.text_lower if shared else text.lower()):
+        checker._calculate_title_similarity(title, text, analysis)
+    # Once for the description, once for the prerequisites
+    for _ in range(2):
+        checker.validate_description_and_prereqs_combined(text, bulletin_data, analysis)
+
+
+def bench_analysis(args):
+    """Compare per-scorer text transforms with one shared document analysis"""
+    import tracemalloc
+    
+    checker = SyllabusChecker()
+    if args.files:
+        documents = load_documents(checker, args.files, args.pages)
+    else:
+        documents = [(f"synthetic-{pages}p", synthetic_syllabus(pages, SAMPLE_HEADER + SAMPLE_POLICIES))
+                     for pages in (5, args.pages)]
+    
+    print_separator()
+    print("DOCUMENT ANALYSIS BENCHMARK")
+    print_separator()
+    
+    for name, text in documents:
+        print(f"\n{name}: {len(text):,} chars")
+        print(f"  {'Text transforms':<18} {'CPU':>10} {'Peak allocated':>16}")
+        for label, shared in (('Per scorer', False), ('Shared analysis', True)):
+            best = None
+            for _ in range(args.repeat):
+                start = time.process_time()
+                score_document(checker, text, SAMPLE_BULLETIN, shared)
+                elapsed = time.process_time() - start
+                best = elapsed if best is None else min(best, elapsed)
+            
+            tracemalloc.start()
+            score_document(checker, text, SAMPLE_BULLETIN, shared)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"  {label:<18} {best * 1000:8.2f}ms {peak / 1e6:14.2f}MB")
+
+
+def rule_scans(checker, text):
+    """Pattern-score each rule of a checker on its own match table; returns {rule: (found, chars scanned)}"""
+    from syllabus_rules import iter_rules
+    scans = {}
+    for rule_path, rule_data in iter_rules(checker.requirements, checker.recommended):
+        match_table = checker.ruleset.match_table(text)
+        found = checker.check_requirement_enhanced(text, rule_data, [], match_table)['found']
+        scans[rule_path] = (found, match_table.scanned)
+    return scans
+
+
+def score_rules(checker, text):
+    """Pattern-score every rule of a checker against one document with a shared match table"""
+    from syllabus_rules import iter_rules
+    match_table = checker.ruleset.match_table(text)
+    return [checker.check_requirement_enhanced(text, rule_data, [], match_table)
+            for _, rule_data in iter_rules(checker.requirements, checker.recommended)]
+
+
+def bench_sections(args):
+    """Compare full-text and section-first pattern search"""
+    import syllabus_checker
+    from syllabus_rules import CompiledRuleset, SectionIndex
+    
+    checker = SyllabusChecker()
+    if args.files:
+        documents = load_documents(checker, args.files, args.pages)
+    else:
+        documents = [(f"synthetic-{pages}p", synthetic_syllabus(pages, SAMPLE_HEADER + SAMPLE_POLICIES))
+                     for pages in (5, args.pages)]
+    
+    # The same rules without section declarations
+    def without_sections(rules):
+        rules = copy.deepcopy(rules)
+        for rule in rules.values():
+            for rule_data in [rule, *rule.get('sub_items', {}).values()]:
+                rule_data.pop('sections', None)
+        return rules
+    plain = SyllabusChecker(CompiledRuleset(without_sections(syllabus_checker.REQUIREMENTS),
+                                            without_sections(syllabus_checker.RECOMMENDED)))
+    
+    print_separator()
+    print("SECTION INDEX BENCHMARK")
+    print_separator()
+    
+    for name, text in documents:
+        index_time = best_time(lambda: SectionIndex(text), args.repeat)
+        index = SectionIndex(text)
+        kinds = {}
+        for section in index.sections:
+            kinds[section.kind] = kinds.get(section.kind, 0) + section.end - section.start
+        
+        plain_scans = rule_scans(plain, text)
+        section_scans = rule_scans(checker, text)
+        plain_time = best_time(lambda: score_rules(plain, text), args.repeat)
+        section_time = best_time(lambda: score_rules(checker, text), args.repeat)
+        
+        print(f"\n{name}: {len(text):,} chars, {len(index.sections)} sections ({index_time * 1000:.2f} ms to index)")
+        print("  " + ", ".join(f"{kind} {chars:,}" for kind, chars in sorted(kinds.items(), key=lambda item: -item[1])))
+        print(f"  {'Rule':<36} {'Found':>6} {'Full text':>11} {'Sections':>11} {'Change':>7}")
+        totals = [0, 0]
+        for rule_path, (found, full) in plain_scans.items():
+            section_found, sectioned = section_scans[rule_path]
+            assert found == section_found, f"{rule_path}: found/missing differs"
+            totals[0] += full
+            totals[1] += sectioned
+            if rule_path in checker.ruleset.rule_sections:
+                print(f"  {rule_path:<36} {'yes' if found else 'no':>6} {full:>11,} {sectioned:>11,} "
+                      f"{sectioned / max(full, 1) - 1:>+7.0%}")
+        print(f"  {'All rules (chars scanned)':<36} {'':>6} {totals[0]:>11,} {totals[1]:>11,} "
+              f"{totals[1] / max(totals[0], 1) - 1:>+7.0%}")
+        print(f"  {'Scoring, shared match table':<36} {'':>6} {plain_time * 1000:9.1f}ms {section_time * 1000:9.1f}ms")
+
+
+BENCHMARKS = {
+    'scan': bench_scan,
+    'bulletin': bench_bulletin,
+    'parse': bench_parse,
+    'pdf': bench_pdf,
+    'early-exit': bench_early_exit,
+    'backends': bench_backends,
+    'docx': bench_docx,
+    'txt': bench_txt,
+    'text-cache': bench_text_cache,
+    'analysis': bench_analysis,
+    'sections': bench_sections,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Syllabus checker performance benchmarks')
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    scan_parser = subparsers.add_parser('scan', help='Regex evaluation over long syllabi')
+    scan_parser.add_argument('files', nargs='*', help='Syllabus files (default: synthetic)')
+    scan_parser.add_argument('--pages', type=int, default=40, help='Synthetic syllabus length')
+    scan_parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions')
+
+    bulletin_parser = subparsers.add_parser('bulletin', help='Bulletin fetches against a local stand-in server')
+    bulletin_parser.add_argument('--lookups', type=int, default=200, help='Fetches per run')
+    bulletin_parser.add_argument('--threads', type=int, default=8, help='Threads for the concurrent run')
+    bulletin_parser.add_argument('--handshake-ms', type=float, default=20,
+                                 help='Simulated connection setup cost per new connection')
+    
+    parse_parser = subparsers.add_parser('parse', help='Bulletin prefix page parsing')
+    parse_parser.add_argument('--courses', type=int, default=300, help='Courses on the largest page')
+    parse_parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions')
+    
+    pdf_parser = subparsers.add_parser('pdf', help='Serial vs page-parallel PDF extraction')
+    pdf_parser.add_argument('files', nargs='*', help='PDF files (default: synthetic 5/50/300 pages)')
+    pdf_parser.add_argument('--workers', type=int, default=max(os.cpu_count() or 1, 2), help='Extraction processes')
+    pdf_parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions')
+    
+    early_parser = subparsers.add_parser('early-exit', help='Full-document vs early-exit scoring of PDFs')
+    early_parser.add_argument('files', nargs='*', help='PDF files (default: synthetic 5/50/300 pages)')
+    early_parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions')
+    
+    backends_parser = subparsers.add_parser('backends', help='Every installed PDF/DOCX extraction backend')
+    backends_parser.add_argument('files', nargs='*', help='PDF/DOCX files (default: synthetic corpus)')
+    backends_parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions')
+    
+    docx_parser = subparsers.add_parser('docx', help='python-docx vs streaming DOCX extraction')
+    docx_parser.add_argument('files', nargs='*', help='DOCX files (default: synthetic 5/50/300 pages)')
+    docx_parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions')
+    
+    txt_parser = subparsers.add_parser('txt', help='Read-twice vs single-pass memory-mapped TXT ingestion')
+    txt_parser.add_argument('files', nargs='*', help='Text files (default: synthetic UTF-8 and latin-1 files)')
+    txt_parser.add_argument('--sizes', type=int, nargs='+', default=[1, 10, 50], help='Synthetic file sizes in MB')
+    txt_parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions')
+    
+    text_cache_parser = subparsers.add_parser('text-cache', help='Re-scoring after a rule change with cached text')
+    text_cache_parser.add_argument('files', nargs='*', help='Syllabus files (default: synthetic PDFs and DOCX)')
+    text_cache_parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions')
+    
+    analysis_parser = subparsers.add_parser('analysis', help='Per-scorer text transforms vs one shared analysis')
+    analysis_parser.add_argument('files', nargs='*', help='Syllabus files (default: synthetic)')
+    analysis_parser.add_argument('--pages', type=int, default=100, help='Synthetic syllabus length')
+    analysis_parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions')
+    
+    sections_parser = subparsers.add_parser('sections', help='Full-text vs section-first pattern search')
+    sections_parser.add_argument('files', nargs='*', help='Syllabus files (default: synthetic)')
+    sections_parser.add_argument('--pages', type=int, default=20, help='Synthetic syllabus length')
+    sections_parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions')
+    
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+VCU Bulletin Catalog Snapshot Builder
+Builds a versioned offline snapshot of every /azcourses/<prefix>/ page
+Usage: python3 bulletin_snapshot.py build --html-dir <dir> | --crawl [options]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import re
+import sys
+from datetime import datetime, timezone
+
+from bs4 import BeautifulSoup
+
+from vcu_bulletin_scraper import (
+    SNAPSHOT_FORMAT_VERSION,
+    build_bulletin_url,
+    fetch_page,
+    load_snapshot,
+    parse_course_index,
+)
+
+
+# ============================================================================
+# Sources
+# ============================================================================
+
+BULLETIN_COURSES_URL = "https://bulletin.vcu.edu/azcourses/"
+
+# Links to prefix pages on the A-Z course list, e.g. href="/azcourses/info/"
+PREFIX_LINK_PATTERN = re.compile(r'/azcourses/([a-z]{2,4})/?$', re.IGNORECASE)
+
+
+def prefix_from_path(path):
+    """
+    Work out the course prefix of a saved bulletin page.
+
+    Accepts both flat saves (info.html) and mirrored site trees
+    (azcourses/info/index.html).
+
+    Returns:
+        str or None: Upper-case prefix, or None if the name is not a prefix
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if stem.lower() == 'index':
+        stem = os.path.basename(os.path.dirname(path))
+    return stem.upper() if re.fullmatch(r'[A-Za-z]{2,4}', stem) else None
+
+
+def iter_saved_pages(html_dir):
+    """
+    Yield (prefix, html) for every saved prefix page under a directory.
+    """
+    for root, _, files in os.walk(html_dir):
+        for name in sorted(files):
+            if not name.lower().endswith(('.html', '.htm')):
+                continue
+            path = os.path.join(root, name)
+            prefix = prefix_from_path(path)
+            if prefix is None:
+                print(f"[SKIP] {path}: file name is not a course prefix")
+                continue
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                yield prefix, f.read()
+
+
+def discover_prefixes():
+    """Read every course prefix from the bulletin's A-Z course list"""
+    soup = BeautifulSoup(fetch_page(BULLETIN_COURSES_URL), 'lxml')
+    prefixes = set()
+    for link in soup.find_all('a', href=True):
+        match = PREFIX_LINK_PATTERN.search(link['href'])
+        if match:
+            prefixes.add(match.group(1).upper())
+    return sorted(prefixes)
+
+
+def iter_crawled_pages(prefixes):
+    """
+    Yield (prefix, html) for each prefix page fetched from bulletin.vcu.edu.
+
+    Fetches go through the scraper's shared session and rate limiter.
+    """
+    for prefix in prefixes:
+        try:
+            yield prefix, fetch_page(build_bulletin_url(prefix))
+        except Exception as e:
+            print(f"[ERROR] {prefix}: {e}")
+
+
+# ============================================================================
+# Snapshot Building
+# ============================================================================
+
+def build_snapshot(pages, source):
+    """
+    Parse prefix pages into a snapshot.
+
+    Args:
+        pages: Iterable of (prefix, html)
+        source: Description of where the pages came from
+
+    Returns:
+        dict: Snapshot in the layout load_snapshot() reads
+    """
+    prefixes = {}
+    for prefix, html in pages:
+        course_index = parse_course_index(html, prefix)
+        prefixes.setdefault(prefix, {}).update(course_index)
+        print(f"[OK] {prefix}: {len(course_index)} courses")
+
+    return {
+        'format_version': SNAPSHOT_FORMAT_VERSION,
+        'built_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'source': source,
+        'prefixes': prefixes
+    }
+
+
+def write_snapshot(snapshot, path):
+    """Write a snapshot as compact gzip-compressed JSON"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # Write to a temporary file first so readers never see a partial snapshot
+    temp_path = path + '.tmp'
+    with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+        json.dump(snapshot, f, separators=(',', ':'), sort_keys=True)
+    os.replace(temp_path, path)
+
+
+def snapshot_summary(snapshot):
+    """One-line description of a snapshot"""
+    courses = sum(len(index) for index in snapshot['prefixes'].values())
+    return (f"format v{snapshot['format_version']}, built {snapshot['built_at']} "
+            f"from {snapshot['source']}: {len(snapshot['prefixes'])} prefixes, {courses} courses")
+
+
+# ============================================================================
+# Command Line
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Build an offline VCU Bulletin catalog snapshot')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='Build a snapshot')
+    source_group = build_parser.add_mutually_exclusive_group(required=True)
+    source_group.add_argument('--html-dir', help='Directory of saved /azcourses/<prefix>/ pages')
+    source_group.add_argument('--crawl', action='store_true', help='Fetch pages from bulletin.vcu.edu')
+    build_parser.add_argument('--prefixes', nargs='+', help='Prefixes to crawl (default: all)')
+    build_parser.add_argument('-o', '--output', default='bulletin_snapshot.json.gz', help='Snapshot file')
+
+    info_parser = subparsers.add_parser('info', help='Describe a snapshot')
+    info_parser.add_argument('snapshot', help='Snapshot file')
+
+    args = parser.parse_args()
+
+    if args.command == 'info':
+        print(snapshot_summary(load_snapshot(args.snapshot)))
+        return
+
+    if args.html_dir:
+        snapshot = build_snapshot(iter_saved_pages(args.html_dir), f"html-dir:{os.path.abspath(args.html_dir)}")
+    else:
+        prefixes = [prefix.upper() for prefix in args.prefixes] if args.prefixes else discover_prefixes()
+        snapshot = build_snapshot(iter_crawled_pages(prefixes), BULLETIN_COURSES_URL)
+
+    if not snapshot['prefixes']:
+        print("[ERROR] No prefix pages found; snapshot not written")
+        sys.exit(1)
+
+    write_snapshot(snapshot, args.output)
+    print(f"\nWrote {args.output} ({os.path.getsize(args.output):,} bytes)")
+    print(snapshot_summary(snapshot))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,421 @@
+"""
+Text Extraction Backends
+Pluggable PDF/DOCX text extractors, selected by name or by speed tier
+"""
+
+import importlib.util
+import io
+from importlib import metadata
+
+
+# ============================================================================
+# Backend Interface
+# ============================================================================
+
+# Speed tiers a backend can be selected by instead of its name
+TIERS = ('fast', 'accurate')
+
+
+class ExtractionBackend:
+    """
+    Base class for text extractors.
+
+    A backend reads one file format page by page: open() parses a binary
+    stream, page_count() and page_text() read it, close() frees it. Formats
+    without pages (DOCX) report a single page holding the whole text.
+
+    Subclasses set:
+        name: Name used to select the backend (PDF_BACKEND=<name>)
+        extension: File extension handled, e.g. '.pdf'
+        tier: 'fast' or 'accurate'
+        requires: Importable modules the backend needs
+        distribution: Package whose version identifies the extractor
+    """
+
+    name = None
+    extension = None
+    tier = 'accurate'
+    requires = ()
+    distribution = None
+
+    @classmethod
+    def is_available(cls):
+        """Whether every module the backend needs is installed"""
+        return all(importlib.util.find_spec(module) is not None for module in cls.requires)
+
+    @property
+    def version(self):
+        """Backend name plus library version, e.g. 'pypdf2-3.0.1'"""
+        try:
+            return f"{self.name}-{metadata.version(self.distribution)}"
+        except (metadata.PackageNotFoundError, ValueError):
+            return self.name
+
+    def open(self, stream):
+        raise NotImplementedError
+
+    def page_count(self, document):
+        return 1
+
+    def page_text(self, document, index):
+        raise NotImplementedError
+
+    def close(self, document):
+        pass
+
+
+# ============================================================================
+# PDF Backends
+# ============================================================================
+
+class PyPDF2Backend(ExtractionBackend):
+    """PyPDF2 (pure Python); the default PDF backend"""
+
+    name = 'pypdf2'
+    extension = '.pdf'
+    tier = 'accurate'
+    requires = ('PyPDF2',)
+    distribution = 'PyPDF2'
+
+    def open(self, stream):
+        import PyPDF2
+        return PyPDF2.PdfReader(stream)
+
+    def page_count(self, document):
+        return len(document.pages)
+
+    def page_text(self, document, index):
+        return document.pages[index].extract_text()
+
+
+class PyMuPDFBackend(ExtractionBackend):
+    """PyMuPDF (MuPDF C library); much faster, slightly different spacing"""
+
+    name = 'pymupdf'
+    extension = '.pdf'
+    tier = 'fast'
+    requires = ('fitz',)
+    distribution = 'PyMuPDF'
+
+    def open(self, stream):
+        import fitz
+        return fitz.open(stream=stream.read(), filetype='pdf')
+
+    def page_count(self, document):
+        return document.page_count
+
+    def page_text(self, document, index):
+        return document[index].get_text()
+
+    def close(self, document):
+        document.close()
+
+
+class PdfMinerBackend(ExtractionBackend):
+    """
+    pdfminer.six; slow but follows the page layout closely.
+
+    The document is parsed once in open(); pages are then laid out one at a
+    time with a single interpreter, giving the same text per page as
+    pdfminer.high_level.extract_text(page_numbers=[index]).
+    """
+
+    name = 'pdfminer'
+    extension = '.pdf'
+    tier = 'accurate'
+    requires = ('pdfminer',)
+    distribution = 'pdfminer.six'
+
+    def open(self, stream):
+        from pdfminer.converter import TextConverter
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+
+        # The parser reads objects lazily, so keep a stream of our own open
+        data = io.BytesIO(stream.read())
+        pages = list(PDFPage.get_pages(data))
+        resources = PDFResourceManager()
+        output = io.StringIO()
+        converter = TextConverter(resources, output, laparams=LAParams())
+        return {
+            'data': data,
+            'pages': pages,
+            'output': output,
+            'converter': converter,
+            'interpreter': PDFPageInterpreter(resources, converter)
+        }
+
+    def page_count(self, document):
+        return len(document['pages'])
+
+    def page_text(self, document, index):
+        output = document['output']
+        output.seek(0)
+        output.truncate()
+        document['interpreter'].process_page(document['pages'][index])
+        return output.getvalue()
+
+    def close(self, document):
+        document['converter'].close()
+        document['data'].close()
+
+
+# ============================================================================
+# DOCX Backends
+# ============================================================================
+
+class PythonDocxBackend(ExtractionBackend):
+    """python-docx; paragraphs followed by hyperlink targets"""
+
+    name = 'python-docx'
+    extension = '.docx'
+    tier = 'accurate'
+    requires = ('docx',)
+    distribution = 'python-docx'
+
+    def open(self, stream):
+        from docx import Document
+        return Document(stream)
+
+    def page_text(self, document, index):
+        text = ""
+        # Extract paragraph text
+        for paragraph in document.paragraphs:
+            text += paragraph.text + "\n"
+
+        # Also try to extract hyperlinks
+        for rel in document.part.rels.values():
+            if "hyperlink" in rel.reltype:
+                if hasattr(rel, '_target'):
+                    text += f" {rel._target} "
+        return text
+
+
+# WordprocessingML and package relationship namespaces
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_PACKAGE_RELS = '{http://schemas.openxmlformats.org/package/2006/relationships}Relationship'
+_OFFICE_DOCUMENT = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+
+# Run children with a text equivalent (w:t and w:br are handled separately)
+_RUN_SYMBOLS = {_W + 'cr': "\n", _W + 'noBreakHyphen': "-", _W + 'ptab': "\t", _W + 'tab': "\t"}
+
+
+class StreamingDocxBackend(ExtractionBackend):
+    """
+    Reads word/document.xml straight out of the zip with lxml iterparse.
+
+    Body paragraphs and hyperlink targets come out exactly as python-docx
+    gives them, so switching backends does not change scores. With
+    include_tables (see StreamingDocxTablesBackend), tables, which python-docx
+    skips, are added in document order as one line per row (cells
+    tab-separated). Each paragraph and table row is dropped from the tree
+    once read, so memory stays bounded by the largest of them rather than
+    the whole document.
+    """
+
+    name = 'docx-stream'
+    extension = '.docx'
+    tier = 'fast'
+    requires = ('lxml',)
+    distribution = 'lxml'
+    # Bump whenever the text this backend produces changes
+    format_version = 1
+
+    def __init__(self, include_tables=False):
+        self.include_tables = include_tables
+
+    @property
+    def version(self):
+        """Output format rather than library version, e.g. 'docx-stream-1-no-tables'"""
+        tables = 'tables' if self.include_tables else 'no-tables'
+        return f"{self.name}-{self.format_version}-{tables}"
+
+    def open(self, stream):
+        import zipfile
+        return zipfile.ZipFile(stream)
+
+    def close(self, document):
+        document.close()
+
+    def page_text(self, document, index):
+        from lxml import etree
+
+        main_part = self._main_part(document)
+        lines = []
+        body, paragraph, row = _W + 'body', _W + 'p', _W + 'tr'
+        with document.open(main_part) as xml:
+            for _, element in etree.iterparse(xml, events=('end',), tag=(paragraph, row, _W + 'tbl'),
+                                              remove_blank_text=True, resolve_entities=False):
+                parent = element.getparent()
+                if parent is None:
+                    continue
+                if parent.tag == body:
+                    if element.tag == paragraph:
+                        lines.append(self._paragraph_text(element) + "\n")
+                elif element.tag == row and parent.getparent().tag == body:
+                    # Rows of top-level tables are read (and dropped) one at a time
+                    if self.include_tables:
+                        text = self._row_text(element)
+                        if text.strip():
+                            lines.append(text + "\n")
+                else:
+                    # Nested rows and paragraphs are read with their parent block
+                    continue
+                # Drop everything read so far; only the open ancestors remain
+                element.clear()
+                while element.getprevious() is not None:
+                    del parent[0]
+
+        lines.extend(f" {target} " for target in self._hyperlink_targets(document, main_part))
+        return "".join(lines)
+
+    def _main_part(self, document):
+        """Zip member name of the main document part, from _rels/.rels"""
+        from lxml import etree
+        rels = etree.fromstring(document.read('_rels/.rels'))
+        for rel in rels.iter(_PACKAGE_RELS):
+            if rel.get('Type') == _OFFICE_DOCUMENT:
+                return rel.get('Target').lstrip('/')
+        return 'word/document.xml'
+
+    def _hyperlink_targets(self, document, main_part):
+        """Hyperlink relationship targets of the main part, in file order"""
+        from lxml import etree
+        folder, _, filename = main_part.rpartition('/')
+        rels_part = f"{folder}/_rels/{filename}.rels" if folder else f"_rels/{filename}.rels"
+        if rels_part not in document.namelist():
+            return []
+        rels = etree.fromstring(document.read(rels_part))
+        return [rel.get('Target') for rel in rels.iter(_PACKAGE_RELS)
+                if 'hyperlink' in rel.get('Type', '')]
+
+    def _paragraph_text(self, paragraph):
+        """Text of the paragraph's runs, including runs inside w:hyperlink"""
+        parts = []
+        for child in paragraph:
+            if child.tag == _W + 'r':
+                self._run_text(child, parts)
+            elif child.tag == _W + 'hyperlink':
+                for run in child:
+                    if run.tag == _W + 'r':
+                        self._run_text(run, parts)
+        return "".join(parts)
+
+    def _run_text(self, run, parts):
+        for child in run:
+            tag = child.tag
+            if tag == _W + 't':
+                parts.append(child.text or "")
+            elif tag == _W + 'br':
+                # Page and column breaks have no text
+                if child.get(_W + 'type', 'textWrapping') == 'textWrapping':
+                    parts.append("\n")
+            elif tag in _RUN_SYMBOLS:
+                parts.append(_RUN_SYMBOLS[tag])
+
+    def _row_text(self, row):
+        """Cells tab-separated; each cell's paragraphs and nested table rows space-separated"""
+        cells = []
+        for cell in row.iterchildren(_W + 'tc'):
+            content = []
+            for block in cell:
+                if block.tag == _W + 'p':
+                    content.append(self._paragraph_text(block))
+                elif block.tag == _W + 'tbl':
+                    content.extend(self._row_text(nested) for nested in block.iterchildren(_W + 'tr'))
+            cells.append(" ".join(text for text in content if text.strip()))
+        return "\t".join(cells)
+
+
+class StreamingDocxTablesBackend(StreamingDocxBackend):
+    """
+    docx-stream with table rows included (DOCX_BACKEND=docx-tables).
+
+    Opt-in because the extra text (e.g. weekly schedules kept in tables)
+    changes scores compared with python-docx.
+    """
+
+    name = 'docx-tables'
+
+    def __init__(self, include_tables=True):
+        super().__init__(include_tables=include_tables)
+
+
+# ============================================================================
+# Registry
+# ============================================================================
+
+# extension -> {name: backend class}, in registration order
+_backends = {}
+_instances = {}
+DEFAULT_BACKENDS = {}
+
+
+def register_backend(backend_class, default=False):
+    """
+    Make a backend selectable by name and tier.
+
+    Args:
+        backend_class: ExtractionBackend subclass
+        default: Use it when no backend is configured for its extension
+    """
+    _backends.setdefault(backend_class.extension, {})[backend_class.name] = backend_class
+    if default or backend_class.extension not in DEFAULT_BACKENDS:
+        DEFAULT_BACKENDS[backend_class.extension] = backend_class.name
+    return backend_class
+
+
+def available_backends(extension):
+    """Names of the installed backends for an extension, default first"""
+    names = [name for name, backend_class in _backends.get(extension, {}).items()
+             if backend_class.is_available()]
+    default = DEFAULT_BACKENDS.get(extension)
+    return sorted(names, key=lambda name: name != default)
+
+
+def get_backend(extension, choice=None):
+    """
+    Resolve a configured backend choice.
+
+    Args:
+        extension: File extension, e.g. '.pdf'
+        choice: Backend name, a tier ('fast' or 'accurate'), or None for the default
+
+    Returns:
+        ExtractionBackend: Shared instance of the chosen backend. A backend
+                           that is not installed falls back to the default.
+
+    Raises:
+        ValueError: If the extension or backend name is unknown
+    """
+    if extension not in _backends:
+        raise ValueError(f"No extraction backends for {extension}")
+    default = DEFAULT_BACKENDS[extension]
+    choice = (choice or default).lower()
+
+    if choice in TIERS:
+        # First installed backend of the tier; the default if none is
+        name = next((name for name in available_backends(extension)
+                     if _backends[extension][name].tier == choice), default)
+    elif choice in _backends[extension]:
+        name = choice
+        if not _backends[extension][name].is_available():
+            print(f"Warning: {extension} extraction backend '{name}' is not installed; using '{default}'")
+            name = default
+    else:
+        raise ValueError(f"Unknown {extension} extraction backend: {choice} "
+                         f"(choose from {', '.join(list(_backends[extension]) + list(TIERS))})")
+
+    key = (extension, name)
+    if key not in _instances:
+        _instances[key] = _backends[extension][name]()
+    return _instances[key]
+
+
+register_backend(PyPDF2Backend, default=True)
+register_backend(PyMuPDFBackend)
+register_backend(PdfMinerBackend)
+register_backend(StreamingDocxBackend, default=True)
+register_backend(PythonDocxBackend)
+register_backend(StreamingDocxTablesBackend)
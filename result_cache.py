@@ -0,0 +1,164 @@
+"""
+Syllabus Result Cache
+Caches check results by file content hash and ruleset fingerprint
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+# ============================================================================
+# Result Cache
+# ============================================================================
+
+class ResultCache:
+    """
+    Two-tier cache of syllabus check results.
+
+    Keys combine the SHA-256 of the file bytes, the file extension (the same
+    bytes read as TXT or PDF give different results) and the checker
+    fingerprint, so editing any requirement pattern or switching extraction
+    backends invalidates old entries.
+
+    Tier 1 is an in-memory LRU bounded by max_entries. Tier 2 is an optional
+    SQLite file shared by every worker process, bounded by disk_max_entries
+    with least-recently-used eviction.
+    """
+
+    def __init__(self, fingerprint, max_entries=256, disk_path=None,
+                 disk_max_entries=10000, ttl_seconds=24 * 3600):
+        self.fingerprint = fingerprint
+        self.max_entries = max_entries
+        self.disk_path = disk_path
+        self.disk_max_entries = disk_max_entries
+        # Results embed VCU Bulletin data, so entries still expire eventually
+        self.ttl_seconds = ttl_seconds
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if disk_path:
+            directory = os.path.dirname(disk_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.execute(
+                    'CREATE TABLE IF NOT EXISTS results ('
+                    'key TEXT PRIMARY KEY, result TEXT NOT NULL, '
+                    'created_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+                )
+
+    @contextlib.contextmanager
+    def _connect(self):
+        # sqlite3's own context manager only commits; close the connection too
+        conn = sqlite3.connect(self.disk_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def key_for(self, data, filename):
+        """Build the cache key for a file's bytes"""
+        _, ext = os.path.splitext(filename.lower())
+        digest = hashlib.sha256(data).hexdigest()
+        return f"{digest}:{ext}:{self.fingerprint}"
+
+    def get(self, key):
+        """
+        Get a cached result.
+
+        Returns:
+            dict or None: A fresh copy of the cached result
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                stored_at, payload = entry
+                if now - stored_at < self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return json.loads(payload)
+                del self._memory[key]
+
+        row = self._disk_get(key, now)
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            payload, created_at = row
+            self.hits += 1
+            # Keep the stored age so the memory copy expires with the disk row
+            self._remember(key, payload, created_at)
+        return json.loads(payload)
+
+    def set(self, key, result):
+        """Cache a result (without its per-upload 'filename')"""
+        result = {k: v for k, v in result.items() if k != 'filename'}
+        payload = json.dumps(result)
+        now = time.time()
+        with self._lock:
+            self._remember(key, payload, now)
+        self._disk_set(key, payload, now)
+
+    def _remember(self, key, payload, stored_at):
+        self._memory[key] = (stored_at, payload)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, key, now):
+        if not self.disk_path:
+            return None
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT result, created_at FROM results WHERE key = ? AND created_at > ?',
+                (key, now - self.ttl_seconds)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute('UPDATE results SET accessed_at = ? WHERE key = ?', (now, key))
+        return row
+
+    def _disk_set(self, key, payload, now):
+        if not self.disk_path:
+            return
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO results (key, result, created_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, payload, now, now)
+            )
+            # Evict least recently used rows beyond the bound
+            conn.execute(
+                'DELETE FROM results WHERE key IN ('
+                'SELECT key FROM results ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)',
+                (self.disk_max_entries,)
+            )
+
+    def clear(self):
+        """Clear both tiers"""
+        with self._lock:
+            self._memory.clear()
+        if self.disk_path:
+            with self._connect() as conn:
+                conn.execute('DELETE FROM results')
+
+    def stats(self):
+        """Get cache statistics for monitoring"""
+        with self._lock:
+            return {
+                'entries': len(self._memory),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'disk_enabled': bool(self.disk_path)
+            }
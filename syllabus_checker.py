@@ -1,388 +1,640 @@
 import re
-import PyPDF2
-from docx import Document
+import io
 import os
+import codecs
+import hashlib
+import mmap
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
 from urllib.parse import urlparse
+from extraction_backends import get_backend
+from syllabus_rules import CompiledRuleset, EvaluationContext, SettledMatchView, iter_rules, keyword_pattern
+from text_cache import TextCache
 
 # Import VCU Bulletin scraper
 try:
-    from vcu_bulletin_scraper import scrape_course_data
+    from vcu_bulletin_scraper import (
+        scrape_course_data, configure_cache, configure_rate_limiter,
+        get_cache_stats, get_circuit_breaker_stats, is_offline
+    )
     BULLETIN_SCRAPER_AVAILABLE = True
 except ImportError:
     BULLETIN_SCRAPER_AVAILABLE = False
     print("Warning: VCU Bulletin scraper not available. Install required packages: beautifulsoup4, requests, lxml")
 
-class SyllabusChecker:
-    def __init__(self):
-        # Enhanced requirement definitions with multiple detection strategies
-        # Requirements with sub-items have 'sub_items' field for granular checking
-        self.requirements = {
-            'course_info': {
-                'name': 'Course information',
-                'has_sub_items': True,
-                'sub_items': {
-                    'course_code': {
-                        'name': 'Course prefix and number',
-                        'weight': 0.34,  # ~1/3 of requirement
-                        'primary_patterns': [
-                            r'\b[A-Z]{2,4}\s*-?\s*\d{3,4}(?!-\d)',  # INFO 370, CHEM-2001 (but not INFO370-003)
-                        ],
-                        'context_keywords': ['course', 'class'],
-                        'min_matches': 1
-                    },
-                    'section_number': {
-                        'name': 'Section number',
-                        'weight': 0.33,  # ~1/3 of requirement
-                        'primary_patterns': [
-                            r'(?i)section\s*:?\s*#?\s*\d+',  # Section: 001, Section #1
-                            r'(?i)section\s*:?\s*#?\s*[0-9]{3}',  # Section 001
-                            r'\b[A-Z]{2,4}\s*\d{3,4}-\d{3}',  # INFO370-003
-                        ],
-                        'context_keywords': ['section'],
-                        'min_matches': 1
-                    },
-                    'course_title': {
-                        'name': 'Course title',
-                        'weight': 0.33,  # ~1/3 of requirement
-                        'primary_patterns': [
-                            r'(?i)(?:course\s+)?title\s*:?\s*.{10,}',  # Course Title: ...
-                            r'(?i)course\s+name\s*:?\s*.{10,}',  # Course Name: ...
-                        ],
-                        'context_keywords': ['title', 'name'],
-                        'min_matches': 1,
-                        'use_bulletin_validation': True  # Will validate against official title
-                    }
-                }
-            },
-            'semester_credits': {
-                'name': 'Semester and credit information',
-                'has_sub_items': True,
-                'sub_items': {
-                    'semester_term': {
-                        'name': 'Semester term',
-                        'weight': 0.5,  # 1/2 of requirement
-                        'primary_patterns': [
-                            r'(?i)(fall|spring|summer|winter)\s+\d{4}',  # Fall 2024
-                            r'(?i)semester:\s*(fall|spring|summer|winter)',
-                            r'(?i)(fall|spring|summer|winter)\s+(semester|term)',
-                        ],
-                        'context_keywords': ['semester', 'term', 'fall', 'spring', 'summer', 'winter'],
-                        'min_matches': 1
-                    },
-                    'credit_hours': {
-                        'name': 'Credit hours',
-                        'weight': 0.5,  # 1/2 of requirement
-                        'primary_patterns': [
-                            r'\d+\s*credit\s*hours?',  # 3 credit hours
-                            r'\d+\s*credits?(?!\s*towards)',  # 3 credits
-                            r'(?i)\d+\s*(?:semester\s+)?(?:hour|hr)s?',  # 3 semester hours
-                        ],
-                        'context_keywords': ['credit', 'hours', 'credits'],
-                        'min_matches': 1
-                    }
-                }
-            },
-            'meeting_info': {
-                'name': 'Class meeting information',
-                'has_sub_items': True,
-                'sub_items': {
-                    'meeting_days': {
-                        'name': 'Meeting days',
-                        'weight': 0.33,  # ~1/3 of requirement
-                        'primary_patterns': [
-                            r'(?i)(monday|tuesday|wednesday|thursday|friday|saturday|sunday)',
-                            r'(?i)(mon|tue|wed|thu|fri|sat|sun)[\s,]',
-                            r'(?i)(?:m|t|w|th|f)\s*(?:&|and)\s*(?:m|t|w|th|f)',  # MW, TR
-                        ],
-                        'context_keywords': ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'days'],
-                        'min_matches': 1
-                    },
-                    'meeting_time': {
-                        'name': 'Meeting time',
-                        'weight': 0.33,  # ~1/3 of requirement
-                        'primary_patterns': [
-                            r'\d{1,2}:\d{2}\s*(?:am|pm|AM|PM)?',  # 2:00 PM
-                            r'(?i)\d{1,2}:\d{2}\s*(?:a\.?m\.?|p\.?m\.?)',
-                            r'(?i)time\s*:?\s*\d{1,2}:\d{2}',
-                        ],
-                        'context_keywords': ['time', 'meets'],
-                        'min_matches': 1
-                    },
-                    'meeting_location': {
-                        'name': 'Meeting location',
-                        'weight': 0.34,  # ~1/3 of requirement
-                        'primary_patterns': [
-                            # Physical locations
-                            r'(?i)room\s*:?\s*\w+\d+',  # Room: 101, Room B201
-                            r'(?i)building\s*:?\s*\w+',
-                            r'(?i)(harris|cabell|snead|rhoads|shafer|temple)\s+(hall|building)',  # VCU buildings
-                            r'(?i)location\s*:?\s*\w+',
-
-                            # Online/Virtual locations
-                            r'(?i)\bonline\b',  # online
-                            r'(?i)\bvirtual(?:ly)?\b',  # virtual, virtually
-                            r'(?i)\bremote(?:ly)?\b',  # remote, remotely
-                            r'(?i)\bzoom\b',  # Zoom
-                            r'(?i)\b(?:a?sync(?:hronous)?)\s+online\b',  # synchronous online, asynchronous online, async online
-                            r'(?i)\b(?:fully\s+)?online\s+(?:course|class)\b',  # fully online course
-                            r'(?i)(?:via|through|using)\s+(?:zoom|teams|canvas|blackboard|webex|google\s+meet)',  # via Zoom, through Teams
-                            r'(?i)microsoft\s+teams',  # Microsoft Teams
-                            r'(?i)google\s+meet',  # Google Meet
-                            r'(?i)distance\s+learning',  # distance learning
-                        ],
-                        'context_keywords': ['room', 'building', 'location', 'hall', 'online', 'zoom', 'virtual', 'remote', 'asynchronous', 'synchronous'],
-                        'min_matches': 1
-                    }
-                }
-            },
-            'instructor_info': {
-                'name': 'Instructor information',
-                'has_sub_items': True,
-                'sub_items': {
-                    'instructor_name': {
-                        'name': 'Instructor name',
-                        'weight': 0.33,  # ~1/3 of requirement
-                        'primary_patterns': [
-                            r'(?i)(instructor|professor|dr\.?|teacher)\s*:?\s*[A-Z][a-z]+\s+[A-Z][a-z]+',
-                            r'(?i)taught\s+by\s*:?\s*[A-Z][a-z]+',
-                        ],
-                        'context_keywords': ['instructor', 'professor', 'teacher', 'dr', 'taught'],
-                        'min_matches': 1
-                    },
-                    'contact_info': {
-                        'name': 'Contact information',
-                        'weight': 0.33,  # ~1/3 of requirement
-                        'primary_patterns': [
-                            r'[\w\.-]+@[\w\.-]+\.edu',  # Email
-                            r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # Phone
-                            r'(?i)email\s*:?\s*[\w\.-]+@',
-                            r'(?i)phone\s*:?\s*\(?\d{3}\)?',
-                        ],
-                        'context_keywords': ['email', 'phone', 'contact'],
-                        'min_matches': 1
-                    },
-                    'office_hours': {
-                        'name': 'Office hours',
-                        'weight': 0.34,  # ~1/3 of requirement
-                        'primary_patterns': [
-                            r'(?i)office\s*hours?\s*:?',
-                            r'(?i)office\s*:?\s*(?:mon|tue|wed|thu|fri)',
-                            r'(?i)available\s*:?\s*(?:mon|tue|wed|thu|fri)',
-                        ],
-                        'context_keywords': ['office', 'hours', 'available', 'appointment'],
-                        'min_matches': 1
-                    }
-                }
-            },
-            'course_description': {
-                'name': 'University course description',
+# Enhanced requirement definitions with multiple detection strategies
+# Requirements with sub-items have 'sub_items' field for granular checking
+REQUIREMENTS = {
+    'course_info': {
+        'name': 'Course information',
+        'has_sub_items': True,
+        'sub_items': {
+            'course_code': {
+                'name': 'Course prefix and number',
+                'weight': 0.34,  # ~1/3 of requirement
                 'primary_patterns': [
-                    r'(?i)course\s*description\s*:?',
-                    r'(?i)description\s*:?\s*(?:this\s+course|students\s+will)',
-                    r'(?i)(?:this\s+course|the\s+course)\s+(?:provides|introduces|explores|examines|covers)',
-                    r'(?i)course\s*overview',  # "Course Overview"
-                    r'(?i)catalog\s*description',  # "Catalog Description"
-                    r'(?i)(?:from|per)\s+(?:the\s+)?(?:vcu\s+)?bulletin',  # "From VCU Bulletin"
+                    r'\b[A-Z]{2,4}\s*-?\s*\d{3,4}(?!-\d)',  # INFO 370, CHEM-2001 (but not INFO370-003)
                 ],
-                'context_keywords': ['description', 'course', 'covers', 'introduces', 'explores', 'overview', 'bulletin'],
-                'min_matches': 1,
-                'min_text_length': 50  # Description should be substantial
+                'context_keywords': ['course', 'class'],
+                'sections': ['course_information'],  # Section kinds searched before the whole text
+                'min_matches': 1
             },
-            'prerequisites': {
-                'name': 'Course prerequisites',
+            'section_number': {
+                'name': 'Section number',
+                'weight': 0.33,  # ~1/3 of requirement
                 'primary_patterns': [
-                    r'(?i)prerequisite\s*:?',
-                    r'(?i)prereq\s*:?',
-                    r'(?i)required\s+courses?\s*:?',
-                    r'(?i)(?:none|no\s+prerequisites)',  # Also detect when there are none
-                    r'(?i)students?\s+must\s+have\s+(?:completed|taken|passed)',
+                    r'(?i)section\s*:?\s*#?\s*\d+',  # Section: 001, Section #1
+                    r'(?i)section\s*:?\s*#?\s*[0-9]{3}',  # Section 001
+                    r'\b[A-Z]{2,4}\s*\d{3,4}-\d{3}',  # INFO370-003
                 ],
-                'context_keywords': ['prerequisite', 'prereq', 'required', 'prior', 'before'],
+                'context_keywords': ['section'],
+                'sections': ['course_information'],
                 'min_matches': 1
             },
-            'learning_outcomes': {
-                'name': 'Student learning outcomes',
+            'course_title': {
+                'name': 'Course title',
+                'weight': 0.33,  # ~1/3 of requirement
                 'primary_patterns': [
-                    r'(?i)(learning|course)\s*(outcomes|objectives)?\s*:?',
-                    r'(?i)(?:upon\s+completion|by\s+the\s+end).*students?\s+(?:will|should)',
-                    r'(?i)students?\s+will\s+be\s+able\s+to',
-                    r'(?i)learning\s+goals?\s*:?',
+                    r'(?i)(?:course\s+)?title\s*:?\s*.{10,}',  # Course Title: ...
+                    r'(?i)course\s+name\s*:?\s*.{10,}',  # Course Name: ...
                 ],
-                'context_keywords': ['learning', 'outcome', 'objective', 'goal', 'students will'],
-                'min_matches': 1
-            },
-            'required_materials': {
-                'name': 'Required texts and/or course materials',
+                'context_keywords': ['title', 'name'],
+                'sections': ['course_information'],
+                'min_matches': 1,
+                'use_bulletin_validation': True  # Will validate against official title
+            }
+        }
+    },
+    'semester_credits': {
+        'name': 'Semester and credit information',
+        'has_sub_items': True,
+        'sub_items': {
+            'semester_term': {
+                'name': 'Semester term',
+                'weight': 0.5,  # 1/2 of requirement
                 'primary_patterns': [
-                    r'(?i)required\s+(?:text|book|material|reading)s?\s*:?',
-                    r'(?i)textbooks?\s*:?',
-                    r'(?i)course\s+materials?\s*:?',
-                    r'ISBN[:\s-]*\d',
-                    r'(?i)(?:required|recommended)\s+readings?\s*:?',
+                    r'(?i)(fall|spring|summer|winter)\s+\d{4}',  # Fall 2024
+                    r'(?i)semester:\s*(fall|spring|summer|winter)',
+                    r'(?i)(fall|spring|summer|winter)\s+(semester|term)',
                 ],
-                'context_keywords': ['textbook', 'required', 'material', 'isbn', 'reading'],
+                'context_keywords': ['semester', 'term', 'fall', 'spring', 'summer', 'winter'],
+                'sections': ['course_information'],
                 'min_matches': 1
             },
-            'course_schedule': {
-                'name': 'Course schedule',
+            'credit_hours': {
+                'name': 'Credit hours',
+                'weight': 0.5,  # 1/2 of requirement
                 'primary_patterns': [
-                    r'(?i)(?:course|class|weekly|tentative)\s*schedule\s*:?',
-                    r'(?i)week\s+\d+\s*:?',
-                    r'(?i)(?:course|class)\s*(?:calendar|timeline)\s*:?',  # Made stricter to avoid "Academic Calendar"
-                    r'(?i)(?:week|session|class)\s+\d+.*(?:topic|chapter)',
-                    r'(?i)(?:day|dates?)\s+(?:topic|chapter|reading)',
-                    r'(?i)module\s+\d+\s*:?',  # "Module 1: Introduction"
-                    r'(?i)(?:lesson|unit)\s+\d+',  # "Lesson 1", "Unit 1"
-                    r'(?i)(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d+.*(?:topic|chapter|reading)',  # Date-based
-                    r'(?i)\d{1,2}/\d{1,2}.*(?:topic|chapter|assignment)',  # "9/1 - Topic: Intro"
-                    r'(?i)(?:see|refer to|attached)\s+(?:schedule|calendar)',  # References to external schedule
+                    r'\d+\s*credit\s*hours?',  # 3 credit hours
+                    r'\d+\s*credits?(?!\s*towards)',  # 3 credits
+                    r'(?i)\d+\s*(?:semester\s+)?(?:hour|hr)s?',  # 3 semester hours
                 ],
-                'context_keywords': ['schedule', 'week', 'calendar', 'topic', 'date', 'module', 'lesson', 'unit'],
-                'min_matches': 1  # Reduced from 2 - any clear schedule indicator
-            },
-            'final_exam': {
-                'name': 'Final exam date and time',
+                'context_keywords': ['credit', 'hours', 'credits'],
+                'sections': ['course_information'],
+                'min_matches': 1
+            }
+        }
+    },
+    'meeting_info': {
+        'name': 'Class meeting information',
+        'has_sub_items': True,
+        'sub_items': {
+            'meeting_days': {
+                'name': 'Meeting days',
+                'weight': 0.33,  # ~1/3 of requirement
                 'primary_patterns': [
-                    r'(?i)final\s+exam\s*:?',
-                    r'(?i)final\s+assessment\s*:?',
-                    r'(?i)final\s+examination\s*:?',
-                    r'(?i)(?:final|exam)\s+(?:date|time|schedule)',
-                    r'(?i)(?:no\s+final\s+exam|final\s+project\s+instead)',  # Explicit alternatives
-                    r'(?i)final\s+project\s*:?',  # Final project
-                    r'(?i)(?:semester|capstone|group)\s+project\s*:?',  # Semester/Capstone/Group project
-                    r'(?i)project\s+\d+%',  # "Project 40%" in grade weights
+                    r'(?i)(monday|tuesday|wednesday|thursday|friday|saturday|sunday)',
+                    r'(?i)(mon|tue|wed|thu|fri|sat|sun)[\s,]',
+                    r'(?i)(?:m|t|w|th|f)\s*(?:&|and)\s*(?:m|t|w|th|f)',  # MW, TR
                 ],
-                'context_keywords': ['final', 'exam', 'examination', 'assessment', 'project'],
+                'context_keywords': ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'days'],
+                'sections': ['course_information'],
                 'min_matches': 1
             },
-            'grading_scale': {
-                'name': 'Grading scale',
+            'meeting_time': {
+                'name': 'Meeting time',
+                'weight': 0.33,  # ~1/3 of requirement
                 'primary_patterns': [
-                    r'(?i)grading\s*scale\s*:?',
-                    r'(?i)grade\s*scale\s*:?',
-                    r'(?i)letter\s*grades?\s*:?',
-                    r'[A-F]\s*(?:>=|<=|[=:≥≤><])\s*\d+\.?\d*',  # A = 90, A >= 90, A ≥ 89.01, A > 90
-                    r'\d+\.?\d*\s*[-–]\s*\d+\.?\d*\s*[=:]\s*[A-F]',  # 90-100 = A, 89.01-100 = A
-                    r'(?i)(?:94|90).*?(?:>=|[=:≥>])\s*a',  # Common A cutoffs with various operators
-                    r'(?i)[A-F]\s+\d+\.?\d*\s+(?:and\s+)?(?:above|or\s+(?:higher|greater))',  # A 90 and above, B 80 or higher
-                    r'(?i)[A-F]\s+\d+\.?\d*\s*%?\s*(?:and\s+)?(?:above|or\s+(?:higher|greater))',  # A 90% and above
-                    r'(?i)[A-F]\s+\d+\.?\d*\s+(?:and\s+)?(?:below|or\s+(?:lower|less))',  # F 59 and below, F 60 or lower
-                    r'(?i)[A-F]\s+\d+\.?\d*\s*%?\s*(?:and\s+)?(?:below|or\s+(?:lower|less))',  # F 59% and below
-                    
-                    # Synonyms for "scale"
-                    r'(?i)grading\s*(?:rubric|criteria|standards?)\s*:?',  # "Grading rubric"
-                    r'(?i)grade\s*(?:rubric|criteria|standards?)\s*:?',  # "Grade criteria"
-                    r'(?i)(grading|grade)\s*(?:system|scheme|structure)\s*:?',  # "Grading system"                    r'(?i)letter\s*grade\s*(?:distribution|assignment)\s*:?',  # "Letter grade distribution"
-                    r'(?i)(?:final|course)\s*grade\s*(?:determination|calculation)\s*:?',  # "Final grade determination"
-                    r'(?i)grading\s*(?:policy|guidelines?)\s*:?',  # "Grading policy"
-                    r'(?i)(?:how|basis\s+for)\s+(?:final\s+)?grades?\s+(?:are\s+)?(?:determined|assigned|calculated)',  # "How grades are determined"
-                    r'(?i)grade\s+ranges?\s*:?',  # "Grade ranges"
-                    r'(?i)percentage\s+(?:scale|breakdown|ranges?)\s*:?',  # "Percentage scale"
-                    r'(?i)numeric\s+(?:grade|grading)\s*:?',  # "Numeric grading"
-                    
-                    # Percentage-based scales
-                    r'[A-F]\s*(?:>=|<=|[=:≥≤><])\s*\d+\.?\d*\s*%',  # A = 90%, A >= 90%, A > 89.999%
-                    r'\d+\.?\d*\s*%\s*[-–]\s*\d+\.?\d*\s*%\s*[=:]\s*[A-F]',  # 90%-100% = A
-                    r'[A-F]\s*(?:>=|<=|[=:≥≤><])\s*\d+\.?\d*\s*[-–]\s*\d+\.?\d*\s*%',  # A = 90-100%, A >= 90%
-                    
-                    # Points-based scales
-                    r'[A-F]\s*(?:>=|<=|[=:≥≤><])\s*\d+\.?\d*\s*(?:[-–]\s*\d+\.?\d*\s*)?(?:total\s+)?(?:points?|pts)\.?',  # A >= 89.01 total pts, A ≥ 89.01 total pts.
-                    r'\d+\.?\d*\s*[-–]\s*\d+\.?\d*\s*(?:points?|pts)\s*[=:]\s*[A-F]',  # 90-100 points = A
-                    r'(?i)(?:points?|pts)\s*(?:scale|system|based)',  # Points scale
-                    r'(?i)out\s+of\s+\d+\.?\d*\s*(?:total\s+)?(?:points?|pts)',  # out of 1000 points, out of 100.5 total pts
+                    r'\d{1,2}:\d{2}\s*(?:am|pm|AM|PM)?',  # 2:00 PM
+                    r'(?i)\d{1,2}:\d{2}\s*(?:a\.?m\.?|p\.?m\.?)',
+                    r'(?i)time\s*:?\s*\d{1,2}:\d{2}',
                 ],
-                'context_keywords': ['grading', 'grade', 'scale', 'letter', 'percentage', 'rubric', 'criteria', 'system', 'scheme', 'ranges', 'points', 'gpa', 'decimal', 'total', 'distribution'],
-                'min_matches': 2  # Need actual scale, not just mention
+                'context_keywords': ['time', 'meets'],
+                'sections': ['course_information'],
+                'min_matches': 1
             },
-            'grade_weights': {
-                'name': 'Grade categories and weights',
+            'meeting_location': {
+                'name': 'Meeting location',
+                'weight': 0.34,  # ~1/3 of requirement
                 'primary_patterns': [
-                    r'\d+\s*%',  # Percentage
-                    r'(?i)(?:weight|weigh)s?\s*:?',
-                    r'(?i)(?:exam|quiz|homework|assignment|project|participation)s?\s*[:=]\s*\d+\s*%',
-                    r'(?i)grade\s+(?:breakdown|composition|distribution)\s*:?',
-                    r'(?i)(?:worth|counts?\s+(?:for|as))\s+\d+\s*%',
-                    r'(?i)(?:exam|quiz|test)s?\s+\d+%',  # "Exams 40%"
-                    r'(?i)(?:total|sum)\s+(?:points|pts)',  # Point-based systems
-                    r'\d+\s*(?:points|pts)\s*(?:each|total)',  # "100 points each"
-                    r'(?i)(?:grading|grade)\s+(?:policy|breakdown|criteria)',  # Alternative headers
-                ],
-                'context_keywords': ['weight', 'percent', 'breakdown', 'distribution', 'points', 'grade', 'evaluation'],
-                'min_matches': 2  # Reduced from 3 to catch more edge cases
-            },
-            'syllabus_policy_link': {
-                'name': 'Link to VCU Syllabus Policy Statements',
-                'url_patterns': [
-                    r'https?://[^\s]*provost[^\s]*',
-                    r'https?://provost\.vcu\.edu',
-                    r'https?://[^\s]*vcu\.edu[^\s]*(?:provost|syllabus|policy)',
-                ],
-                'text_patterns': [
-                    r'(?i)vcu\s+syllabus\s+polic(?:y|ies)',
-                    r'(?i)provost.*?(?:website|web\s+site|policies)',
-                    r'(?i)syllabus\s+polic(?:y|ies).*?statements?',
-                    r'(?i)university\s+syllabus\s+(?:requirements|policies)',
-                ],
-                'context_keywords': ['provost', 'syllabus', 'policy', 'vcu', 'university'],
-                'min_matches': 1,
-                'check_urls': True
-            },
-            'library_statement': {
-                'name': 'VCU Libraries statement and link',
-                'url_patterns': [
-                    r'https?://(?:www\.)?library\.vcu\.edu',
-                    r'https?://[^\s]*vcu\.edu[^\s]*library',
-                ],
-                'text_patterns': [
-                    r'(?i)vcu\s+libraries?',
-                    r'(?i)use\s+vcu\s+libraries?',
-                    r'(?i)library\s+resources',
-                    r'(?i)libraries?\s+(?:to\s+)?find\s+and\s+access',
-                    r'(?i)library.*?(?:resources|services|support)',
-                ],
-                'required_phrases': [
-                    r'(?i)vcu\s+libraries',
-                    r'(?i)library\.vcu\.edu'
+                    # Physical locations
+                    r'(?i)room\s*:?\s*\w+\d+',  # Room: 101, Room B201
+                    r'(?i)building\s*:?\s*\w+',
+                    r'(?i)(harris|cabell|snead|rhoads|shafer|temple)\s+(hall|building)',  # VCU buildings
+                    r'(?i)location\s*:?\s*\w+',
+
+                    # Online/Virtual locations
+                    r'(?i)\bonline\b',  # online
+                    r'(?i)\bvirtual(?:ly)?\b',  # virtual, virtually
+                    r'(?i)\bremote(?:ly)?\b',  # remote, remotely
+                    r'(?i)\bzoom\b',  # Zoom
+                    r'(?i)\b(?:a?sync(?:hronous)?)\s+online\b',  # synchronous online, asynchronous online, async online
+                    r'(?i)\b(?:fully\s+)?online\s+(?:course|class)\b',  # fully online course
+                    r'(?i)(?:via|through|using)\s+(?:zoom|teams|canvas|blackboard|webex|google\s+meet)',  # via Zoom, through Teams
+                    r'(?i)microsoft\s+teams',  # Microsoft Teams
+                    r'(?i)google\s+meet',  # Google Meet
+                    r'(?i)distance\s+learning',  # distance learning
                 ],
-                'context_keywords': ['library', 'libraries', 'vcu', 'resources', 'access'],
-                'min_matches': 2,
-                'check_urls': True
+                'context_keywords': ['room', 'building', 'location', 'hall', 'online', 'zoom', 'virtual', 'remote', 'asynchronous', 'synchronous'],
+                'sections': ['course_information'],
+                'min_matches': 1
             }
         }
-        
-        self.recommended = {
-            'attendance_policy': {
-                'name': 'Attendance and punctuality policies',
+    },
+    'instructor_info': {
+        'name': 'Instructor information',
+        'has_sub_items': True,
+        'sub_items': {
+            'instructor_name': {
+                'name': 'Instructor name',
+                'weight': 0.33,  # ~1/3 of requirement
                 'primary_patterns': [
-                    r'(?i)attendance\s+polic(?:y|ies)\s*:?',
-                    r'(?i)(?:absence|absent)s?\s*:?',
-                    r'(?i)punctuality',
-                    r'(?i)late\s+(?:arrival|attendance)',
-                    r'(?i)(?:missing|miss)\s+(?:class|classes)',
+                    r'(?i)(instructor|professor|dr\.?|teacher)\s*:?\s*[A-Z][a-z]+\s+[A-Z][a-z]+',
+                    r'(?i)taught\s+by\s*:?\s*[A-Z][a-z]+',
                 ],
-                'context_keywords': ['attendance', 'absence', 'punctuality', 'late', 'present'],
+                'context_keywords': ['instructor', 'professor', 'teacher', 'dr', 'taught'],
+                'sections': ['instructor'],
                 'min_matches': 1
             },
-            'technology_policy': {
-                'name': 'Technology and media policies',
+            'contact_info': {
+                'name': 'Contact information',
+                'weight': 0.33,  # ~1/3 of requirement
                 'primary_patterns': [
-                    r'(?i)technology\s+polic(?:y|ies)\s*:?',
-                    r'(?i)(?:recording|recordings?)\s+(?:of\s+)?(?:class|lecture)s?',
-                    r'(?i)email\s+(?:response|policy)',
-                    r'(?i)(?:laptop|phone|device)s?\s+(?:policy|use)',
-                    r'(?i)(?:cell|mobile)\s+phones?',
-                    # AI Policy patterns - comprehensive coverage
-                    r'(?i)(?:artificial\s+intelligence|AI)\s+polic(?:y|ies)',  # AI Policy
-                    r'(?i)polic(?:y|ies)\s+(?:on|regarding|for)\s+(?:artificial\s+intelligence|AI)',  # Policy on AI
-                    r'(?i)(?:generative\s+)?AI\s+(?:use|tools?|policy)',  # AI use/tools/policy
-                    r'(?i)(?:use|usage)\s+of\s+(?:artificial\s+intelligence|AI)',  # Use of AI
-                    r'(?i)(?:artificial\s+intelligence|AI)\s+(?:is\s+)?(?:allowed|permitted|prohibited|forbidden)',  # AI allowed/prohibited
-                    r'(?i)(?:AI|artificial\s+intelligence).*?(?:policy|guideline|rule)',  # AI mentioned with policy terms
+                    r'[\w\.-]+@[\w\.-]+\.edu',  # Email
+                    r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # Phone
+                    r'(?i)email\s*:?\s*[\w\.-]+@',
+                    r'(?i)phone\s*:?\s*\(?\d{3}\)?',
                 ],
-                'context_keywords': ['technology', 'recording', 'email', 'laptop', 'phone', 'device', 'ai', 'chatgpt', 'intelligence', 'artificial', 'llm', 'generative'],
-                'min_matches': 2
+                'context_keywords': ['email', 'phone', 'contact'],
+                'sections': ['instructor'],
+                'min_matches': 1
+            },
+            'office_hours': {
+                'name': 'Office hours',
+                'weight': 0.34,  # ~1/3 of requirement
+                'primary_patterns': [
+                    r'(?i)office\s*hours?\s*:?',
+                    r'(?i)office\s*:?\s*(?:mon|tue|wed|thu|fri)',
+                    r'(?i)available\s*:?\s*(?:mon|tue|wed|thu|fri)',
+                ],
+                'context_keywords': ['office', 'hours', 'available', 'appointment'],
+                'sections': ['instructor'],
+                'min_matches': 1
             }
         }
+    },
+    'course_description': {
+        'name': 'University course description',
+        'primary_patterns': [
+            r'(?i)course\s*description\s*:?',
+            r'(?i)description\s*:?\s*(?:this\s+course|students\s+will)',
+            r'(?i)(?:this\s+course|the\s+course)\s+(?:provides|introduces|explores|examines|covers)',
+            r'(?i)course\s*overview',  # "Course Overview"
+            r'(?i)catalog\s*description',  # "Catalog Description"
+            r'(?i)(?:from|per)\s+(?:the\s+)?(?:vcu\s+)?bulletin',  # "From VCU Bulletin"
+        ],
+        'context_keywords': ['description', 'course', 'covers', 'introduces', 'explores', 'overview', 'bulletin'],
+        'sections': ['description'],
+        'min_matches': 1,
+        'min_text_length': 50  # Description should be substantial
+    },
+    'prerequisites': {
+        'name': 'Course prerequisites',
+        'primary_patterns': [
+            r'(?i)prerequisite\s*:?',
+            r'(?i)prereq\s*:?',
+            r'(?i)required\s+courses?\s*:?',
+            r'(?i)(?:none|no\s+prerequisites)',  # Also detect when there are none
+            r'(?i)students?\s+must\s+have\s+(?:completed|taken|passed)',
+        ],
+        'context_keywords': ['prerequisite', 'prereq', 'required', 'prior', 'before'],
+        'sections': ['prerequisites', 'description'],
+        'min_matches': 1
+    },
+    'learning_outcomes': {
+        'name': 'Student learning outcomes',
+        'primary_patterns': [
+            r'(?i)(learning|course)\s*(outcomes|objectives)?\s*:?',
+            r'(?i)(?:upon\s+completion|by\s+the\s+end).*students?\s+(?:will|should)',
+            r'(?i)students?\s+will\s+be\s+able\s+to',
+            r'(?i)learning\s+goals?\s*:?',
+        ],
+        'context_keywords': ['learning', 'outcome', 'objective', 'goal', 'students will'],
+        'sections': ['outcomes'],
+        'min_matches': 1
+    },
+    'required_materials': {
+        'name': 'Required texts and/or course materials',
+        'primary_patterns': [
+            r'(?i)required\s+(?:text|book|material|reading)s?\s*:?',
+            r'(?i)textbooks?\s*:?',
+            r'(?i)course\s+materials?\s*:?',
+            r'ISBN[:\s-]*\d',
+            r'(?i)(?:required|recommended)\s+readings?\s*:?',
+        ],
+        'context_keywords': ['textbook', 'required', 'material', 'isbn', 'reading'],
+        'sections': ['materials'],
+        'min_matches': 1
+    },
+    'course_schedule': {
+        'name': 'Course schedule',
+        'primary_patterns': [
+            r'(?i)(?:course|class|weekly|tentative)\s*schedule\s*:?',
+            r'(?i)week\s+\d+\s*:?',
+            r'(?i)(?:course|class)\s*(?:calendar|timeline)\s*:?',  # Made stricter to avoid "Academic Calendar"
+            r'(?i)(?:week|session|class)\s+\d+.*(?:topic|chapter)',
+            r'(?i)(?:day|dates?)\s+(?:topic|chapter|reading)',
+            r'(?i)module\s+\d+\s*:?',  # "Module 1: Introduction"
+            r'(?i)(?:lesson|unit)\s+\d+',  # "Lesson 1", "Unit 1"
+            r'(?i)(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d+.*(?:topic|chapter|reading)',  # Date-based
+            r'(?i)\d{1,2}/\d{1,2}.*(?:topic|chapter|assignment)',  # "9/1 - Topic: Intro"
+            r'(?i)(?:see|refer to|attached)\s+(?:schedule|calendar)',  # References to external schedule
+        ],
+        'context_keywords': ['schedule', 'week', 'calendar', 'topic', 'date', 'module', 'lesson', 'unit'],
+        'sections': ['schedule'],
+        'min_matches': 1  # Reduced from 2 - any clear schedule indicator
+    },
+    'final_exam': {
+        'name': 'Final exam date and time',
+        'primary_patterns': [
+            r'(?i)final\s+exam\s*:?',
+            r'(?i)final\s+assessment\s*:?',
+            r'(?i)final\s+examination\s*:?',
+            r'(?i)(?:final|exam)\s+(?:date|time|schedule)',
+            r'(?i)(?:no\s+final\s+exam|final\s+project\s+instead)',  # Explicit alternatives
+            r'(?i)final\s+project\s*:?',  # Final project
+            r'(?i)(?:semester|capstone|group)\s+project\s*:?',  # Semester/Capstone/Group project
+            r'(?i)project\s+\d+%',  # "Project 40%" in grade weights
+        ],
+        'context_keywords': ['final', 'exam', 'examination', 'assessment', 'project'],
+        'sections': ['exams'],
+        'min_matches': 1
+    },
+    'grading_scale': {
+        'name': 'Grading scale',
+        'primary_patterns': [
+            r'(?i)grading\s*scale\s*:?',
+            r'(?i)grade\s*scale\s*:?',
+            r'(?i)letter\s*grades?\s*:?',
+            r'[A-F]\s*(?:>=|<=|[=:≥≤><])\s*\d+\.?\d*',  # A = 90, A >= 90, A ≥ 89.01, A > 90
+            r'\d+\.?\d*\s*[-–]\s*\d+\.?\d*\s*[=:]\s*[A-F]',  # 90-100 = A, 89.01-100 = A
+            r'(?i)(?:94|90).*?(?:>=|[=:≥>])\s*a',  # Common A cutoffs with various operators
+            r'(?i)[A-F]\s+\d+\.?\d*\s+(?:and\s+)?(?:above|or\s+(?:higher|greater))',  # A 90 and above, B 80 or higher
+            r'(?i)[A-F]\s+\d+\.?\d*\s*%?\s*(?:and\s+)?(?:above|or\s+(?:higher|greater))',  # A 90% and above
+            r'(?i)[A-F]\s+\d+\.?\d*\s+(?:and\s+)?(?:below|or\s+(?:lower|less))',  # F 59 and below, F 60 or lower
+            r'(?i)[A-F]\s+\d+\.?\d*\s*%?\s*(?:and\s+)?(?:below|or\s+(?:lower|less))',  # F 59% and below
+
+            # Synonyms for "scale"
+            r'(?i)grading\s*(?:rubric|criteria|standards?)\s*:?',  # "Grading rubric"
+            r'(?i)grade\s*(?:rubric|criteria|standards?)\s*:?',  # "Grade criteria"
+            r'(?i)(grading|grade)\s*(?:system|scheme|structure)\s*:?',  # "Grading system"                    r'(?i)letter\s*grade\s*(?:distribution|assignment)\s*:?',  # "Letter grade distribution"
+            r'(?i)(?:final|course)\s*grade\s*(?:determination|calculation)\s*:?',  # "Final grade determination"
+            r'(?i)grading\s*(?:policy|guidelines?)\s*:?',  # "Grading policy"
+            r'(?i)(?:how|basis\s+for)\s+(?:final\s+)?grades?\s+(?:are\s+)?(?:determined|assigned|calculated)',  # "How grades are determined"
+            r'(?i)grade\s+ranges?\s*:?',  # "Grade ranges"
+            r'(?i)percentage\s+(?:scale|breakdown|ranges?)\s*:?',  # "Percentage scale"
+            r'(?i)numeric\s+(?:grade|grading)\s*:?',  # "Numeric grading"
+
+            # Percentage-based scales
+            r'[A-F]\s*(?:>=|<=|[=:≥≤><])\s*\d+\.?\d*\s*%',  # A = 90%, A >= 90%, A > 89.999%
+            r'\d+\.?\d*\s*%\s*[-–]\s*\d+\.?\d*\s*%\s*[=:]\s*[A-F]',  # 90%-100% = A
+            r'[A-F]\s*(?:>=|<=|[=:≥≤><])\s*\d+\.?\d*\s*[-–]\s*\d+\.?\d*\s*%',  # A = 90-100%, A >= 90%
+
+            # Points-based scales
+            r'[A-F]\s*(?:>=|<=|[=:≥≤><])\s*\d+\.?\d*\s*(?:[-–]\s*\d+\.?\d*\s*)?(?:total\s+)?(?:points?|pts)\.?',  # A >= 89.01 total pts, A ≥ 89.01 total pts.
+            r'\d+\.?\d*\s*[-–]\s*\d+\.?\d*\s*(?:points?|pts)\s*[=:]\s*[A-F]',  # 90-100 points = A
+            r'(?i)(?:points?|pts)\s*(?:scale|system|based)',  # Points scale
+            r'(?i)out\s+of\s+\d+\.?\d*\s*(?:total\s+)?(?:points?|pts)',  # out of 1000 points, out of 100.5 total pts
+        ],
+        'context_keywords': ['grading', 'grade', 'scale', 'letter', 'percentage', 'rubric', 'criteria', 'system', 'scheme', 'ranges', 'points', 'gpa', 'decimal', 'total', 'distribution'],
+        'sections': ['grading'],
+        'min_matches': 2  # Need actual scale, not just mention
+    },
+    'grade_weights': {
+        'name': 'Grade categories and weights',
+        'primary_patterns': [
+            r'\d+\s*%',  # Percentage
+            r'(?i)(?:weight|weigh)s?\s*:?',
+            r'(?i)(?:exam|quiz|homework|assignment|project|participation)s?\s*[:=]\s*\d+\s*%',
+            r'(?i)grade\s+(?:breakdown|composition|distribution)\s*:?',
+            r'(?i)(?:worth|counts?\s+(?:for|as))\s+\d+\s*%',
+            r'(?i)(?:exam|quiz|test)s?\s+\d+%',  # "Exams 40%"
+            r'(?i)(?:total|sum)\s+(?:points|pts)',  # Point-based systems
+            r'\d+\s*(?:points|pts)\s*(?:each|total)',  # "100 points each"
+            r'(?i)(?:grading|grade)\s+(?:policy|breakdown|criteria)',  # Alternative headers
+        ],
+        'context_keywords': ['weight', 'percent', 'breakdown', 'distribution', 'points', 'grade', 'evaluation'],
+        'sections': ['grading'],
+        'min_matches': 2  # Reduced from 3 to catch more edge cases
+    },
+    'syllabus_policy_link': {
+        'name': 'Link to VCU Syllabus Policy Statements',
+        'url_patterns': [
+            r'https?://[^\s]*provost[^\s]*',
+            r'https?://provost\.vcu\.edu',
+            r'https?://[^\s]*vcu\.edu[^\s]*(?:provost|syllabus|policy)',
+        ],
+        'text_patterns': [
+            r'(?i)vcu\s+syllabus\s+polic(?:y|ies)',
+            r'(?i)provost.*?(?:website|web\s+site|policies)',
+            r'(?i)syllabus\s+polic(?:y|ies).*?statements?',
+            r'(?i)university\s+syllabus\s+(?:requirements|policies)',
+        ],
+        'context_keywords': ['provost', 'syllabus', 'policy', 'vcu', 'university'],
+        'sections': ['policies'],
+        'min_matches': 1,
+        'check_urls': True
+    },
+    'library_statement': {
+        'name': 'VCU Libraries statement and link',
+        'url_patterns': [
+            r'https?://(?:www\.)?library\.vcu\.edu',
+            r'https?://[^\s]*vcu\.edu[^\s]*library',
+        ],
+        'text_patterns': [
+            r'(?i)vcu\s+libraries?',
+            r'(?i)use\s+vcu\s+libraries?',
+            r'(?i)library\s+resources',
+            r'(?i)libraries?\s+(?:to\s+)?find\s+and\s+access',
+            r'(?i)library.*?(?:resources|services|support)',
+        ],
+        'required_phrases': [
+            r'(?i)vcu\s+libraries',
+            r'(?i)library\.vcu\.edu'
+        ],
+        'context_keywords': ['library', 'libraries', 'vcu', 'resources', 'access'],
+        'sections': ['policies'],
+        'min_matches': 2,
+        'check_urls': True
+    }
+}
+
+RECOMMENDED = {
+    'attendance_policy': {
+        'name': 'Attendance and punctuality policies',
+        'primary_patterns': [
+            r'(?i)attendance\s+polic(?:y|ies)\s*:?',
+            r'(?i)(?:absence|absent)s?\s*:?',
+            r'(?i)punctuality',
+            r'(?i)late\s+(?:arrival|attendance)',
+            r'(?i)(?:missing|miss)\s+(?:class|classes)',
+        ],
+        'context_keywords': ['attendance', 'absence', 'punctuality', 'late', 'present'],
+        'sections': ['policies'],
+        'min_matches': 1
+    },
+    'technology_policy': {
+        'name': 'Technology and media policies',
+        'primary_patterns': [
+            r'(?i)technology\s+polic(?:y|ies)\s*:?',
+            r'(?i)(?:recording|recordings?)\s+(?:of\s+)?(?:class|lecture)s?',
+            r'(?i)email\s+(?:response|policy)',
+            r'(?i)(?:laptop|phone|device)s?\s+(?:policy|use)',
+            r'(?i)(?:cell|mobile)\s+phones?',
+            # AI Policy patterns - comprehensive coverage
+            r'(?i)(?:artificial\s+intelligence|AI)\s+polic(?:y|ies)',  # AI Policy
+            r'(?i)polic(?:y|ies)\s+(?:on|regarding|for)\s+(?:artificial\s+intelligence|AI)',  # Policy on AI
+            r'(?i)(?:generative\s+)?AI\s+(?:use|tools?|policy)',  # AI use/tools/policy
+            r'(?i)(?:use|usage)\s+of\s+(?:artificial\s+intelligence|AI)',  # Use of AI
+            r'(?i)(?:artificial\s+intelligence|AI)\s+(?:is\s+)?(?:allowed|permitted|prohibited|forbidden)',  # AI allowed/prohibited
+            r'(?i)(?:AI|artificial\s+intelligence).*?(?:policy|guideline|rule)',  # AI mentioned with policy terms
+        ],
+        'context_keywords': ['technology', 'recording', 'email', 'laptop', 'phone', 'device', 'ai', 'chatgpt', 'intelligence', 'artificial', 'llm', 'generative'],
+        'sections': ['policies'],
+        'min_matches': 2
+    }
+}
+
+# Built once per process: requirement definitions are frozen and every pattern
+# is precompiled, so a single ruleset can be shared by all threads and requests
+DEFAULT_RULESET = CompiledRuleset(REQUIREMENTS, RECOMMENDED)
+
+# Rules scored against VCU Bulletin data; every other rule is scored while
+# the bulletin lookup is still in flight
+BULLETIN_DEPENDENT_RULES = ('course_info.course_title', 'course_description', 'prerequisites')
+
+# Longest time check_syllabus waits for the bulletin before falling back to
+# pattern-only scoring for the rules above
+BULLETIN_WAIT_SECONDS = float(os.environ.get('BULLETIN_WAIT_SECONDS', 10))
+
+# Patterns showing a final project replaces the final exam (all are also
+# final_exam primary patterns, so the match table has already searched them)
+FINAL_PROJECT_PATTERNS = (
+    r'(?i)final\s+project\s*:?',
+    r'(?i)(?:no\s+final\s+exam|final\s+project\s+instead)',
+    r'(?i)(?:semester|capstone|group)\s+project\s*:?',  # Semester/Capstone/Group project
+    r'(?i)project\s+\d+%'  # "Project 40%" in grade weights
+)
+
+# Course prefix and number, as in the course_info requirement (MATH 211, INFO 300)
+COURSE_CODE = re.compile(r'\b([A-Z]{2,4})\s*-?\s*(\d{3,4})\b')
+
+# Bulletin prerequisite text meaning the course has none
+NO_PREREQUISITES = re.compile(r'^(none|no\s+prerequisites?)\.?$', re.IGNORECASE)
+
+# Background threads for bulletin lookups, created on first use
+_bulletin_executor = None
+_bulletin_executor_lock = threading.Lock()
+
+
+def get_bulletin_executor():
+    """Get the thread pool that runs bulletin lookups alongside text analysis"""
+    global _bulletin_executor
+    with _bulletin_executor_lock:
+        if _bulletin_executor is None:
+            _bulletin_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='bulletin-lookup')
+        return _bulletin_executor
+
+
+# PDFs with at least this many pages are split across PDF_WORKERS processes;
+# shorter ones are not worth the cost of starting work in another process
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get('PDF_PARALLEL_MIN_PAGES', 40))
+PDF_WORKERS = int(os.environ.get('PDF_WORKERS', os.cpu_count() or 1))
+
+# Extraction backends: a backend name or a tier ('fast' / 'accurate');
+# see extraction_backends.py. PyPDF2 and docx-stream are the defaults.
+PDF_BACKEND = os.environ.get('PDF_BACKEND')
+DOCX_BACKEND = os.environ.get('DOCX_BACKEND')
+
+# With EARLY_EXIT=1, PDFs are scored page by page and the remaining pages are
+# skipped once they can no longer change any score. Scores are re-checked
+# each time the text read has grown by EARLY_EXIT_GROWTH, which keeps the
+# extra scoring work within a few full passes.
+EARLY_EXIT = bool(int(os.environ.get('EARLY_EXIT', 0)))
+EARLY_EXIT_GROWTH = 2
+
+# Text files of at least this many bytes are memory-mapped rather than read
+# into a bytes copy; the encoding is picked from the BOM and the first
+# TXT_ENCODING_PREFIX bytes, so the file is only read once
+TXT_MMAP_MIN_BYTES = int(os.environ.get('TXT_MMAP_MIN_BYTES', 1 << 20))
+TXT_ENCODING_PREFIX = 64 * 1024
+
+# Extractor version of the TXT reader in text cache keys; bump it whenever
+# extract_text_from_txt would return different text for the same bytes
+TXT_READER_VERSION = 'txt-2'
+
+# Byte order marks, longest first (the UTF-32 LE mark starts with UTF-16 LE's)
+TEXT_BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+
+def detect_text_encoding(prefix):
+    """
+    Pick the encoding of a text file from its first bytes.
+    
+    A BOM decides; otherwise the file is taken as UTF-8 if the prefix is
+    valid UTF-8 (a character cut off at the end of the prefix is allowed),
+    and latin-1 if not.
+    
+    Args:
+        prefix: The file's first bytes (up to TXT_ENCODING_PREFIX)
+    
+    Returns:
+        str: Codec name
+    """
+    for bom, encoding in TEXT_BOMS:
+        if prefix.startswith(bom):
+            return encoding
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(prefix, final=False)
+    except UnicodeDecodeError:
+        return 'latin-1'
+    return 'utf-8'
+
+
+_LEADING_WHITESPACE = re.compile(r'\s*')
+
+
+def stripped_length(text):
+    """len(text.strip()) without building the stripped copy"""
+    start = _LEADING_WHITESPACE.match(text).end()
+    end = len(text)
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return end - start
+
+
+# Extracted text shared by every checker in this process (and, through the
+# same file, every worker process); None until TEXT_CACHE_DB enables it
+_text_cache = None
+
+
+def configure_text_cache(db_path=None, max_mb=256):
+    """
+    Choose the extracted-text cache used by checkers in this process.
+    
+    Args:
+        db_path: SQLite file for the cache, or None to disable it. The file
+                 holds the extracted text of every document checked.
+        max_mb: Bound on the compressed size of all cached text
+    
+    Returns:
+        TextCache or None: The new process-wide cache
+    """
+    global _text_cache
+    _text_cache = TextCache(db_path, max_bytes=int(max_mb * 1024 * 1024)) if db_path else None
+    return _text_cache
+
+
+def get_text_cache():
+    """Get the process-wide extracted-text cache (None when disabled)"""
+    return _text_cache
+
+
+configure_text_cache(
+    db_path=os.environ.get('TEXT_CACHE_DB'),
+    max_mb=float(os.environ.get('TEXT_CACHE_MAX_MB', 256))
+)
+
+
+# Process pool for page-parallel PDF extraction, created on first use
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+
+def get_pdf_pool(workers):
+    """Get the process pool used for page-parallel PDF extraction"""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            _pdf_pool = ProcessPoolExecutor(max_workers=workers)
+        return _pdf_pool
+
+
+def reset_pdf_pool():
+    """Drop a broken PDF pool so the next large PDF starts a fresh one"""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is not None:
+            _pdf_pool.shutdown(wait=False, cancel_futures=True)
+            _pdf_pool = None
+
+
+def extract_pdf_pages(data, start, stop, backend_name=None):
+    """
+    Extract the text of pages start..stop-1 of a PDF.
+    
+    Module-level so it can be used as a process pool entry point.
+    
+    Returns:
+        list: One page_text() result per page, in page order
+    """
+    backend = get_backend('.pdf', backend_name)
+    document = backend.open(io.BytesIO(data))
+    try:
+        return [backend.page_text(document, index) for index in range(start, stop)]
+    finally:
+        backend.close(document)
+
+
+class SyllabusChecker:
+    """
+    Checks syllabi against the VCU requirements.
+
+    A checker holds no per-document state: everything computed while checking
+    a file lives in an EvaluationContext created for that call. One instance
+    can therefore serve concurrent requests in a threaded or preforked server.
+    """
+
+    def __init__(self, ruleset=None, bulletin_wait=BULLETIN_WAIT_SECONDS,
+                 pdf_workers=PDF_WORKERS, pdf_parallel_pages=PDF_PARALLEL_MIN_PAGES,
+                 early_exit=EARLY_EXIT, pdf_backend=PDF_BACKEND, docx_backend=DOCX_BACKEND,
+                 text_cache=None):
+        self.ruleset = ruleset or DEFAULT_RULESET
+        self.requirements = self.ruleset.requirements
+        self.recommended = self.ruleset.recommended
+        self.bulletin_wait = bulletin_wait
+        self.pdf_workers = pdf_workers
+        self.pdf_parallel_pages = pdf_parallel_pages
+        self.early_exit = early_exit
+        self.pdf_backend = get_backend('.pdf', pdf_backend)
+        self.docx_backend = get_backend('.docx', docx_backend)
+        # A TextCache of its own; by default the process-wide one, if enabled
+        self._text_cache = text_cache
+    
+    @property
+    def fingerprint(self):
+        """Ruleset fingerprint plus extractor versions; changes whenever results could"""
+        return (f"{self.ruleset.fingerprint}:{self.pdf_backend.version}:"
+                f"{self.docx_backend.version}:{TXT_READER_VERSION}")
 
     def extract_urls(self, text):
         """Extract all URLs from text"""
@@ -395,67 +647,419 @@ class SyllabusChecker:
             cleaned_urls.append(url)
         return cleaned_urls
     
-    def extract_text_from_pdf(self, filepath):
+    def _open_binary(self, source):
+        """
+        Get a readable binary stream for a file source.
+        
+        Args:
+            source: File path, bytes, or binary file-like object (BytesIO,
+                    SpooledTemporaryFile, an upload stream, ...)
+        
+        Returns:
+            tuple: (stream, should_close)
+        """
+        if isinstance(source, (str, os.PathLike)):
+            return open(source, 'rb'), True
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return io.BytesIO(source), True
+        return source, False
+    
+    def extract_text_from_pdf(self, source):
         """Extract text from PDF file with better handling"""
-        text = ""
+        # One join instead of growing a string page by page
+        return "".join(page for page, _ in self.iter_pdf_pages(source))
+    
+    def iter_pdf_pages(self, source, parallel=True):
+        """
+        Extract the text of a PDF one page at a time.
+        
+        PDFs with at least pdf_parallel_pages pages are split into page
+        ranges extracted on a process pool (when pdf_workers > 1 and parallel
+        is set). Pages come out in order either way, so the text is identical.
+        
+        Yields:
+            tuple: (page_text, pages_left) where page_text is the page's text
+                   plus a newline, or "" for a page without text
+        """
         try:
-            with open(filepath, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
+            file, should_close = self._open_binary(source)
+            try:
+                backend = self.pdf_backend
+                document = backend.open(file)
+                page_texts = None
+                page_count = backend.page_count(document)
+                if parallel and self.pdf_workers > 1 and page_count >= self.pdf_parallel_pages:
+                    if isinstance(source, (bytes, bytearray)):
+                        data = bytes(source)
+                    else:
+                        file.seek(0)
+                        data = file.read()
+                    page_texts = self._extract_pdf_pages_parallel(data, page_count)
+                if page_texts is None:
+                    page_texts = (backend.page_text(document, index) for index in range(page_count))
+                
+                try:
+                    for index, page_text in enumerate(page_texts):
+                        yield (page_text + "\n" if page_text else ""), page_count - index - 1
+                finally:
+                    backend.close(document)
+            finally:
+                if should_close:
+                    file.close()
         except Exception as e:
             raise Exception(f"Error reading PDF: {str(e)}")
-        return text
     
-    def extract_text_from_docx(self, filepath):
+    def _extract_pdf_pages_parallel(self, data, page_count):
+        """
+        Extract all pages of a PDF on the PDF process pool.
+        
+        Returns:
+            list or None: Page texts in page order, or None if the pool
+                          broke and the caller should extract serially
+        """
+        chunk_size = -(-page_count // self.pdf_workers)
+        pool = get_pdf_pool(self.pdf_workers)
+        try:
+            futures = [
+                pool.submit(extract_pdf_pages, data, start, min(start + chunk_size, page_count), self.pdf_backend.name)
+                for start in range(0, page_count, chunk_size)
+            ]
+            page_texts = []
+            for future in futures:
+                page_texts.extend(future.result())
+            return page_texts
+        except BrokenProcessPool:
+            reset_pdf_pool()
+            return None
+    
+    def extract_text_from_docx(self, source):
         """Extract text from DOCX file including hyperlinks"""
-        text = ""
         try:
-            doc = Document(filepath)
-            # Extract paragraph text
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            
-            # Also try to extract hyperlinks
-            for rel in doc.part.rels.values():
-                if "hyperlink" in rel.reltype:
-                    if hasattr(rel, '_target'):
-                        text += f" {rel._target} "
+            file, should_close = self._open_binary(source)
+            try:
+                document = self.docx_backend.open(file)
+                try:
+                    text = self.docx_backend.page_text(document, 0)
+                finally:
+                    self.docx_backend.close(document)
+            finally:
+                if should_close:
+                    file.close()
         except Exception as e:
             raise Exception(f"Error reading DOCX: {str(e)}")
         return text
     
-    def extract_text_from_txt(self, filepath):
-        """Extract text from TXT file"""
+    def extract_text_from_txt(self, source):
+        """
+        Extract text from TXT file.
+        
+        The file is read once: large files are memory-mapped and decoded
+        straight into the text, with no intermediate bytes copy. Files that
+        turn out not to be UTF-8 after the detection prefix are decoded
+        again as latin-1 from the same buffer.
+        """
         try:
-            with open(filepath, 'r', encoding='utf-8') as file:
-                text = file.read()
-        except UnicodeDecodeError:
-            # Try with different encoding
-            try:
-                with open(filepath, 'r', encoding='latin-1') as file:
-                    text = file.read()
-            except Exception as e:
-                raise Exception(f"Error reading TXT: {str(e)}")
+            with self._open_txt_buffer(source) as buffer:
+                encoding = detect_text_encoding(bytes(buffer[:TXT_ENCODING_PREFIX]))
+                try:
+                    text = str(buffer, encoding)
+                except UnicodeDecodeError:
+                    text = str(buffer, 'latin-1')
         except Exception as e:
             raise Exception(f"Error reading TXT: {str(e)}")
+        
+        # Universal newlines, as text-mode open() gives them
+        if '\r' in text:
+            text = text.replace('\r\n', '\n')
+            if '\r' in text:
+                text = text.replace('\r', '\n')
         return text
     
-    def extract_text(self, filepath):
-        """Extract text from various file formats"""
-        _, ext = os.path.splitext(filepath.lower())
+    @contextmanager
+    def _open_txt_buffer(self, source):
+        """
+        Get the bytes of a text file source without copying where possible.
+        
+        Paths and real files of at least TXT_MMAP_MIN_BYTES are memory-mapped;
+        in-memory bytes are wrapped in a memoryview; anything else is read.
         
+        Yields:
+            Bytes-like object (mmap, memoryview or bytes)
+        """
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            yield memoryview(source)
+            return
+        
+        file, should_close = self._open_binary(source)
+        try:
+            try:
+                size = os.fstat(file.fileno()).st_size
+                mappable = size >= max(TXT_MMAP_MIN_BYTES, 1) and file.tell() == 0
+            except (AttributeError, OSError, io.UnsupportedOperation):
+                # In-memory streams (BytesIO, small upload spools) have no file descriptor
+                mappable = False
+            
+            if not mappable:
+                yield file.read()
+                return
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                yield buffer
+            finally:
+                buffer.close()
+        finally:
+            if should_close:
+                file.close()
+    
+    def _file_extension(self, source, filename=None):
+        """Lowercase extension of the file name (or path) of a source"""
+        if filename is None:
+            if not isinstance(source, (str, os.PathLike)):
+                raise Exception("Unsupported file format: a filename is required for in-memory files")
+            filename = os.fspath(source)
+        return os.path.splitext(filename.lower())[1]
+    
+    @property
+    def text_cache(self):
+        """The extracted-text cache in use, or None"""
+        return self._text_cache if self._text_cache is not None else _text_cache
+    
+    def extractor_version(self, ext):
+        """Version of the extractor for a file extension, part of text cache keys"""
         if ext == '.pdf':
-            return self.extract_text_from_pdf(filepath)
+            return self.pdf_backend.version
         elif ext == '.docx':
-            return self.extract_text_from_docx(filepath)
+            return self.docx_backend.version
         elif ext == '.txt':
-            return self.extract_text_from_txt(filepath)
+            return TXT_READER_VERSION
+        raise Exception(f"Unsupported file format: {ext}")
+    
+    def _text_cache_key(self, source, ext):
+        """
+        Build the text cache key for a file source.
+        
+        Returns:
+            tuple: (source, key); a stream that cannot be rewound after
+                   hashing comes back as its bytes
+        """
+        version = self.extractor_version(ext)
+        digest = hashlib.sha256()
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            digest.update(source)
+        elif isinstance(source, (str, os.PathLike)) or source.seekable():
+            file, should_close = self._open_binary(source)
+            position = file.tell()
+            try:
+                for chunk in iter(lambda: file.read(1024 * 1024), b''):
+                    digest.update(chunk)
+            finally:
+                if should_close:
+                    file.close()
+                else:
+                    file.seek(position)
+        else:
+            source = source.read()
+            digest.update(source)
+        return source, self.text_cache.key_for(digest.hexdigest(), ext, version)
+    
+    def extract_text(self, source, filename=None):
+        """
+        Extract text from various file formats.
+        
+        Text is served from the text cache when one is enabled and the same
+        bytes were extracted before by the same extractor version.
+        
+        Args:
+            source: File path, bytes, or binary file-like object
+            filename: Original file name; required to detect the format when
+                      source is not a path
+        """
+        cache = self.text_cache
+        if cache is None:
+            return self._extract_text(source, filename)
+        
+        source, key = self._text_cache_key(source, self._file_extension(source, filename))
+        cached = cache.get(key)
+        if cached is not None:
+            return cached[0]
+        pages = [page_text for page_text, _ in self.iter_pages(source, filename)]
+        text = "".join(pages)
+        cache.set(key, text, len(pages))
+        return text
+    
+    def _extract_text(self, source, filename=None):
+        """Extract text from various file formats, without the text cache"""
+        ext = self._file_extension(source, filename)
+        
+        if ext == '.pdf':
+            return self.extract_text_from_pdf(source)
+        elif ext == '.docx':
+            return self.extract_text_from_docx(source)
+        elif ext == '.txt':
+            return self.extract_text_from_txt(source)
         else:
             raise Exception(f"Unsupported file format: {ext}")
     
+    def iter_pages(self, source, filename=None):
+        """
+        Extract a document's text page by page.
+        
+        Only PDFs have pages; other formats arrive as a single page. The
+        pages joined together are exactly extract_text(source, filename).
+        
+        Yields:
+            tuple: (page_text, pages_left)
+        """
+        if self._file_extension(source, filename) == '.pdf':
+            # Early exit needs pages on demand; parallel extraction reads them all up front
+            yield from self.iter_pdf_pages(source, parallel=not self.early_exit)
+        else:
+            yield self._extract_text(source, filename), 0
+    
+    def read_document(self, source, filename=None):
+        """
+        Read a document's pages, stopping early when early_exit is set.
+        
+        With early_exit, the pages read so far are scored whenever their
+        text has doubled, and reading stops as soon as scores_settled()
+        shows no later page can change the score.
+        
+        With a text cache, a document seen before is not read at all, and
+        a document read to the end is cached.
+        
+        Returns:
+            tuple: (text, pages_read, early_exit, bulletin_lookup) where
+                   bulletin_lookup is the lookup started while reading, if any
+        """
+        cache = self.text_cache
+        cache_key = None
+        if cache is not None:
+            source, cache_key = self._text_cache_key(source, self._file_extension(source, filename))
+            cached = cache.get(cache_key)
+            if cached is not None:
+                text, pages_read = cached
+                return text, pages_read, False, None
+        
+        pages = self.iter_pages(source, filename)
+        page_texts = []
+        text_length = 0
+        next_check = 0
+        bulletin_lookup = None
+        settled_rules = set()
+        try:
+            for page_text, pages_left in pages:
+                page_texts.append(page_text)
+                text_length += len(page_text)
+                if not (self.early_exit and pages_left and page_text and text_length >= next_check):
+                    continue
+                next_check = text_length * EARLY_EXIT_GROWTH
+                text = "".join(page_texts)
+                
+                # The first course code in a prefix is the first one in the
+                # whole document, so its lookup can start right away
+                if bulletin_lookup is None:
+                    bulletin_lookup = self._start_bulletin_lookup(*self.extract_course_code(text))
+                if self.scores_settled(text, bulletin_lookup, settled_rules):
+                    return text, len(page_texts), True, bulletin_lookup
+        finally:
+            pages.close()
+        text = "".join(page_texts)
+        if cache_key is not None:
+            cache.set(cache_key, text, len(page_texts))
+        return text, len(page_texts), False, bulletin_lookup
+    
+    def scores_settled(self, text, bulletin_lookup, settled_rules=None):
+        """
+        Check whether reading more of a document could change its scores.
+        
+        A pattern-scored rule is final once it is found using only matches
+        that later text cannot undo, or when it would not be found even if
+        every other pattern still matched. Bulletin validation and the final
+        project note must have reached their final outcome too.
+        
+        Every item's found status and partial credit, the bulletin match
+        outcomes and special notes, and so the overall score, then come out
+        exactly as for the whole document. Per-item confidence, details and
+        the bulletin validation method only reflect the pages read.
+        
+        Args:
+            text: Text of the pages read so far (ending with a newline)
+            bulletin_lookup: Future of the bulletin lookup, or None
+            settled_rules: Set of rule paths already known to be final;
+                           updated in place
+        
+        Returns:
+            bool: True if the full document would get the same score
+        """
+        if settled_rules is None:
+            settled_rules = set()
+        
+        if stripped_length(text) < 100 or not self.extract_course_code(text)[0]:
+            return False
+        
+        bulletin_data = None
+        if bulletin_lookup is not None:
+            # Keep reading while the lookup runs rather than block on it here
+            if not bulletin_lookup.done():
+                return False
+            try:
+                bulletin_data = bulletin_lookup.result()
+            except Exception:
+                bulletin_data = None
+        
+        context = EvaluationContext(self.ruleset, text, self.extract_urls(text))
+        use_bulletin = bool(bulletin_data and bulletin_data.get('found'))
+        if use_bulletin and not self._bulletin_checks_settled(text, bulletin_data, context):
+            return False
+        
+        settled = SettledMatchView(context.matches)
+        best_case = SettledMatchView(context.matches, optimistic=True)
+        
+        for rule_path, rule_data in iter_rules(self.requirements, self.recommended):
+            if rule_path in settled_rules or (use_bulletin and rule_path in BULLETIN_DEPENDENT_RULES):
+                continue
+            
+            # Found only ever turns from False to True as text is added
+            found = self.check_requirement_enhanced(text, rule_data, match_table=settled, context=context)['found']
+            if found or rule_data.get('check_urls'):
+                # Later URLs can always add matches, so only found is final there
+                final = found
+            else:
+                final = not self.check_requirement_enhanced(text, rule_data, match_table=best_case, context=context)['found']
+            
+            if final and rule_path == 'final_exam' and found:
+                # The final project note is final once one of its patterns has settled
+                final = any(settled.search(pattern) for pattern in FINAL_PROJECT_PATTERNS)
+            if not final:
+                return False
+            settled_rules.add(rule_path)
+        
+        return True
+    
+    def _bulletin_checks_settled(self, text, bulletin_data, context):
+        """Whether the bulletin title, description and prerequisite checks are final"""
+        official_title = bulletin_data.get('title')
+        if official_title and official_title.lower() not in context.text_lower:
+            # Title similarity can still change with more text
+            return False
+        
+        # A full match stays a full match; only the method may still change
+        # from 'separate' to 'combined' if the whole paragraph turns up later
+        validation = self.validate_description_and_prereqs_combined(text, bulletin_data, context)
+        prerequisites = validation['prerequisites']
+        if bulletin_data.get('description') and validation['description']['confidence'] != 100:
+            return False
+        if (prerequisites['is_applicable'] and prerequisites['confidence'] != 100
+                and self.extract_prerequisite_courses(bulletin_data.get('prerequisites'))):
+            return False
+        return True
+    
+    def _start_bulletin_lookup(self, course_prefix, course_number):
+        """Start a background bulletin lookup for a course, if there is one to look up"""
+        if course_prefix and course_number and BULLETIN_SCRAPER_AVAILABLE:
+            return get_bulletin_executor().submit(scrape_course_data, course_prefix, course_number)
+        return None
+    
     def find_context_around_keyword(self, text, keyword_pattern, context_chars=200):
         """Find text context around a keyword match"""
         matches = re.finditer(keyword_pattern, text, re.IGNORECASE)
@@ -467,9 +1071,17 @@ class SyllabusChecker:
             contexts.append(context)
         return contexts
     
-    def check_requirement_enhanced(self, text, requirement_data, extracted_urls=None):
+    def check_requirement_enhanced(self, text, requirement_data, extracted_urls=None, match_table=None, context=None):
         """Enhanced requirement checking with multiple strategies"""
-        text_lower = text.lower()
+        # Share the document analysis across requirements when a context is supplied
+        if context is None:
+            context = EvaluationContext(self.ruleset, text, extracted_urls or [], match_table)
+        if extracted_urls is None:
+            extracted_urls = context.extracted_urls
+        if match_table is None:
+            match_table = context.matches
+        # Section kinds to search before the rest of the document
+        sections = tuple(requirement_data.get('sections', ()))
         matches = 0
         match_details = []
         
@@ -478,7 +1090,7 @@ class SyllabusChecker:
             url_patterns = requirement_data.get('url_patterns', [])
             for url in extracted_urls:
                 for pattern in url_patterns:
-                    if re.search(pattern, url, re.IGNORECASE):
+                    if self.ruleset.compile(pattern).search(url):
                         matches += 2  # URLs are strong indicators
                         match_details.append(f"Found URL: {url[:50]}...")
                         break
@@ -486,15 +1098,14 @@ class SyllabusChecker:
         # Strategy 2: Check primary patterns
         primary_patterns = requirement_data.get('primary_patterns', [])
         for pattern in primary_patterns:
-            found = re.findall(pattern, text, re.IGNORECASE)
-            if found:
+            if match_table.search(pattern, sections=sections):
                 matches += 1
                 match_details.append(f"Pattern match: {pattern[:30]}...")
         
         # Strategy 3: Check text patterns (for link requirements)
         text_patterns = requirement_data.get('text_patterns', [])
         for pattern in text_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
+            if match_table.search(pattern, sections=sections):
                 matches += 1
                 match_details.append(f"Text pattern: {pattern[:30]}...")
         
@@ -502,14 +1113,14 @@ class SyllabusChecker:
         required_phrases = requirement_data.get('required_phrases', [])
         required_found = 0
         for phrase in required_phrases:
-            if re.search(phrase, text, re.IGNORECASE):
+            if match_table.search(phrase, sections=sections):
                 required_found += 1
         
         # Strategy 5: Context-aware checking
         context_keywords = requirement_data.get('context_keywords', [])
         context_matches = 0
         for keyword in context_keywords:
-            if re.search(r'\b' + keyword + r'\b', text_lower):
+            if match_table.search_lower(keyword_pattern(keyword), sections):
                 context_matches += 1
         
         # Strategy 6: Check minimum text length for descriptions
@@ -519,10 +1130,13 @@ class SyllabusChecker:
             # Find sections that might be the description
             primary_patterns = requirement_data.get('primary_patterns', [])
             for pattern in primary_patterns:
-                contexts = self.find_context_around_keyword(text, pattern, 300)
-                if contexts and len(contexts[0]) >= min_text_length:
-                    has_sufficient_text = True
-                    break
+                match = match_table.search(pattern, sections=sections)
+                if match:
+                    # Same window find_context_around_keyword would return for the first hit
+                    context_length = min(len(text), match.end() + 300) - max(0, match.start() - 300)
+                    if context_length >= min_text_length:
+                        has_sufficient_text = True
+                        break
         
         # Calculate confidence score
         min_matches = requirement_data.get('min_matches', 1)
@@ -542,7 +1156,7 @@ class SyllabusChecker:
                 # Weighted scoring
                 pattern_score = matches * 30
                 context_score = (context_matches / len(context_keywords) * 20) if context_keywords else 0
-                url_bonus = 20 if (extracted_urls and any(re.search(p, ' '.join(extracted_urls), re.IGNORECASE) for p in requirement_data.get('url_patterns', []))) else 0
+                url_bonus = 20 if (extracted_urls and any(context.url_search(p) for p in requirement_data.get('url_patterns', []))) else 0
                 
                 confidence = min(100, pattern_score + context_score + url_bonus)
             else:
@@ -562,13 +1176,19 @@ class SyllabusChecker:
             'details': match_details[:3]  # Keep top 3 details
         }
     
-    def check_syllabus(self, filepath):
-        """Check syllabus against all requirements"""
+    def check_syllabus(self, source, filename=None):
+        """
+        Check syllabus against all requirements.
+        
+        Args:
+            source: File path, bytes, or binary file-like object
+            filename: Original file name (needed when source is not a path)
+        """
         try:
-            # Extract text from file
-            text = self.extract_text(filepath)
+            # Extract text from file (only as far as needed with early_exit)
+            text, pages_read, early_exit, bulletin_lookup = self.read_document(source, filename)
             
-            if not text or len(text.strip()) < 100:
+            if not text or stripped_length(text) < 100:
                 return {
                     'error': 'Unable to extract sufficient text from the file. Please ensure the file is not empty or corrupted.'
                 }
@@ -576,17 +1196,43 @@ class SyllabusChecker:
             # Extract all URLs first
             extracted_urls = self.extract_urls(text)
             
-            # Auto-detect course code and scrape bulletin data
-            bulletin_data = None
+            # Per-call state; its match table searches each unique pattern once per document
+            context = EvaluationContext(self.ruleset, text, extracted_urls)
+            match_table = context.matches
+            
+            # Auto-detect course code and start the bulletin lookup right away
             course_prefix, course_number = self.extract_course_code(text)
+            if bulletin_lookup is None:
+                bulletin_lookup = self._start_bulletin_lookup(course_prefix, course_number)
             
-            if course_prefix and course_number and BULLETIN_SCRAPER_AVAILABLE:
+            # Score every rule that does not need bulletin data while the lookup runs
+            pattern_results = {}
+            for rule_path, rule_data in iter_rules(self.requirements, self.recommended):
+                if rule_path not in BULLETIN_DEPENDENT_RULES:
+                    pattern_results[rule_path] = self.check_requirement_enhanced(text, rule_data, context=context)
+            
+            def check_pattern(rule_path, rule_data):
+                """Pattern-based result for a rule, reusing the one computed above"""
+                if rule_path not in pattern_results:
+                    pattern_results[rule_path] = self.check_requirement_enhanced(text, rule_data, context=context)
+                return pattern_results[rule_path]
+            
+            # Only the bulletin-dependent rules wait, and only for bulletin_wait seconds
+            bulletin_data = None
+            bulletin_timed_out = False
+            bulletin_failed = False
+            if bulletin_lookup is not None:
                 try:
-                    bulletin_data = scrape_course_data(course_prefix, course_number)
+                    bulletin_data = bulletin_lookup.result(timeout=self.bulletin_wait)
+                except FutureTimeoutError:
+                    # The lookup keeps running and warms the cache for later checks
+                    print(f"Bulletin lookup for {course_prefix} {course_number} timed out; using pattern-only checking")
+                    bulletin_timed_out = True
                 except Exception as e:
                     # If scraping fails, log but continue with pattern-only checking
                     print(f"Bulletin scraping failed for {course_prefix} {course_number}: {e}")
-                    bulletin_data = None
+                    bulletin_failed = True
+            context.bulletin_data = bulletin_data
             
             # Check required items
             required_results = []
@@ -603,7 +1249,7 @@ class SyllabusChecker:
                         # Special handling for course_title with bulletin validation
                         if sub_key == 'course_title' and sub_data.get('use_bulletin_validation') and bulletin_data and bulletin_data.get('found'):
                             official_title = bulletin_data.get('title')
-                            if official_title and official_title.lower() in text.lower():
+                            if official_title and official_title.lower() in context.text_lower:
                                 # Exact match found
                                 sub_result = {
                                     'name': sub_data['name'],
@@ -619,7 +1265,7 @@ class SyllabusChecker:
                                 total_weight_found += sub_data['weight']
                             else:
                                 # Check for close/partial match
-                                similarity = self._calculate_title_similarity(official_title, text)
+                                similarity = self._calculate_title_similarity(official_title, text, context)
                                 
                                 if similarity >= 70:  # 70% similarity threshold
                                     # Close match found
@@ -652,7 +1298,7 @@ class SyllabusChecker:
                                     }
                         else:
                             # Standard pattern checking for sub-item
-                            sub_result_data = self.check_requirement_enhanced(text, sub_data, extracted_urls)
+                            sub_result_data = check_pattern(f"{key}.{sub_key}", sub_data)
                             sub_result = {
                                 'name': sub_data['name'],
                                 'found': sub_result_data['found'],
@@ -682,7 +1328,7 @@ class SyllabusChecker:
                 # Use bulletin validation for description and prerequisites if available
                 elif key in ['course_description', 'prerequisites'] and bulletin_data and bulletin_data.get('found'):
                     # Get bulletin validation results
-                    bulletin_validation = self.validate_description_and_prereqs_combined(text, bulletin_data)
+                    bulletin_validation = self.validate_description_and_prereqs_combined(text, bulletin_data, context)
                     
                     if key == 'course_description':
                         validation_result = bulletin_validation['description']
@@ -707,20 +1353,14 @@ class SyllabusChecker:
                         required_found += 1
                 else:
                     # Standard pattern-based checking
-                    result = self.check_requirement_enhanced(text, req_data, extracted_urls)
+                    result = check_pattern(key, req_data)
                     
                     # Special handling for final_exam: check if final project was detected
                     special_note = None
                     if key == 'final_exam' and result['found']:
                         # Check if "final project" patterns matched
-                        final_project_patterns = [
-                            r'(?i)final\s+project\s*:?',
-                            r'(?i)(?:no\s+final\s+exam|final\s+project\s+instead)',
-                            r'(?i)(?:semester|capstone|group)\s+project\s*:?',  # Semester/Capstone/Group project
-                            r'(?i)project\s+\d+%'  # "Project 40%" in grade weights
-                        ]
-                        for pattern in final_project_patterns:
-                            if re.search(pattern, text, re.IGNORECASE):
+                        for pattern in FINAL_PROJECT_PATTERNS:
+                            if match_table.search(pattern):
                                 special_note = "Note: Final project detected instead of traditional final exam"
                                 break
                     
@@ -743,7 +1383,7 @@ class SyllabusChecker:
             recommended_found = 0
             
             for key, rec_data in self.recommended.items():
-                result = self.check_requirement_enhanced(text, rec_data, extracted_urls)
+                result = check_pattern(key, rec_data)
                 recommended_results.append({
                     'name': rec_data['name'],
                     'found': result['found'],
@@ -773,10 +1413,15 @@ class SyllabusChecker:
                 'text_length': len(text),
                 'urls_found': len(extracted_urls),
                 'sample_urls': extracted_urls[:5],  # Include sample URLs for debugging
+                'pages_read': pages_read,
+                'early_exit': early_exit,
                 'bulletin_validation': {
                     'enabled': BULLETIN_SCRAPER_AVAILABLE,
                     'course_detected': f"{course_prefix} {course_number}" if course_prefix else None,
-                    'bulletin_data_found': bulletin_data.get('found') if bulletin_data else False
+                    'bulletin_data_found': bulletin_data.get('found') if bulletin_data else False,
+                    'lookup_timed_out': bulletin_timed_out,
+                    # Pattern-only scores that a later lookup could improve
+                    'lookup_failed': bulletin_timed_out or bulletin_failed or bool(bulletin_data and bulletin_data.get('unavailable'))
                 }
             }
         
@@ -795,9 +1440,7 @@ class SyllabusChecker:
         Returns:
             tuple: (prefix, number) or (None, None) if not found
         """
-        # Use the same pattern as in course_info requirement
-        pattern = r'\b([A-Z]{2,4})\s*-?\s*(\d{3,4})\b'
-        match = re.search(pattern, text)
+        match = COURSE_CODE.search(text)
         
         if match:
             return (match.group(1), match.group(2))
@@ -844,16 +1487,14 @@ class SyllabusChecker:
         if not prereq_text:
             return []
         
-        # Pattern matches course codes: MATH 211, INFO 300, CMSC 245, etc.
-        pattern = r'\b([A-Z]{2,4})\s*-?\s*(\d{3,4})\b'
-        matches = re.findall(pattern, prereq_text)
+        matches = COURSE_CODE.findall(prereq_text)
         
         # Combine prefix and number
         courses = [f"{prefix} {number}" for prefix, number in matches]
         
         return courses
     
-    def validate_description_and_prereqs_combined(self, syllabus_text, bulletin_data):
+    def validate_description_and_prereqs_combined(self, syllabus_text, bulletin_data, context=None):
         """
         Validate both description and prerequisites using combined-then-separate strategy.
         
@@ -868,6 +1509,8 @@ class SyllabusChecker:
             syllabus_text: Full syllabus text
             bulletin_data: Data from VCU Bulletin with 'full_paragraph', 
                           'description', and 'prerequisites' fields
+            context: EvaluationContext of the syllabus; its normalized text is
+                     reused and the result is kept for the next call
         
         Returns:
             dict: {
@@ -885,6 +1528,11 @@ class SyllabusChecker:
                 }
             }
         """
+        if context is not None and context.bulletin_validation is not None:
+            validated_data, result = context.bulletin_validation
+            if validated_data is bulletin_data:
+                return result
+        
         result = {
             'description': {
                 'found': False,
@@ -908,7 +1556,7 @@ class SyllabusChecker:
         
         # Check if course has no prerequisites - mark as N/A if so
         prereq_text = bulletin_data.get('prerequisites')
-        if not prereq_text or prereq_text == 'None' or re.search(r'^(none|no\s+prerequisites?)\.?$', str(prereq_text).strip(), re.IGNORECASE):
+        if not prereq_text or prereq_text == 'None' or NO_PREREQUISITES.search(str(prereq_text).strip()):
             result['prerequisites']['is_applicable'] = False
             result['prerequisites']['found'] = True  # Mark as found since N/A is satisfied
             result['prerequisites']['confidence'] = 100
@@ -919,7 +1567,12 @@ class SyllabusChecker:
             result['prerequisites']['is_applicable'] = True
         
         # Normalize texts for comparison
-        syllabus_normalized = self.normalize_text(syllabus_text)
+        if context is not None:
+            # Filled in place below, so the next call gets the finished result
+            context.bulletin_validation = (bulletin_data, result)
+            syllabus_normalized = context.normalized_text
+        else:
+            syllabus_normalized = self.normalize_text(syllabus_text)
         
         # STEP 1: Try combined check (fast path)
         # Only do combined check if prerequisites are applicable
@@ -1029,7 +1682,7 @@ class SyllabusChecker:
         
         return similarity
     
-    def _calculate_title_similarity(self, official_title, syllabus_text):
+    def _calculate_title_similarity(self, official_title, syllabus_text, context=None):
         """
         Calculate similarity between official course title and syllabus text.
         Uses word-based matching to handle reordered or slightly different titles.
@@ -1037,6 +1690,7 @@ class SyllabusChecker:
         Args:
             official_title: Official course title from bulletin
             syllabus_text: Full syllabus text
+            context: EvaluationContext of the syllabus, for its lowercased text
         
         Returns:
             float: Similarity percentage (0-100)
@@ -1046,7 +1700,7 @@ class SyllabusChecker:
         
         # Normalize texts
         official_lower = official_title.lower()
-        syllabus_lower = syllabus_text.lower()
+        syllabus_lower = context.text_lower if context is not None else syllabus_text.lower()
         
         # Check for exact match first
         if official_lower in syllabus_lower:
@@ -1081,3 +1735,74 @@ class SyllabusChecker:
         final_similarity = (word_match_percentage * 0.8) + (partial_match_percentage * 0.2)
         
         return min(final_similarity, 100.0)  # Cap at 100%
+
+
+_process_checker = None
+
+
+def configure_bulletin_cache(db_path=None, ttl_hours=1, rate=2.0, burst=2):
+    """
+    Point the bulletin scraper at a shared cache file (no-op without the scraper).
+    
+    The same file holds the request rate limit, so all processes together
+    stay within `rate` requests per second to bulletin.vcu.edu. Also used as
+    a process pool initializer so every worker shares one cache and limit.
+    """
+    if BULLETIN_SCRAPER_AVAILABLE:
+        configure_cache(db_path=db_path, ttl_hours=ttl_hours)
+        configure_rate_limiter(rate=rate, burst=burst, db_path=db_path)
+
+
+def get_bulletin_status():
+    """Bulletin cache and circuit breaker state of this process, for monitoring"""
+    if not BULLETIN_SCRAPER_AVAILABLE:
+        return {'enabled': False}
+    return {
+        'enabled': True,
+        'offline': is_offline(),
+        'cache': get_cache_stats(),
+        'circuit_breaker': get_circuit_breaker_stats()
+    }
+
+
+def check_file(source, filename=None):
+    """
+    Check one syllabus (path or bytes) with a process-wide checker.
+
+    Module-level so it can be used as a process pool entry point; each
+    worker process builds its checker once and reuses it for every file.
+    """
+    global _process_checker
+    if _process_checker is None:
+        # Batch workers already use every core, so PDFs are extracted serially here
+        _process_checker = SyllabusChecker(pdf_workers=1)
+    return _process_checker.check_syllabus(source, filename)
+
+
+# Queue on which pool workers report each check they start (see check_file_reporting_start)
+_started_queue = None
+
+
+def init_check_worker(started, *bulletin_settings):
+    """
+    Process pool initializer for check_file_reporting_start.
+    
+    Args:
+        started: multiprocessing queue the pool's owner reads start reports from
+        bulletin_settings: Arguments for configure_bulletin_cache
+    """
+    global _started_queue
+    _started_queue = started
+    configure_bulletin_cache(*bulletin_settings)
+
+
+def check_file_reporting_start(ticket, source, filename=None):
+    """
+    check_file that first reports (ticket, worker pid, wall-clock start time).
+    
+    A submitted call can wait in the pool's queues before a worker picks
+    it up, so this report is what tells the pool's owner when the check
+    really started and which process to stop if it overruns.
+    """
+    _started_queue.put((ticket, os.getpid(), time.time()))
+    return check_file(source, filename)
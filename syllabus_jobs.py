@@ -0,0 +1,341 @@
+"""
+Background Syllabus Check Jobs
+Persistent job store and bounded worker pool for large syllabus batches
+"""
+
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+# ============================================================================
+# Job Store
+# ============================================================================
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_COMPLETE = 'complete'
+JOB_FAILED = 'failed'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    total_files INTEGER NOT NULL,
+    completed_files INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS job_files (
+    job_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    filename TEXT NOT NULL,
+    data BLOB,
+    error TEXT,
+    PRIMARY KEY (job_id, idx)
+);
+CREATE TABLE IF NOT EXISTS job_results (
+    job_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    result TEXT NOT NULL,
+    failed INTEGER NOT NULL,
+    required_percentage REAL,
+    required_found REAL,
+    PRIMARY KEY (job_id, idx)
+);
+"""
+
+
+class JobStore:
+    """
+    SQLite-backed job state.
+
+    Uploaded file bytes are kept until a job finishes, and every file result
+    is written as soon as it is scored, so a restart loses neither queued
+    work nor completed results.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        # One short-lived connection per operation keeps this safe across threads;
+        # sqlite3's own context manager only commits, so close it here too
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def create_job(self, files):
+        """
+        Store a new queued job.
+
+        Args:
+            files: List of dicts with 'filename' and either 'data' (bytes)
+                   or 'error' (file rejected before checking)
+
+        Returns:
+            str: New job id
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT INTO jobs (id, status, total_files, created_at, updated_at) VALUES (?, ?, ?, ?, ?)',
+                (job_id, JOB_QUEUED, len(files), now, now)
+            )
+            conn.executemany(
+                'INSERT INTO job_files (job_id, idx, filename, data, error) VALUES (?, ?, ?, ?, ?)',
+                [(job_id, idx, f['filename'], f.get('data'), f.get('error')) for idx, f in enumerate(files)]
+            )
+        return job_id
+
+    def claim_job(self, job_id):
+        """Mark a queued job as running; False if someone else already has it"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND status = ?',
+                (JOB_RUNNING, time.time(), job_id, JOB_QUEUED)
+            )
+            return cursor.rowcount == 1
+
+    def pending_files(self, job_id):
+        """Get the files of a job that have no stored result yet"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT f.idx, f.filename, f.data, f.error FROM job_files f '
+                'LEFT JOIN job_results r ON r.job_id = f.job_id AND r.idx = f.idx '
+                'WHERE f.job_id = ? AND r.idx IS NULL ORDER BY f.idx',
+                (job_id,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def save_result(self, job_id, idx, result):
+        """Persist one file's result and advance the job's progress"""
+        failed = 'error' in result
+        required = result.get('required', {})
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'INSERT OR IGNORE INTO job_results '
+                '(job_id, idx, result, failed, required_percentage, required_found) VALUES (?, ?, ?, ?, ?, ?)',
+                (job_id, idx, json.dumps(result), int(failed),
+                 None if failed else required.get('percentage'),
+                 None if failed else required.get('found'))
+            )
+            if cursor.rowcount:
+                conn.execute(
+                    'UPDATE jobs SET completed_files = completed_files + 1, updated_at = ? WHERE id = ?',
+                    (time.time(), job_id)
+                )
+
+    def finish_job(self, job_id, error=None):
+        """Mark a job complete (or failed) and drop its stored upload bytes"""
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?',
+                (JOB_FAILED if error else JOB_COMPLETE, error, time.time(), job_id)
+            )
+            conn.execute('UPDATE job_files SET data = NULL WHERE job_id = ?', (job_id,))
+
+    def get_job(self, job_id):
+        """Get a job's status and batch statistics, or None if unknown"""
+        with self._connect() as conn:
+            job = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+            if job is None:
+                return None
+            stats = conn.execute(
+                'SELECT COUNT(*) AS total, SUM(failed) AS failed, '
+                'AVG(required_percentage) AS avg_percentage, AVG(required_found) AS avg_found '
+                'FROM job_results WHERE job_id = ?',
+                (job_id,)
+            ).fetchone()
+
+        batch_stats = {
+            'total_files': stats['total'],
+            'successful': stats['total'] - (stats['failed'] or 0),
+            'failed': stats['failed'] or 0
+        }
+        if batch_stats['successful']:
+            batch_stats['average_required_percentage'] = round(stats['avg_percentage'], 1)
+            batch_stats['average_required_found'] = round(stats['avg_found'], 1)
+
+        total = job['total_files']
+        return {
+            'job_id': job['id'],
+            'status': job['status'],
+            'total_files': total,
+            'completed_files': job['completed_files'],
+            'progress': round(job['completed_files'] / total * 100, 1) if total else 100.0,
+            'error': job['error'],
+            'created_at': job['created_at'],
+            'updated_at': job['updated_at'],
+            'batch_stats': batch_stats
+        }
+
+    def get_results(self, job_id, offset=0, limit=20):
+        """Get completed results of a job in upload order, one page at a time"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT idx, result FROM job_results WHERE job_id = ? ORDER BY idx LIMIT ? OFFSET ?',
+                (job_id, limit, offset)
+            ).fetchall()
+        return [dict(json.loads(row['result']), index=row['idx']) for row in rows]
+
+    def heartbeat(self, job_ids):
+        """Refresh updated_at of running jobs so they are not taken for abandoned"""
+        if not job_ids:
+            return
+        with self._connect() as conn:
+            conn.executemany(
+                'UPDATE jobs SET updated_at = ? WHERE id = ? AND status = ?',
+                [(time.time(), job_id, JOB_RUNNING) for job_id in job_ids]
+            )
+
+    def unfinished_jobs(self, stale_after):
+        """
+        Get ids of jobs that should be (re)started.
+
+        Jobs still marked running but not updated for stale_after seconds
+        were interrupted (e.g. by a restart) and are put back in the queue;
+        the runner running a job refreshes it with heartbeat() meanwhile.
+        """
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE jobs SET status = ? WHERE status = ? AND updated_at < ?',
+                (JOB_QUEUED, JOB_RUNNING, time.time() - stale_after)
+            )
+            rows = conn.execute(
+                'SELECT id FROM jobs WHERE status = ? ORDER BY created_at', (JOB_QUEUED,)
+            ).fetchall()
+        return [row['id'] for row in rows]
+
+
+# ============================================================================
+# Job Runner
+# ============================================================================
+
+class JobQueueFull(Exception):
+    """Raised when the job queue is at capacity"""
+
+
+class JobRunner:
+    """
+    Bounded background worker pool for syllabus check jobs.
+
+    Args:
+        store: JobStore holding job state
+        process_batch: Callable taking a list of batch entries
+                       ({'filename', 'source'} or {'filename', 'error'}) and
+                       yielding (position, result) as files are scored
+        workers: Number of jobs processed at the same time
+        queue_limit: Maximum number of queued plus running jobs
+        stale_after: Seconds without a heartbeat after which a 'running'
+                     job is considered abandoned and restarted
+        rescan_interval: Seconds between heartbeats for the jobs this runner
+                         is running and rescans for abandoned or queued jobs;
+                         must be well below stale_after
+    """
+
+    def __init__(self, store, process_batch, workers=2, queue_limit=50, stale_after=600, rescan_interval=60):
+        self.store = store
+        self.process_batch = process_batch
+        self.queue_limit = queue_limit
+        self.stale_after = stale_after
+        self.rescan_interval = rescan_interval
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='syllabus-job')
+        self._lock = threading.Lock()
+        self._active = set()
+        self._running = set()
+        self._closed = threading.Event()
+
+        # Pick up jobs that were queued or interrupted before a restart
+        self._rescan()
+        # Jobs interrupted shortly before the restart only become stale later
+        self._monitor = threading.Thread(target=self._watch, name='syllabus-job-monitor', daemon=True)
+        self._monitor.start()
+
+    def close(self):
+        """Stop the heartbeat and rescan thread (running jobs finish in the background)"""
+        self._closed.set()
+        self._monitor.join()
+
+    def _watch(self):
+        while not self._closed.wait(self.rescan_interval):
+            try:
+                with self._lock:
+                    running = list(self._running)
+                self.store.heartbeat(running)
+                self._rescan()
+            except Exception as e:
+                print(f"Job monitor error: {e}")
+
+    def _rescan(self):
+        for job_id in self.store.unfinished_jobs(self.stale_after):
+            self._schedule(job_id)
+
+    def submit(self, files):
+        """
+        Create a job for a list of files and queue it.
+
+        Returns:
+            str: Job id
+
+        Raises:
+            JobQueueFull: If queue_limit jobs are already waiting or running
+        """
+        with self._lock:
+            if len(self._active) >= self.queue_limit:
+                raise JobQueueFull(f"Job queue is full ({self.queue_limit} jobs)")
+            job_id = self.store.create_job(files)
+            self._active.add(job_id)
+        self._executor.submit(self._run, job_id)
+        return job_id
+
+    def _schedule(self, job_id):
+        with self._lock:
+            if job_id in self._active:
+                return
+            self._active.add(job_id)
+        self._executor.submit(self._run, job_id)
+
+    def _run(self, job_id):
+        try:
+            if not self.store.claim_job(job_id):
+                return
+            with self._lock:
+                self._running.add(job_id)
+
+            pending = self.store.pending_files(job_id)
+            entries = []
+            for row in pending:
+                if row['error']:
+                    entries.append({'filename': row['filename'], 'error': row['error']})
+                else:
+                    entries.append({'filename': row['filename'], 'source': row['data']})
+
+            for position, result in self.process_batch(entries):
+                self.store.save_result(job_id, pending[position]['idx'], result)
+
+            self.store.finish_job(job_id)
+        except Exception as e:
+            self.store.finish_job(job_id, error=str(e))
+        finally:
+            with self._lock:
+                self._active.discard(job_id)
+                self._running.discard(job_id)
@@ -0,0 +1,767 @@
+"""
+Compiled Requirement Ruleset
+Precompiles and deduplicates the regex patterns used by SyllabusChecker
+"""
+
+import bisect
+import hashlib
+import json
+import re
+import threading
+from types import MappingProxyType
+
+try:
+    from re import _parser as sre_parse, _constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse
+    import sre_constants
+
+
+# ============================================================================
+# Rule Iteration
+# ============================================================================
+
+# Requirement fields that hold regex patterns applied to the syllabus text
+TEXT_PATTERN_FIELDS = ('primary_patterns', 'text_patterns', 'required_phrases')
+
+
+def iter_rules(requirements, recommended):
+    """
+    Walk every scorable rule in the requirement definitions.
+
+    Args:
+        requirements: SyllabusChecker.requirements dict
+        recommended: SyllabusChecker.recommended dict
+
+    Yields:
+        tuple: (rule_path, rule_data) where rule_path is e.g. 'course_info.course_code'
+    """
+    for group in (requirements, recommended):
+        for key, req_data in group.items():
+            if req_data.get('has_sub_items'):
+                for sub_key, sub_data in req_data['sub_items'].items():
+                    yield f"{key}.{sub_key}", sub_data
+            else:
+                yield key, req_data
+
+
+def freeze_rules(value):
+    """
+    Return a read-only deep copy of requirement definitions.
+
+    Dicts become MappingProxyType views and lists become tuples, so a shared
+    ruleset cannot be modified by one request while another is reading it.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze_rules(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_rules(item) for item in value)
+    return value
+
+
+# Bump when scoring code changes so results cached under the old logic are ignored
+SCORING_VERSION = 1
+
+
+def ruleset_fingerprint(requirements, recommended):
+    """Stable hash of the requirement definitions plus SCORING_VERSION"""
+    payload = json.dumps([SCORING_VERSION, requirements, recommended], sort_keys=True, default=dict)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def keyword_pattern(keyword):
+    """Build the whole-word pattern used for context keyword checks"""
+    return r'\b' + keyword + r'\b'
+
+
+# ============================================================================
+# Literal Anchors
+# ============================================================================
+
+# Non-ASCII characters that IGNORECASE treats as equal to an ASCII letter.
+# Translating them before lower() gives a folded copy of the text with the
+# same length, where every case-insensitive ASCII literal match shows up as
+# a plain substring at the same offset.
+_ASCII_CASE_FOLD = str.maketrans({0x130: 'i', 0x131: 'i', 0x17f: 's', 0x212a: 'k'})
+
+# Anchors shorter than this hit too often to beat a plain regex search
+MIN_ANCHOR_LENGTH = 3
+MAX_ANCHORS = 32
+
+_REPEAT_OPS = tuple(op for op in (
+    sre_constants.MAX_REPEAT,
+    sre_constants.MIN_REPEAT,
+    getattr(sre_constants, 'POSSESSIVE_REPEAT', None),
+) if op is not None)
+_ZERO_WIDTH_OPS = (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT)
+
+
+def fold_text(text):
+    """Case-fold text so IGNORECASE literal matches become substring matches"""
+    return text.translate(_ASCII_CASE_FOLD).lower()
+
+
+def _leading_literals(items, ignorecase):
+    """
+    Find the literal strings every match of a parsed pattern must start with.
+
+    Args:
+        items: List of (opcode, argument) pairs from sre_parse
+        ignorecase: Whether the pattern is matched case-insensitively
+
+    Returns:
+        set or None: Possible leading literals, or None if unconstrained
+    """
+    if not items:
+        return None
+
+    op, av = items[0]
+    rest = items[1:]
+
+    if op is sre_constants.LITERAL:
+        run = []
+        for item_op, item_av in items:
+            if item_op is not sre_constants.LITERAL:
+                break
+            if ignorecase:
+                if item_av >= 128:
+                    break
+                run.append(chr(item_av).lower())
+            else:
+                run.append(chr(item_av))
+        return {''.join(run)} if run else None
+
+    if op in _ZERO_WIDTH_OPS:
+        # Anchors and lookarounds consume nothing; the match starts with what follows
+        return _leading_literals(rest, ignorecase)
+
+    if op is sre_constants.SUBPATTERN:
+        return _leading_literals(list(av[-1]) + rest, ignorecase)
+
+    if op is sre_constants.BRANCH:
+        alternatives = [list(alt) + rest for alt in av[1]]
+    elif op in _REPEAT_OPS:
+        min_repeat, _, item = av
+        alternatives = [list(item) + rest]
+        if min_repeat == 0:
+            alternatives.append(rest)
+    else:
+        return None
+
+    literals = set()
+    for alternative in alternatives:
+        found = _leading_literals(alternative, ignorecase)
+        if found is None:
+            return None
+        literals |= found
+        if len(literals) > MAX_ANCHORS:
+            return None
+    return literals
+
+
+def pattern_anchors(pattern, flags):
+    """
+    Get the literal anchors a pattern's matches must begin with.
+
+    Returns:
+        tuple or None: Anchor strings (lowercased for IGNORECASE patterns),
+                       or None when the pattern should use a plain search
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except Exception:
+        return None
+
+    ignorecase = bool((flags | parsed.state.flags) & re.IGNORECASE)
+    literals = _leading_literals(list(parsed), ignorecase)
+
+    if not literals or min(len(literal) for literal in literals) < MIN_ANCHOR_LENGTH:
+        return None
+    return tuple(sorted(literals))
+
+
+# ============================================================================
+# Lookahead Reach
+# ============================================================================
+
+# End-of-text anchors give different answers once more text is appended
+_END_ANCHORS = (sre_constants.AT_END, sre_constants.AT_END_STRING)
+_NO_REACH = (0, False)
+
+
+def _nested_subpatterns(av):
+    """Yield the subpatterns held in a parsed item's argument"""
+    if isinstance(av, sre_parse.SubPattern):
+        yield av
+    elif isinstance(av, (tuple, list)):
+        for item in av:
+            yield from _nested_subpatterns(item)
+
+
+def _is_whitespace_item(items):
+    """Whether a parsed item can only match whitespace characters"""
+    if len(items) != 1:
+        return False
+    op, av = items[0]
+    if op is sre_constants.LITERAL:
+        return chr(av).isspace()
+    if op is sre_constants.IN:
+        return all(
+            (item_op is sre_constants.CATEGORY and item_av is sre_constants.CATEGORY_SPACE)
+            or (item_op is sre_constants.LITERAL and chr(item_av).isspace())
+            for item_op, item_av in av
+        )
+    return False
+
+
+def _lookahead_body_reach(body):
+    """Reach of a single lookahead body, or None if it has no usable bound"""
+    if _items_reach(list(body)) != _NO_REACH:
+        return None
+    _, max_width = body.getwidth()
+    if max_width < sre_constants.MAXREPEAT:
+        return (max_width, False)
+    
+    # A leading whitespace run followed by a bounded tail, e.g. (?!\s*towards)
+    items = list(body)
+    if items and items[0][0] in _REPEAT_OPS and _is_whitespace_item(list(items[0][1][2])):
+        _, tail_width = sre_parse.SubPattern(body.state, items[1:]).getwidth()
+        if tail_width < sre_constants.MAXREPEAT:
+            return (tail_width, True)
+    return None
+
+
+def _items_reach(items):
+    reach = _NO_REACH
+    for op, av in items:
+        if op is sre_constants.AT and av in _END_ANCHORS:
+            return None
+        if op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT) and av[0] > 0:
+            found = _lookahead_body_reach(av[1])
+        else:
+            found = _NO_REACH
+            for subpattern in _nested_subpatterns(av):
+                nested = _items_reach(list(subpattern))
+                if nested is None:
+                    return None
+                found = (max(found[0], nested[0]), found[1] or nested[1])
+        if found is None:
+            return None
+        reach = (max(reach[0], found[0]), reach[1] or found[1])
+    return reach
+
+
+def lookahead_reach(pattern, flags):
+    """
+    Work out how far past the end of a match a pattern can look.
+    
+    A match found in a prefix of a document is still a match once more text
+    is appended, unless deciding it looked beyond the end of the prefix.
+    Only lookaheads and end anchors look past the characters a match uses.
+    
+    Returns:
+        tuple or None: (width, skips_whitespace) - the match is decided by the
+                       text up to width characters past its end (after a run
+                       of whitespace when skips_whitespace is set) - or None
+                       when no bound can be given
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except Exception:
+        return None
+    return _items_reach(list(parsed))
+
+
+# ============================================================================
+# Compiled Ruleset
+# ============================================================================
+
+class CompiledRuleset:
+    """
+    Precompiled, deduplicated view of the requirement patterns.
+
+    Every pattern is compiled exactly once, keyed by (pattern, flags), so a
+    regex shared by several requirements (or repeated inside one) maps to a
+    single compiled object and is evaluated once per document.
+
+    The ruleset is immutable after construction (apart from compiling ad-hoc
+    patterns under a lock) and safe to share between threads.
+    """
+
+    def __init__(self, requirements, recommended):
+        self.requirements = freeze_rules(requirements)
+        self.recommended = freeze_rules(recommended)
+        self.fingerprint = ruleset_fingerprint(self.requirements, self.recommended)
+        self._compile_lock = threading.Lock()
+        self.patterns = {}
+        self.anchors = {}
+        self.reaches = {}
+        self.owners = {}
+        self.rule_patterns = {}
+        self.rule_sections = {}
+
+        for rule_path, rule_data in iter_rules(self.requirements, self.recommended):
+            # Section kinds the rule's patterns are searched in first
+            sections = tuple(rule_data.get('sections', ()))
+            unknown = [kind for kind in sections if kind not in SECTION_KINDS]
+            if unknown:
+                raise ValueError(f"Unknown section kinds for {rule_path}: {', '.join(unknown)}")
+            if sections:
+                self.rule_sections[rule_path] = sections
+
+            for field in TEXT_PATTERN_FIELDS:
+                for pattern in rule_data.get(field, []):
+                    self._register(pattern, re.IGNORECASE, rule_path)
+
+            # URL patterns run against extracted URLs, not the document text
+            for pattern in rule_data.get('url_patterns', []):
+                self._register(pattern, re.IGNORECASE, rule_path, scanned=False)
+
+            # Context keywords are matched against lowercased text without flags
+            for keyword in rule_data.get('context_keywords', []):
+                self._register(keyword_pattern(keyword), 0, rule_path)
+
+    def _register(self, pattern, flags, rule_path, scanned=True):
+        """Compile a pattern (once) and record which rule uses it"""
+        key = (pattern, flags)
+        self.compile(pattern, flags)
+        owners = self.owners.setdefault(key, [])
+        if rule_path not in owners:
+            owners.append(rule_path)
+        if not scanned:
+            return
+        rule_keys = self.rule_patterns.setdefault(rule_path, [])
+        if key not in rule_keys:
+            rule_keys.append(key)
+
+    def compile(self, pattern, flags=re.IGNORECASE):
+        """Return the compiled form of a pattern, compiling it on first use"""
+        key = (pattern, flags)
+        compiled = self.patterns.get(key)
+        if compiled is None:
+            with self._compile_lock:
+                compiled = self.patterns.get(key)
+                if compiled is None:
+                    compiled = re.compile(pattern, flags)
+                    # Anchors are published before the pattern so readers never miss them
+                    self.anchors[key] = pattern_anchors(pattern, flags)
+                    self.reaches[key] = lookahead_reach(pattern, flags)
+                    self.patterns[key] = compiled
+        return compiled
+
+    def shared_patterns(self):
+        """Get patterns used by more than one rule"""
+        return {key: owners for key, owners in self.owners.items() if len(owners) > 1}
+
+    def match_table(self, text):
+        """Create a per-document match table backed by this ruleset"""
+        return MatchTable(self, text)
+
+
+# ============================================================================
+# Section Index
+# ============================================================================
+
+# Heading words for each kind of syllabus section, most specific first (the
+# first alternative that matches a heading decides its kind)
+SECTION_HEADINGS = (
+    ('outcomes', r'(?:student\s+)?learning\s+(?:outcomes|objectives|goals)|course\s+(?:outcomes|objectives|goals)'),
+    ('description', r'(?:course|catalog|bulletin)\s+description|course\s+overview|description|overview'),
+    ('course_information', r'course\s+(?:information|info|details|title|name)|class\s+information|general\s+information'),
+    ('instructor', r'instructors?|professors?|faculty|contact\s+information|office\s+hours?|teaching\s+assistants?'),
+    ('prerequisites', r'pre-?requisites?|prereqs?|co-?requisites?'),
+    ('materials', r'required\s+(?:texts?|textbooks?|materials?|readings?)|textbooks?|course\s+materials?|materials'),
+    ('exams', r'final\s+(?:exam|examination|assessment)s?|exam\s+schedule|examinations'),
+    ('grading', r'grading|grades?\s+(?:scale|breakdown|distribution|weights?|categories)|grades|evaluation|assessments?'),
+    ('schedule', r'(?:course|class|weekly|tentative)\s+(?:schedule|calendar|outline)|schedule|calendar'),
+    ('policies', r'(?:\w+\s+){0,2}polic(?:y|ies)|attendance|academic\s+integrity|honor\s+(?:code|system)|accommodations?'),
+)
+
+SECTION_KINDS = tuple(kind for kind, _ in SECTION_HEADINGS)
+
+# A heading is a line that starts (after optional numbering or a bullet) with
+# heading words followed by a colon or the end of the line
+_SECTION_HEADING = re.compile(
+    r'^[ \t]*(?:(?:\d{1,2}|[ivx]{1,4}|[a-z])[.)][ \t]+|[#*\u2022\u25aa\-][ \t]*)?'
+    r'(?:' + '|'.join(f'(?P<{kind}>{words})' for kind, words in SECTION_HEADINGS) + r')'
+    r'\b[^\n:]{0,30}?(?::|[ \t]*$)',
+    re.IGNORECASE | re.MULTILINE
+)
+
+
+class Section:
+    """One section of a document: its heading's kind and text and its offsets"""
+
+    def __init__(self, kind, heading, start, end):
+        self.kind = kind
+        self.heading = heading
+        self.start = start
+        self.end = end
+
+    def __repr__(self):
+        return f"Section({self.kind!r}, {self.heading!r}, {self.start}, {self.end})"
+
+
+class SectionIndex:
+    """
+    Headings and sections of one document, found in a single pass.
+
+    Each heading starts a section that runs to the next heading. Text before
+    the first heading is taken as course information, which is where
+    syllabi put the course header.
+    """
+
+    def __init__(self, text):
+        self.text_length = len(text)
+        self.sections = []
+        headings = list(_SECTION_HEADING.finditer(text))
+        if not headings or headings[0].start() > 0:
+            first = headings[0].start() if headings else len(text)
+            self.sections.append(Section('course_information', '', 0, first))
+        for index, heading in enumerate(headings):
+            end = headings[index + 1].start() if index + 1 < len(headings) else len(text)
+            self.sections.append(Section(heading.lastgroup, heading.group().strip(), heading.start(), end))
+        self._spans = {}
+
+    def spans(self, kinds):
+        """
+        Get the text covered by sections of the given kinds.
+
+        Args:
+            kinds: Tuple of section kinds
+
+        Returns:
+            list: (start, end) offsets in document order, adjacent sections merged
+        """
+        if kinds not in self._spans:
+            spans = []
+            for section in self.sections:
+                if section.kind not in kinds:
+                    continue
+                if spans and spans[-1][1] == section.start:
+                    spans[-1] = (spans[-1][0], section.end)
+                else:
+                    spans.append((section.start, section.end))
+            self._spans[kinds] = spans
+        return self._spans[kinds]
+
+    def gaps(self, kinds):
+        """The text not covered by spans(kinds), as (start, end) offsets in document order"""
+        gaps = []
+        position = 0
+        for start, end in self.spans(kinds):
+            if start > position:
+                gaps.append((position, start))
+            position = end
+        if position < self.text_length:
+            gaps.append((position, self.text_length))
+        return gaps
+
+    def covers(self, kinds, offset):
+        """Whether an offset lies in a section of one of the given kinds"""
+        spans = self.spans(kinds)
+        index = bisect.bisect_right(spans, (offset, float('inf'))) - 1
+        return index >= 0 and offset < spans[index][1]
+
+
+# ============================================================================
+# Per-Document Match Table
+# ============================================================================
+
+class MatchTable:
+    """
+    Memoized pattern results for a single document.
+
+    Each unique (pattern, flags) pair is searched at most once; every
+    requirement scorer reading the same pattern shares the stored result.
+
+    Patterns that must start with a known literal are not run as a regex
+    search over the whole text. Instead the text is case-folded once and the
+    regex is only tried (with match()) where one of its anchors occurs, which
+    finds the same leftmost match as search() without a full-text regex pass.
+
+    A search can name section kinds (see SectionIndex) to look in first; the
+    rest of the text is only read when they hold no match. `scanned` counts
+    the characters the searches have covered, for benchmarks.
+    """
+
+    def __init__(self, ruleset, text):
+        self.ruleset = ruleset
+        self.text = text
+        self.text_lower = text.lower()
+        self.scanned = 0
+        self._folded = None
+        self._sections = None
+        self._lower_sections = None
+        self._results = {}
+
+    @property
+    def sections(self):
+        """SectionIndex of the document, built on first use"""
+        if self._sections is None:
+            self._sections = SectionIndex(self.text)
+        return self._sections
+
+    def _section_index(self, lowered):
+        """SectionIndex whose offsets fit the text (or lowercased text) being searched"""
+        if not lowered or len(self.text_lower) == len(self.text):
+            return self.sections
+        # Lowercasing changed the length (e.g. a dotted capital I); index that text itself
+        if self._lower_sections is None:
+            self._lower_sections = SectionIndex(self.text_lower)
+        return self._lower_sections
+
+    @property
+    def folded(self):
+        """Case-folded text aligned with self.text, built on first use"""
+        if self._folded is None:
+            # ASCII text folds to its plain lowercase; share that copy
+            self._folded = self.text_lower if self.text.isascii() else fold_text(self.text)
+        return self._folded
+
+    def search(self, pattern, flags=re.IGNORECASE, sections=()):
+        """
+        Get the first match of a pattern in the document text.
+
+        Args:
+            pattern: Regex pattern
+            flags: Regex flags
+            sections: Section kinds to search first. The first match inside
+                      them is returned if there is one, otherwise the first
+                      match anywhere, so whether a pattern matches never
+                      depends on the sections, only how much text is read
+
+        Returns:
+            re.Match or None
+        """
+        return self._lookup((pattern, flags, False), sections, self.text)
+
+    def search_lower(self, pattern, sections=()):
+        """Get the first match of a pattern in the lowercased document text"""
+        return self._lookup((pattern, 0, True), sections, self.text_lower)
+
+    def _lookup(self, key, sections, haystack):
+        pattern, flags, lowered = key
+        # Compiling registers the pattern's anchors
+        self.ruleset.compile(pattern, flags)
+        if not sections or self.ruleset.anchors.get((pattern, flags)) is None:
+            # A regex search cannot be stopped at a section's end without cutting
+            # off matches that run past it, so unanchored patterns read it all
+            if key not in self._results:
+                self._results[key] = self._search(pattern, flags, haystack, lowered)
+            return self._results[key]
+
+        section_key = key + (sections,)
+        if section_key in self._results:
+            return self._results[section_key]
+        index = self._section_index(lowered)
+        first = self._results.get(key, False)
+        if first is None or (first and index.covers(sections, first.start())):
+            # Already known: no match at all, or the first match is in a declared section
+            match = first
+        else:
+            match = None
+            for start, end in index.spans(sections):
+                # Nothing matches before a known first match
+                if first:
+                    if end <= first.start():
+                        continue
+                    start = max(start, first.start())
+                match = self._search(pattern, flags, haystack, lowered, start, end)
+                if match is not None:
+                    break
+            if match is None:
+                if first is False:
+                    # With no match in the sections, the first match in the rest
+                    # of the text is the first match anywhere
+                    for start, end in index.gaps(sections):
+                        first = self._search(pattern, flags, haystack, lowered, start, end)
+                        if first is not None:
+                            break
+                    self._results[key] = first
+                match = first
+        self._results[section_key] = match
+        return match
+
+    def _search(self, pattern, flags, haystack, lowered, start=0, end=None):
+        """First match starting in [start, end), by default anywhere"""
+        compiled = self.ruleset.compile(pattern, flags)
+        anchors = self.ruleset.anchors.get((pattern, flags))
+        if end is None:
+            end = len(haystack)
+
+        if anchors is None:
+            match = compiled.search(haystack, start)
+            self.scanned += (match.start() if match else end) - start
+            return match
+
+        # IGNORECASE anchors are looked up in the folded text; case-sensitive
+        # anchors are looked up in the very string being searched
+        if flags & re.IGNORECASE:
+            anchor_text = self.folded
+        elif lowered:
+            anchor_text = self.text_lower
+        else:
+            anchor_text = self.text
+
+        # Walk anchor occurrences left to right; the first position where the
+        # regex matches is the same match search() would have returned.
+        # An anchor may run past the end as long as it starts before it, and
+        # match() still sees the whole text, so a match is never cut short.
+        limits = {anchor: end + len(anchor) - 1 for anchor in anchors}
+        next_hits = {anchor: anchor_text.find(anchor, start, limits[anchor]) for anchor in anchors}
+        while True:
+            position = min((hit for hit in next_hits.values() if hit >= 0), default=-1)
+            if position < 0:
+                self.scanned += end - start
+                return None
+            match = compiled.match(haystack, position)
+            if match:
+                self.scanned += position - start
+                return match
+            for anchor, hit in next_hits.items():
+                if hit == position:
+                    next_hits[anchor] = anchor_text.find(anchor, position + 1, limits[anchor])
+
+    def scan(self):
+        """Evaluate every text pattern in the ruleset against this document"""
+        for rule_path in self.ruleset.rule_patterns:
+            self.rule_hits(rule_path)
+        return self
+
+    def rule_hits(self, rule_path):
+        """
+        Report which of a rule's patterns matched and where.
+
+        Args:
+            rule_path: Rule identifier from iter_rules (e.g. 'grading_scale')
+
+        Returns:
+            list: [{'pattern': ..., 'start': int, 'end': int}, ...] for each hit
+        """
+        hits = []
+        sections = self.ruleset.rule_sections.get(rule_path, ())
+        for pattern, flags in self.ruleset.rule_patterns.get(rule_path, []):
+            if flags & re.IGNORECASE:
+                match = self.search(pattern, flags, sections)
+            else:
+                match = self.search_lower(pattern, sections)
+            if match:
+                hits.append({'pattern': pattern, 'start': match.start(), 'end': match.end()})
+        return hits
+
+
+# ============================================================================
+# Per-Call Evaluation Context
+# ============================================================================
+
+class EvaluationContext:
+    """
+    Everything computed while checking one document.
+
+    Created fresh for every check_syllabus call and never shared, so the
+    checker and its ruleset stay free of per-request state.
+
+    Also the document's analysis: every rule scorer and bulletin validator
+    reads the lowercase and whitespace-normalized text, the joined URL
+    string and URL pattern results from here, so each is computed at most
+    once per document instead of once per rule.
+    """
+
+    def __init__(self, ruleset, text, extracted_urls, matches=None):
+        self.ruleset = ruleset
+        self.text = text
+        self.extracted_urls = extracted_urls
+        self.matches = matches if matches is not None else ruleset.match_table(text)
+        self.bulletin_data = None
+        self.bulletin_validation = None
+        self._normalized_text = None
+        self._urls_joined = None
+        self._url_results = {}
+
+    @property
+    def text_lower(self):
+        """Lowercased text, shared with the match table"""
+        return self.matches.text_lower
+
+    @property
+    def normalized_text(self):
+        """Lowercased text with whitespace runs collapsed to single spaces"""
+        if self._normalized_text is None:
+            # str.split() splits on exactly the characters \s matches
+            self._normalized_text = " ".join(self.text_lower.split())
+        return self._normalized_text
+
+    @property
+    def urls_joined(self):
+        """Extracted URLs joined by spaces"""
+        if self._urls_joined is None:
+            self._urls_joined = " ".join(self.extracted_urls)
+        return self._urls_joined
+
+    def url_search(self, pattern):
+        """Whether a URL pattern matches the joined URLs (memoized)"""
+        if pattern not in self._url_results:
+            self._url_results[pattern] = self.ruleset.compile(pattern).search(self.urls_joined) is not None
+        return self._url_results[pattern]
+
+
+# ============================================================================
+# Prefix Evaluation
+# ============================================================================
+
+_WHITESPACE_RUN = re.compile(r'\s*')
+
+
+class PendingMatch:
+    """Stand-in for a match that may still turn up later in the document"""
+
+    def start(self):
+        return 0
+
+    def end(self):
+        return 0
+
+
+PENDING_MATCH = PendingMatch()
+
+
+class SettledMatchView:
+    """
+    Match table view for a document read only up to some page.
+    
+    Reports a pattern as matched only when no text appended later can undo
+    the match (see lookahead_reach). Patterns that are not settled count as
+    unmatched, or - with optimistic=True - as matched, which gives the best
+    result the rest of the document could still produce.
+    
+    The prefix must end with a newline, as every extracted page does.
+    """
+
+    def __init__(self, table, optimistic=False):
+        self.table = table
+        self.optimistic = optimistic
+
+    # Whether a pattern matches does not depend on sections, and the first
+    # match anywhere is the one whose settling was worked out; ignore them
+    def search(self, pattern, flags=re.IGNORECASE, sections=()):
+        return self._settle(self.table.search(pattern, flags), (pattern, flags))
+
+    def search_lower(self, pattern, sections=()):
+        return self._settle(self.table.search_lower(pattern), (pattern, 0))
+
+    def _settle(self, match, key):
+        if match is not None and self._is_settled(match, self.table.ruleset.reaches.get(key)):
+            return match
+        return PENDING_MATCH if self.optimistic else None
+
+    @staticmethod
+    def _is_settled(match, reach):
+        if reach is None:
+            return False
+        width, skips_whitespace = reach
+        end = match.end()
+        if skips_whitespace:
+            end = _WHITESPACE_RUN.match(match.string, end).end()
+        # Strictly inside the prefix, so word boundaries at the end are decided too
+        return end + width < len(match.string)
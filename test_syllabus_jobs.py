@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Tests for the background job store and runner
+Run with: python -m pytest test_syllabus_jobs.py (or python -m unittest)
+"""
+
+import contextlib
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+
+from syllabus_jobs import JobStore, JobRunner, JOB_COMPLETE, JOB_QUEUED, JOB_RUNNING
+
+
+def fake_result(entry):
+    """A minimal per-file result, as iter_check_results would yield"""
+    return {'filename': entry['filename'], 'required': {'percentage': 50.0, 'found': 7}}
+
+
+def wait_for_status(store, job_id, status, timeout=10):
+    """Poll a job until it reaches status; returns the last job seen"""
+    deadline = time.monotonic() + timeout
+    job = store.get_job(job_id)
+    while job['status'] != status and time.monotonic() < deadline:
+        time.sleep(0.05)
+        job = store.get_job(job_id)
+    return job
+
+
+class JobTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.directory, 'jobs.db')
+        self.store = JobStore(self.db_path)
+        self.runners = []
+        self.checked = []
+
+    def tearDown(self):
+        for runner in self.runners:
+            runner.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def start_runner(self, process_batch=None, **settings):
+        runner = JobRunner(self.store, process_batch or self.process_batch, **settings)
+        self.runners.append(runner)
+        return runner
+
+    def process_batch(self, entries):
+        for position, entry in enumerate(entries):
+            self.checked.append(entry['filename'])
+            yield position, fake_result(entry)
+
+    def age_job(self, job_id, seconds):
+        """Pretend the job was last updated `seconds` ago"""
+        with contextlib.closing(sqlite3.connect(self.db_path)) as conn, conn:
+            conn.execute('UPDATE jobs SET updated_at = ? WHERE id = ?', (time.time() - seconds, job_id))
+
+
+class TestJobRecovery(JobTestCase):
+
+    def test_queued_job_runs_when_runner_starts(self):
+        job_id = self.store.create_job([{'filename': 'a.txt', 'data': b'a'}])
+
+        self.start_runner()
+
+        job = wait_for_status(self.store, job_id, JOB_COMPLETE)
+        self.assertEqual(job['status'], JOB_COMPLETE)
+        self.assertEqual(job['completed_files'], 1)
+
+    def test_interrupted_job_resumes_from_unchecked_files(self):
+        files = [{'filename': name, 'data': name.encode()} for name in ('a.txt', 'b.txt', 'c.txt')]
+        job_id = self.store.create_job(files)
+        # A previous server claimed the job and checked one file before it died
+        self.assertTrue(self.store.claim_job(job_id))
+        self.store.save_result(job_id, 0, fake_result(files[0]))
+        self.age_job(job_id, 3600)
+
+        self.start_runner(stale_after=600)
+
+        job = wait_for_status(self.store, job_id, JOB_COMPLETE)
+        self.assertEqual(job['status'], JOB_COMPLETE)
+        self.assertEqual(job['completed_files'], 3)
+        self.assertEqual(self.checked, ['b.txt', 'c.txt'])
+        results = self.store.get_results(job_id)
+        self.assertEqual([result['index'] for result in results], [0, 1, 2])
+
+    def test_recently_updated_running_job_is_left_alone(self):
+        job_id = self.store.create_job([{'filename': 'a.txt', 'data': b'a'}])
+        # Claimed moments ago by another server that is still alive
+        self.assertTrue(self.store.claim_job(job_id))
+
+        self.start_runner(stale_after=600)
+        time.sleep(0.2)
+
+        self.assertEqual(self.store.get_job(job_id)['status'], JOB_RUNNING)
+        self.assertEqual(self.checked, [])
+
+
+class TestHeartbeat(JobTestCase):
+
+    def test_running_job_expires_without_heartbeat(self):
+        job_id = self.store.create_job([{'filename': 'a.txt', 'data': b'a'}])
+        self.assertTrue(self.store.claim_job(job_id))
+
+        self.assertEqual(self.store.unfinished_jobs(stale_after=60), [])
+        self.age_job(job_id, 61)
+
+        self.assertEqual(self.store.unfinished_jobs(stale_after=60), [job_id])
+        self.assertEqual(self.store.get_job(job_id)['status'], JOB_QUEUED)
+
+    def test_heartbeat_only_refreshes_running_jobs(self):
+        running = self.store.create_job([{'filename': 'a.txt', 'data': b'a'}])
+        queued = self.store.create_job([{'filename': 'b.txt', 'data': b'b'}])
+        self.assertTrue(self.store.claim_job(running))
+        self.age_job(running, 100)
+        self.age_job(queued, 100)
+
+        self.store.heartbeat([running, queued])
+
+        self.assertGreater(self.store.get_job(running)['updated_at'], time.time() - 10)
+        self.assertLess(self.store.get_job(queued)['updated_at'], time.time() - 50)
+
+    def test_heartbeat_keeps_long_job_from_expiring(self):
+        release = threading.Event()
+
+        def slow_batch(entries):
+            release.wait(10)
+            yield from self.process_batch(entries)
+
+        job_id = self.store.create_job([{'filename': 'a.txt', 'data': b'a'}])
+        self.start_runner(slow_batch, stale_after=0.5, rescan_interval=0.1)
+        wait_for_status(self.store, job_id, JOB_RUNNING)
+
+        # Well past stale_after, another server's rescan must still see it as alive
+        time.sleep(1.0)
+        self.assertEqual(self.store.unfinished_jobs(stale_after=0.5), [])
+        self.assertEqual(self.store.get_job(job_id)['status'], JOB_RUNNING)
+
+        release.set()
+        self.assertEqual(wait_for_status(self.store, job_id, JOB_COMPLETE)['status'], JOB_COMPLETE)
+        self.assertEqual(self.checked, ['a.txt'])
+
+    def test_job_abandoned_after_start_is_picked_up_by_rescan(self):
+        job_id = self.store.create_job([{'filename': 'a.txt', 'data': b'a'}])
+        # Claimed by a server that dies right after this runner started
+        self.assertTrue(self.store.claim_job(job_id))
+
+        self.start_runner(stale_after=0.5, rescan_interval=0.1)
+
+        job = wait_for_status(self.store, job_id, JOB_COMPLETE)
+        self.assertEqual(job['status'], JOB_COMPLETE)
+        self.assertEqual(self.checked, ['a.txt'])
+
+
+if __name__ == '__main__':
+    unittest.main()
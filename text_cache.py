@@ -0,0 +1,117 @@
+"""
+Extracted Text Cache
+Caches document text by file content hash and extractor version
+"""
+
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+
+# ============================================================================
+# Text Cache
+# ============================================================================
+
+class TextCache:
+    """
+    On-disk cache of extracted document text.
+
+    Keys combine the SHA-256 of the file bytes, the file extension and the
+    extractor version (backend name plus library version), so text survives
+    requirement rule changes but not a different extraction backend.
+
+    Text is zlib-compressed in a SQLite file shared by every worker process.
+    The compressed size of all entries is bounded by max_bytes, evicting the
+    least recently used entries first.
+    """
+
+    def __init__(self, db_path, max_bytes=256 * 1024 * 1024, compression_level=6):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.compression_level = compression_level
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS texts ('
+                'key TEXT PRIMARY KEY, text BLOB NOT NULL, pages INTEGER NOT NULL, '
+                'size INTEGER NOT NULL, accessed_at REAL NOT NULL)'
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    @staticmethod
+    def key_for(digest, extension, extractor_version):
+        """
+        Build the cache key for a file.
+
+        Args:
+            digest: Hex SHA-256 of the file bytes
+            extension: Lowercase file extension, e.g. '.pdf'
+            extractor_version: Version of the extractor for that extension
+        """
+        return f"{digest}:{extension}:{extractor_version}"
+
+    def get(self, key):
+        """
+        Get cached text.
+
+        Returns:
+            tuple or None: (text, pages) where pages is the number of pages read
+        """
+        with self._connect() as conn:
+            row = conn.execute('SELECT text, pages FROM texts WHERE key = ?', (key,)).fetchone()
+            if row is not None:
+                conn.execute('UPDATE texts SET accessed_at = ? WHERE key = ?', (time.time(), key))
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return zlib.decompress(row[0]).decode('utf-8', 'surrogatepass'), row[1]
+
+    def set(self, key, text, pages):
+        """Cache a document's text and page count"""
+        blob = zlib.compress(text.encode('utf-8', 'surrogatepass'), self.compression_level)
+        if len(blob) > self.max_bytes:
+            # Would evict everything else and then itself
+            return
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO texts (key, text, pages, size, accessed_at) VALUES (?, ?, ?, ?, ?)',
+                (key, blob, pages, len(blob), time.time())
+            )
+            # Evict least recently used entries until the total size fits
+            conn.execute(
+                'DELETE FROM texts WHERE key IN ('
+                'SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY accessed_at DESC) AS total FROM texts) '
+                'WHERE total > ?)',
+                (self.max_bytes,)
+            )
+
+    def clear(self):
+        """Remove every entry"""
+        with self._connect() as conn:
+            conn.execute('DELETE FROM texts')
+
+    def stats(self):
+        """Get cache statistics for monitoring"""
+        with self._connect() as conn:
+            entries, size = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM texts').fetchone()
+        with self._lock:
+            return {
+                'entries': entries,
+                'bytes': size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
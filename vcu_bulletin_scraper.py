@@ -5,8 +5,15 @@ Scrapes course descriptions and prerequisites from bulletin.vcu.edu
 
 import re
 import requests
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from lxml import etree
+from collections import OrderedDict
+import contextlib
+import gzip
+import json
+import os
+import sqlite3
+import threading
 import time
 
 
@@ -16,43 +23,633 @@ import time
 
 class BulletinCache:
     """
-    In-memory cache for VCU Bulletin data.
+    Bounded, thread-safe in-memory LRU cache for VCU Bulletin data.
     
-    NOTE: Cache is cleared when server restarts.
-    TODO: Consider file-based or persistent cache based on 
-          production deployment strategy.
+    Holds at most max_entries entries, evicting the least recently used.
+    Expired entries are dropped when read and by a sweep that runs at most
+    every sweep_interval seconds during writes, so stale data never piles up.
+    
+    NOTE: Cache is cleared when server restarts and is private to one
+          process. Use PersistentBulletinCache to share a warm cache
+          between worker processes and across restarts.
     """
     
-    def __init__(self, ttl_hours=1):
-        self.cache = {}
+    def __init__(self, ttl_hours=1, max_entries=1024, sweep_interval=60):
+        self.cache = OrderedDict()
         self.ttl_seconds = ttl_hours * 3600
+        self.max_entries = max_entries
+        self.sweep_interval = sweep_interval
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
     
     def get(self, course_key):
         """Get cached data if it exists and hasn't expired"""
-        if course_key in self.cache:
-            entry = self.cache[course_key]
-            if datetime.now() < entry['expires_at']:
-                return entry['data']
-            else:
+        with self._lock:
+            entry = self.cache.get(course_key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if time.monotonic() >= entry['expires_at']:
                 # Expired, remove from cache
-                del self.cache[course_key]
-        return None
-    
-    def set(self, course_key, data):
-        """Cache data with expiration timestamp"""
-        self.cache[course_key] = {
-            'data': data,
-            'cached_at': datetime.now(),
-            'expires_at': datetime.now() + timedelta(seconds=self.ttl_seconds)
-        }
+                self._remove(course_key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self.cache.move_to_end(course_key)
+            self.hits += 1
+            return entry['data']
+    
+    def set(self, course_key, data, ttl_seconds=None):
+        """Cache data with expiration timestamp (ttl_seconds overrides the default TTL)"""
+        now = time.monotonic()
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        # Serialized size is a cheap, stable approximation of memory use
+        size = len(json.dumps(data, default=str))
+        with self._lock:
+            if course_key in self.cache:
+                self._remove(course_key)
+            self.cache[course_key] = {
+                'data': data,
+                'size': size,
+                'expires_at': now + ttl
+            }
+            self._bytes += size
+            
+            if now - self._last_sweep >= self.sweep_interval:
+                self._sweep(now)
+            while len(self.cache) > self.max_entries:
+                self._remove(next(iter(self.cache)))
+                self.evictions += 1
+    
+    def _remove(self, course_key):
+        self._bytes -= self.cache.pop(course_key)['size']
+    
+    def _sweep(self, now):
+        expired = [key for key, entry in self.cache.items() if entry['expires_at'] <= now]
+        for key in expired:
+            self._remove(key)
+        self.expirations += len(expired)
+        self._last_sweep = now
+        return len(expired)
     
     def clear(self):
         """Clear all cache"""
-        self.cache = {}
+        with self._lock:
+            self.cache = OrderedDict()
+            self._bytes = 0
+    
+    def sweep(self, vacuum=False):
+        """Remove expired entries; returns how many were removed"""
+        with self._lock:
+            return self._sweep(time.monotonic())
+    
+    def stats(self):
+        """Get cache counters for monitoring"""
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'entries': len(self.cache),
+                'max_entries': self.max_entries,
+                'approx_bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+
+class PersistentBulletinCache:
+    """
+    SQLite-backed cache for VCU Bulletin data with the BulletinCache interface.
+    
+    Entries survive restarts and are shared by every process pointing at the
+    same file. Each operation opens and closes its own connection, and the
+    database runs in WAL mode so readers never block the writer.
+    
+    The file holds at most max_entries entries; writes evict the oldest
+    ones (reads do not update access times, which would turn every cache
+    hit into a write). Hit, miss, eviction and expiration counters are
+    kept per process.
+    """
+    
+    def __init__(self, db_path, ttl_hours=1, max_entries=10000, sweep_interval=60):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_entries = max_entries
+        self.sweep_interval = sweep_interval
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS bulletin_cache ('
+                'course_key TEXT PRIMARY KEY, data TEXT NOT NULL, '
+                'cached_at REAL NOT NULL, expires_at REAL NOT NULL)'
+            )
+    
+    @contextlib.contextmanager
+    def _connect(self):
+        # sqlite3's own context manager only commits; close the connection too
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    def _count(self, counter, amount=1):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+    
+    def get(self, course_key):
+        """Get cached data if it exists and hasn't expired"""
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT data FROM bulletin_cache WHERE course_key = ? AND expires_at > ?',
+                (course_key, time.time())
+            ).fetchone()
+        self._count('hits' if row else 'misses')
+        return json.loads(row[0]) if row else None
+    
+    def set(self, course_key, data, ttl_seconds=None):
+        """Cache data with expiration timestamp (ttl_seconds overrides the default TTL)"""
+        now = time.time()
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO bulletin_cache (course_key, data, cached_at, expires_at) '
+                'VALUES (?, ?, ?, ?)',
+                (course_key, json.dumps(data), now, now + ttl)
+            )
+            evicted = conn.execute(
+                'DELETE FROM bulletin_cache WHERE course_key IN ('
+                'SELECT course_key FROM bulletin_cache ORDER BY cached_at DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            ).rowcount
+        if evicted:
+            self._count('evictions', evicted)
+        
+        with self._lock:
+            sweep_due = time.monotonic() - self._last_sweep >= self.sweep_interval
+        if sweep_due:
+            self.sweep()
+    
+    def clear(self):
+        """Clear all cache"""
+        with self._connect() as conn:
+            conn.execute('DELETE FROM bulletin_cache')
+    
+    def sweep(self, vacuum=False):
+        """
+        Remove expired entries.
+        
+        Args:
+            vacuum: Also compact the database file afterwards
+        
+        Returns:
+            int: Number of entries removed
+        """
+        with self._lock:
+            self._last_sweep = time.monotonic()
+        with self._connect() as conn:
+            removed = conn.execute(
+                'DELETE FROM bulletin_cache WHERE expires_at <= ?', (time.time(),)
+            ).rowcount
+        self._count('expirations', removed)
+        if vacuum:
+            # VACUUM cannot run inside a transaction; it runs in autocommit mode here
+            with self._connect() as conn:
+                conn.execute('VACUUM')
+        return removed
+    
+    def stats(self):
+        """Get cache counters for monitoring"""
+        with self._connect() as conn:
+            entries, approx_bytes = conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM bulletin_cache WHERE expires_at > ?',
+                (time.time(),)
+            ).fetchone()
+        with self._lock:
+            return {
+                'backend': 'sqlite',
+                'entries': entries,
+                'max_entries': self.max_entries,
+                'approx_bytes': approx_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+
+def configure_cache(db_path=None, ttl_hours=1, max_entries=None):
+    """
+    Choose the cache used by scrape_course_data.
+    
+    Args:
+        db_path: SQLite file for a persistent, shared cache, or None for
+                 a per-process in-memory cache
+        ttl_hours: How long bulletin data stays fresh
+        max_entries: Entry bound (default 1024 in memory, 10000 on disk)
+    
+    Returns:
+        BulletinCache or PersistentBulletinCache: The new global cache
+    """
+    global _bulletin_cache
+    if db_path:
+        _bulletin_cache = PersistentBulletinCache(db_path, ttl_hours=ttl_hours, max_entries=max_entries or 10000)
+        _bulletin_cache.sweep()
+    else:
+        _bulletin_cache = BulletinCache(ttl_hours=ttl_hours, max_entries=max_entries or 1024)
+    return _bulletin_cache
+
+
+# Global cache instance; set BULLETIN_CACHE_DB to share one cache file
+_bulletin_cache = None
+configure_cache(
+    db_path=os.environ.get('BULLETIN_CACHE_DB'),
+    ttl_hours=float(os.environ.get('BULLETIN_CACHE_TTL_HOURS', 1)),
+    max_entries=int(os.environ.get('BULLETIN_CACHE_MAX_ENTRIES', 0)) or None
+)
+
+
+# ============================================================================
+# Rate Limiting
+# ============================================================================
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting requests to bulletin.vcu.edu.
+    
+    Holds up to `burst` tokens and refills at `rate` tokens per second.
+    A caller only waits when the bucket is empty, i.e. when the configured
+    request rate would otherwise be exceeded. Waiting callers reserve their
+    token up front (the balance may go negative), so they are served in
+    order without polling.
+    """
+    
+    def __init__(self, rate=2.0, burst=2):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _reserve(self, tokens, updated_at, now):
+        """Take one token; returns (new_tokens, seconds_to_wait)"""
+        tokens = min(self.burst, tokens + (now - updated_at) * self.rate) - 1
+        wait = -tokens / self.rate if tokens < 0 else 0.0
+        return tokens, wait
+    
+    def acquire(self):
+        """Block until a request may be sent; returns the seconds waited"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens, wait = self._reserve(self._tokens, self._updated_at, now)
+            self._updated_at = now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class SharedTokenBucket(TokenBucket):
+    """
+    Token bucket whose state lives in SQLite, shared by every process
+    using the same file (e.g. the persistent bulletin cache database).
+    """
+    
+    def __init__(self, db_path, rate=2.0, burst=2, name='bulletin.vcu.edu'):
+        super().__init__(rate=rate, burst=burst)
+        self.db_path = db_path
+        self.name = name
+        
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with contextlib.closing(sqlite3.connect(db_path, timeout=30)) as conn, conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS rate_limits ('
+                'name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)'
+            )
+    
+    def acquire(self):
+        """Block until a request may be sent; returns the seconds waited"""
+        # Wall-clock time, since monotonic clocks are not comparable across processes
+        now = time.time()
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        try:
+            # IMMEDIATE takes the write lock up front so read-modify-write is atomic
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute(
+                'SELECT tokens, updated_at FROM rate_limits WHERE name = ?', (self.name,)
+            ).fetchone()
+            tokens, updated_at = row if row else (float(self.burst), now)
+            tokens, wait = self._reserve(tokens, min(updated_at, now), now)
+            conn.execute(
+                'INSERT OR REPLACE INTO rate_limits (name, tokens, updated_at) VALUES (?, ?, ?)',
+                (self.name, tokens, now)
+            )
+            conn.execute('COMMIT')
+        finally:
+            conn.close()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+def configure_rate_limiter(rate=2.0, burst=2, db_path=None):
+    """
+    Set how fast scrape_course_data may send requests to the bulletin.
+    
+    Args:
+        rate: Sustained requests per second
+        burst: Requests allowed back-to-back before throttling starts
+        db_path: SQLite file to share the limit between processes, or None
+                 to limit only the threads of this process
+    
+    Returns:
+        TokenBucket: The new global rate limiter
+    """
+    global _rate_limiter
+    if db_path:
+        _rate_limiter = SharedTokenBucket(db_path, rate=rate, burst=burst)
+    else:
+        _rate_limiter = TokenBucket(rate=rate, burst=burst)
+    return _rate_limiter
+
+
+# Global rate limiter: 2 requests per second keeps the old 0.5 s spacing
+_rate_limiter = None
+configure_rate_limiter(
+    rate=float(os.environ.get('BULLETIN_RATE_LIMIT', 2.0)),
+    burst=int(os.environ.get('BULLETIN_RATE_BURST', 2)),
+    db_path=os.environ.get('BULLETIN_CACHE_DB')
+)
+
+
+# ============================================================================
+# HTTP Session
+# ============================================================================
+
+class SessionSettings:
+    """
+    Connection pool, retry and timeout settings for bulletin requests.
+    
+    Args:
+        pool_size: Keep-alive connections kept per host (one per concurrent thread)
+        retries: Retries for failed connections and 429/5xx responses (see fetch_page)
+        backoff: Exponential backoff factor between retries, in seconds
+        connect_timeout: Seconds to wait for the TCP/TLS connection
+        read_timeout: Seconds to wait for the server to send data
+    """
+    
+    def __init__(self, pool_size=10, retries=2, backoff=0.5,
+                 connect_timeout=3.05, read_timeout=5):
+        self.pool_size = pool_size
+        self.retries = retries
+        self.backoff = backoff
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+    
+    @property
+    def timeout(self):
+        """Timeout tuple in the form requests expects"""
+        return (self.connect_timeout, self.read_timeout)
+    
+    def build_session(self):
+        """Create a pooled keep-alive session"""
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.pool_size,
+            # fetch_page retries itself, so every attempt goes through the rate limiter
+            max_retries=0
+        )
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+
+# Global session settings; the environment can tune them per deployment
+_session_settings = SessionSettings(
+    pool_size=int(os.environ.get('BULLETIN_POOL_SIZE', 10)),
+    retries=int(os.environ.get('BULLETIN_RETRIES', 2)),
+    backoff=float(os.environ.get('BULLETIN_BACKOFF', 0.5)),
+    connect_timeout=float(os.environ.get('BULLETIN_CONNECT_TIMEOUT', 3.05)),
+    read_timeout=float(os.environ.get('BULLETIN_READ_TIMEOUT', 5))
+)
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def configure_session(**settings):
+    """
+    Change the bulletin HTTP session settings (see SessionSettings).
+    
+    The current session is closed; the next request opens a new one.
+    """
+    global _session_settings, _session
+    with _session_lock:
+        _session_settings = SessionSettings(**settings)
+        if _session is not None:
+            _session.close()
+        _session = None
+    return _session_settings
+
+
+def get_session():
+    """
+    Get the shared bulletin session, creating it on first use.
+    
+    Requests from all threads share its connection pool. A forked worker
+    process gets a session of its own rather than reusing the parent's
+    sockets.
+    """
+    global _session, _session_pid
+    with _session_lock:
+        if _session is None or _session_pid != os.getpid():
+            _session = _session_settings.build_session()
+            _session_pid = os.getpid()
+        return _session
+
+
+# Statuses worth retrying: throttling and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def fetch_page(url):
+    """
+    Download a bulletin page over the shared keep-alive session.
+    
+    Every attempt, retries included, first takes a token from the rate
+    limiter. Connection failures and RETRY_STATUSES responses are retried
+    up to the session's `retries` times with exponential backoff; a read
+    timeout already cost read_timeout seconds, so it is reported at once.
+    
+    Returns:
+        str: Page HTML
+    
+    Raises:
+        requests.exceptions.RequestException: On timeouts, connection
+            failures and HTTP error statuses
+    """
+    settings = _session_settings
+    for attempt in range(settings.retries + 1):
+        if attempt:
+            time.sleep(settings.backoff * 2 ** (attempt - 1))
+        last_attempt = attempt == settings.retries
+        _rate_limiter.acquire()
+        try:
+            response = get_session().get(url, timeout=settings.timeout)
+        except requests.exceptions.ConnectionError:
+            if last_attempt:
+                raise
+            continue
+        if response.status_code in RETRY_STATUSES and not last_attempt:
+            response.close()
+            continue
+        response.raise_for_status()
+        return response.text
+
+
+# ============================================================================
+# Failure Handling
+# ============================================================================
+
+class BulletinUnavailable(requests.exceptions.RequestException):
+    """Raised instead of fetching while a failure is cached or the circuit is open"""
+
+
+CIRCUIT_CLOSED = 'closed'
+CIRCUIT_OPEN = 'open'
+CIRCUIT_HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for requests to bulletin.vcu.edu.
+    
+    After `failure_threshold` consecutive failures the circuit opens and
+    requests are refused without touching the network, so checks fall back
+    to pattern-only validation at once. After `reset_timeout` seconds one
+    probe request is let through (half-open): success closes the circuit,
+    failure opens it again.
+    
+    State is per process; each worker trips on its own failures.
+    """
+    
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self.state = CIRCUIT_CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+        self.successes = 0
+        self.failures = 0
+        self.rejected = 0
+        self.trips = 0
+    
+    def allow_request(self):
+        """Whether a request may be sent now"""
+        with self._lock:
+            if self.state == CIRCUIT_OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = CIRCUIT_HALF_OPEN
+            if self.state == CIRCUIT_CLOSED:
+                return True
+            if self.state == CIRCUIT_HALF_OPEN and not self._probe_in_flight:
+                # Exactly one probe; everyone else keeps short-circuiting
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+    
+    def record_success(self):
+        """The bulletin answered"""
+        with self._lock:
+            self.successes += 1
+            self.consecutive_failures = 0
+            self._probe_in_flight = False
+            self.state = CIRCUIT_CLOSED
+            self.opened_at = None
+    
+    def record_failure(self):
+        """The bulletin timed out, was unreachable or returned a server error"""
+        with self._lock:
+            self.failures += 1
+            self.consecutive_failures += 1
+            self._probe_in_flight = False
+            if self.state == CIRCUIT_HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != CIRCUIT_OPEN:
+                    self.trips += 1
+                self.state = CIRCUIT_OPEN
+                self.opened_at = time.monotonic()
+    
+    def stats(self):
+        """Breaker state and counters for monitoring"""
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.consecutive_failures,
+                'failure_threshold': self.failure_threshold,
+                'reset_timeout': self.reset_timeout,
+                'successes': self.successes,
+                'failures': self.failures,
+                'rejected': self.rejected,
+                'trips': self.trips
+            }
+
+
+def is_outage(error):
+    """Whether a request error means the bulletin itself is unhealthy"""
+    if isinstance(error, requests.exceptions.HTTPError):
+        # 4xx answers (e.g. an unknown prefix) come from a healthy server
+        return error.response is None or error.response.status_code >= 500
+    return isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError))
+
+
+def configure_circuit_breaker(failure_threshold=5, reset_timeout=30, failure_ttl=60):
+    """
+    Set the circuit breaker and negative caching policy.
+    
+    Args:
+        failure_threshold: Consecutive failures that open the circuit
+        reset_timeout: Seconds before an open circuit allows a probe
+        failure_ttl: Seconds a failed prefix lookup is remembered
+    
+    Returns:
+        CircuitBreaker: The new global breaker
+    """
+    global _circuit_breaker, _failure_ttl
+    _circuit_breaker = CircuitBreaker(failure_threshold=failure_threshold, reset_timeout=reset_timeout)
+    _failure_ttl = failure_ttl
+    return _circuit_breaker
 
 
-# Global cache instance
-_bulletin_cache = BulletinCache(ttl_hours=1)
+# Global breaker; failures are cached much shorter than bulletin data
+_circuit_breaker = None
+_failure_ttl = None
+configure_circuit_breaker(
+    failure_threshold=int(os.environ.get('BULLETIN_BREAKER_THRESHOLD', 5)),
+    reset_timeout=float(os.environ.get('BULLETIN_BREAKER_RESET', 30)),
+    failure_ttl=float(os.environ.get('BULLETIN_FAILURE_TTL', 60))
+)
 
 
 # ============================================================================
@@ -108,46 +705,42 @@ def build_bulletin_url(prefix):
 # HTML Parsing and Data Extraction
 # ============================================================================
 
-def extract_course_paragraph(soup, prefix, number):
+# Paragraph regexes, compiled once. The heading patterns accept any course
+# code; _leading_course_match checks it is the expected one, and callers fall
+# back to a course-specific pattern otherwise.
+_TITLE_AT_START = re.compile(r'([A-Za-z]+)\s+(\d+)\.\s+(.*?)\.\s+\d+\s+Hours?\.', re.IGNORECASE)
+_HEADING_AT_START = re.compile(r'([A-Za-z]+)\s+(\d+)\.[^.]+\.\s+\d+\s+Hours?\.', re.IGNORECASE)
+_CREDITS_PATTERN = re.compile(r'(\d+)\s+credits?', re.IGNORECASE)
+_PREREQ_PATTERNS = (
+    re.compile(r'Prerequisites?:\s*([^.]+(?:\.[^.]+)?)', re.IGNORECASE),  # Match until description starts
+    re.compile(r'Prereq:\s*([^.]+)', re.IGNORECASE),
+)
+_NO_PREREQ_PATTERN = re.compile(r'(none|no\s+prerequisites?)', re.IGNORECASE)
+_METADATA_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'Semester course;[^.]+\.',
+    r'\d+\s+lecture\s+hours[^.]+\.',
+    r'\d+\s+credits?\.',
+    r'Prerequisites?:[^.]+\.',
+    r'Prereq:[^.]+\.',
+    r'Enrollment\s+is\s+restricted[^.]+\.',
+))
+
+
+def _leading_course_match(pattern, paragraph_text, prefix, number):
     """
-    Extract the full course paragraph from bulletin HTML.
+    Match a generic heading pattern at the start of a paragraph.
     
-    Args:
-        soup: BeautifulSoup object of the bulletin page
-        prefix: Course prefix (e.g., "INFO")
-        number: Course number (e.g., "370")
+    Returns the match only if it is for prefix/number. A course-specific
+    pattern searched over the paragraph would then find this very match,
+    since no match can start earlier than position 0.
     
     Returns:
-        str or None: Full paragraph text or None if not found
+        re.Match or None: None means "use the course-specific pattern"
     """
-    # Find the course heading: <strong>INFO 370. Course Title. 3 Hours.</strong>
-    course_pattern = re.compile(rf'{prefix}\s+{number}\.', re.IGNORECASE)
-    course_heading = soup.find('strong', string=course_pattern)
-    
-    if not course_heading:
-        return None
-    
-    # The course info is split across two paragraphs:
-    # 1. Parent <p> contains the heading
-    # 2. Next sibling <p> contains the details (credits, prerequisites, description)
-    heading_paragraph = course_heading.find_parent('p')
-    
-    if not heading_paragraph:
-        return None
-    
-    # Get the heading text
-    heading_text = heading_paragraph.get_text(strip=True)
-    
-    # Get the next sibling paragraph with the details
-    details_paragraph = heading_paragraph.find_next_sibling('p')
-    
-    if details_paragraph:
-        details_text = details_paragraph.get_text(strip=True)
-        # Combine both paragraphs
-        return heading_text + " " + details_text
-    else:
-        # If no sibling, just return the heading (edge case)
-        return heading_text
+    match = pattern.match(paragraph_text)
+    if match and match.group(1).isascii() and match.group(1).lower() == prefix.lower() and match.group(2) == number:
+        return match
+    return None
 
 
 def parse_course_paragraph(paragraph_text, prefix, number):
@@ -177,26 +770,25 @@ def parse_course_paragraph(paragraph_text, prefix, number):
     }
     
     # Extract title (between course code and "Hours")
-    title_pattern = rf'{prefix}\s+{number}\.\s+(.*?)\.\s+\d+\s+Hours?\.'
-    title_match = re.search(title_pattern, paragraph_text, re.IGNORECASE)
-    if title_match:
-        result['title'] = title_match.group(1).strip()
+    title_match = _leading_course_match(_TITLE_AT_START, paragraph_text, prefix, number)
+    if title_match is None:
+        title_pattern = rf'{prefix}\s+{number}\.\s+(.*?)\.\s+\d+\s+Hours?\.'
+        title_match = re.search(title_pattern, paragraph_text, re.IGNORECASE)
+        title = title_match.group(1) if title_match else None
+    else:
+        title = title_match.group(3)
+    if title is not None:
+        result['title'] = title.strip()
     
     # Extract credits
-    credits_pattern = r'(\d+)\s+credits?'
-    credits_match = re.search(credits_pattern, paragraph_text, re.IGNORECASE)
+    credits_match = _CREDITS_PATTERN.search(paragraph_text)
     if credits_match:
         result['credits'] = credits_match.group(1)
     
     # Extract prerequisites
     # Look for "Prerequisite:" or "Prerequisites:" followed by text until we hit description
-    prereq_patterns = [
-        r'Prerequisites?:\s*([^.]+(?:\.[^.]+)?)',  # Match until description starts
-        r'Prereq:\s*([^.]+)',
-    ]
-    
-    for pattern in prereq_patterns:
-        prereq_match = re.search(pattern, paragraph_text, re.IGNORECASE)
+    for pattern in _PREREQ_PATTERNS:
+        prereq_match = pattern.search(paragraph_text)
         if prereq_match:
             prereq_text = prereq_match.group(1).strip()
             # Stop at enrollment restrictions or actual description
@@ -205,7 +797,7 @@ def parse_course_paragraph(paragraph_text, prefix, number):
             break
     
     # Check for "no prerequisites"
-    if re.search(r'(none|no\s+prerequisites?)', paragraph_text, re.IGNORECASE):
+    if _NO_PREREQ_PATTERN.search(paragraph_text):
         result['prerequisites'] = 'None'
     
     # Extract description
@@ -214,22 +806,17 @@ def parse_course_paragraph(paragraph_text, prefix, number):
     # Strategy: Split by '. ' and find where actual description starts
     
     # Remove the heading part first
-    desc_text = paragraph_text
-    heading_pattern = rf'{prefix}\s+{number}\.[^.]+\.\s+\d+\s+Hours?\.'
-    desc_text = re.sub(heading_pattern, '', desc_text, flags=re.IGNORECASE)
+    heading_match = _leading_course_match(_HEADING_AT_START, paragraph_text, prefix, number)
+    if heading_match is not None and number not in paragraph_text[heading_match.end():]:
+        # The heading can't occur again without the course number
+        desc_text = paragraph_text[heading_match.end():]
+    else:
+        heading_pattern = rf'{prefix}\s+{number}\.[^.]+\.\s+\d+\s+Hours?\.'
+        desc_text = re.sub(heading_pattern, '', paragraph_text, flags=re.IGNORECASE)
     
     # Remove common metadata patterns
-    metadata_patterns = [
-        r'Semester course;[^.]+\.',
-        r'\d+\s+lecture\s+hours[^.]+\.',
-        r'\d+\s+credits?\.',
-        r'Prerequisites?:[^.]+\.',
-        r'Prereq:[^.]+\.',
-        r'Enrollment\s+is\s+restricted[^.]+\.',
-    ]
-    
-    for pattern in metadata_patterns:
-        desc_text = re.sub(pattern, '', desc_text, flags=re.IGNORECASE)
+    for pattern in _METADATA_PATTERNS:
+        desc_text = pattern.sub('', desc_text)
     
     # What's left should be the description
     desc_text = desc_text.strip()
@@ -241,14 +828,276 @@ def parse_course_paragraph(paragraph_text, prefix, number):
     return result
 
 
+# ============================================================================
+# Fast Page Parser
+# ============================================================================
+
+# BeautifulSoup's get_text() skips strings inside these tags
+_NON_TEXT_TAGS = frozenset(['script', 'style', 'template', 'rt', 'rp'])
+
+_HTML_PARSER = etree.HTMLParser()
+
+
+def _element_string(element):
+    """lxml equivalent of BeautifulSoup's Tag.string (the tag's only string, or None)"""
+    while True:
+        children = list(element)
+        if element.text:
+            return element.text if not children else None
+        if len(children) != 1 or children[0].tail:
+            return None
+        element = children[0]
+        if not isinstance(element.tag, str):
+            # A lone comment or processing instruction is the string
+            return element.text
+
+
+def _element_strings(element, skip):
+    """Yield the text strings of an element in document order, like BeautifulSoup"""
+    skip = skip or element.tag in _NON_TEXT_TAGS
+    if element.text and not skip:
+        yield element.text
+    for child in element:
+        if isinstance(child.tag, str):
+            yield from _element_strings(child, skip)
+        if child.tail and not skip:
+            yield child.tail
+
+
+def _element_text(element):
+    """lxml equivalent of BeautifulSoup's get_text(strip=True)"""
+    skip = any(ancestor.tag in _NON_TEXT_TAGS for ancestor in element.iterancestors())
+    return ''.join(text.strip() for text in _element_strings(element, skip))
+
+
+def _parse_html(html):
+    """Parse a page into an lxml tree (None if the page is empty)"""
+    try:
+        return etree.fromstring(html, _HTML_PARSER)
+    except ValueError:
+        # Text with an XML encoding declaration has to be parsed as bytes
+        return etree.fromstring(html.encode('utf-8'), etree.HTMLParser(encoding='utf-8'))
+
+
+def parse_bulletin_page(html, prefix):
+    """
+    Extract the paragraph of every course on a bulletin prefix page in one pass.
+    
+    Walks the page once with lxml instead of building a BeautifulSoup tree,
+    and gives exactly what the BeautifulSoup reference parser in benchmark.py
+    gives for the same page.
+    
+    Args:
+        html: Page HTML
+        prefix: Course prefix (e.g., "INFO")
+    
+    Returns:
+        dict: {'370': 'INFO 370. Course Title. 3 Hours. ...', ...}
+    """
+    root = _parse_html(html)
+    if root is None:
+        return {}
+    
+    course_pattern = re.compile(rf'{prefix}\s+(\d+)\.', re.IGNORECASE)
+    paragraphs = {}
+    
+    for course_heading in root.iter('strong'):
+        heading_string = _element_string(course_heading)
+        if heading_string is None:
+            continue
+        
+        for number in course_pattern.findall(heading_string):
+            # Like soup.find(), the first heading mentioning a number wins
+            if number in paragraphs:
+                continue
+            
+            # Parent <p> holds the heading, the next sibling <p> the details
+            heading_paragraph = next(course_heading.iterancestors('p'), None)
+            if heading_paragraph is None:
+                paragraphs[number] = None
+                continue
+            
+            text = _element_text(heading_paragraph)
+            details_paragraph = next(heading_paragraph.itersiblings('p'), None)
+            if details_paragraph is not None:
+                text = text + " " + _element_text(details_paragraph)
+            paragraphs[number] = text
+    
+    return {number: text for number, text in paragraphs.items() if text}
+
+
+def parse_course_index(html, prefix):
+    """
+    Parse a bulletin prefix page straight into a course index.
+    
+    Returns:
+        dict: {'370': {'full_paragraph', 'title', 'credits',
+                       'prerequisites', 'description'}, ...}
+    """
+    return {
+        number: parse_course_paragraph(paragraph, prefix, number)
+        for number, paragraph in parse_bulletin_page(html, prefix).items()
+    }
+
+
+# ============================================================================
+# Offline Snapshot
+# ============================================================================
+
+# Bump when the snapshot layout changes; older files are then rejected
+SNAPSHOT_FORMAT_VERSION = 1
+
+# Loaded snapshot while in offline mode, None when lookups use the network
+_offline_snapshot = None
+
+
+def load_snapshot(path):
+    """
+    Load a bulletin catalog snapshot written by bulletin_snapshot.py.
+    
+    Args:
+        path: Snapshot file (gzip-compressed JSON)
+    
+    Returns:
+        dict: {'format_version', 'built_at', 'source', 'prefixes':
+               {'INFO': {'370': {parsed course}, ...}, ...}}
+    
+    Raises:
+        ValueError: If the file was written in another snapshot format
+    """
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        snapshot = json.load(f)
+    
+    if snapshot.get('format_version') != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported bulletin snapshot format {snapshot.get('format_version')!r} "
+            f"(expected {SNAPSHOT_FORMAT_VERSION}): {path}"
+        )
+    return snapshot
+
+
+def configure_offline(snapshot_path=None):
+    """
+    Serve every lookup from a catalog snapshot instead of bulletin.vcu.edu.
+    
+    Args:
+        snapshot_path: Snapshot file to use, or None to go back online
+    
+    Returns:
+        dict or None: The loaded snapshot
+    """
+    global _offline_snapshot
+    _offline_snapshot = load_snapshot(snapshot_path) if snapshot_path else None
+    return _offline_snapshot
+
+
+def is_offline():
+    """Whether lookups are served from a snapshot"""
+    return _offline_snapshot is not None
+
+
+# Set BULLETIN_SNAPSHOT to run without network access
+configure_offline(os.environ.get('BULLETIN_SNAPSHOT'))
+
+
 # ============================================================================
 # Main Scraping Function
 # ============================================================================
 
+# One lock per prefix so concurrent misses download each page only once
+_prefix_locks = {}
+_prefix_locks_guard = threading.Lock()
+
+
+def _prefix_lock(prefix_key):
+    with _prefix_locks_guard:
+        return _prefix_locks.setdefault(prefix_key, threading.Lock())
+
+
+def get_course_index(prefix, use_cache=True):
+    """
+    Get the course index for a prefix, fetching its bulletin page on a miss.
+    
+    In offline mode (see configure_offline) the index comes from the
+    snapshot and nothing is fetched.
+    
+    Args:
+        prefix: Course prefix (e.g., "INFO")
+        use_cache: Whether to use a cached index if available
+    
+    Returns:
+        dict: Course index from parse_course_index
+    
+    Raises:
+        BulletinUnavailable: If the prefix failed recently or the circuit is open
+        requests.exceptions.RequestException: If the page cannot be fetched
+    """
+    # Offline mode: the snapshot is the whole catalog, so no network or cache
+    if _offline_snapshot is not None:
+        return _offline_snapshot['prefixes'].get(prefix.upper(), {})
+    
+    index_key = f"{prefix.upper()}_index"
+    
+    if use_cache:
+        cached_index = _bulletin_cache.get(index_key)
+        if cached_index is not None:
+            return cached_index
+    
+    with _prefix_lock(index_key):
+        # Another thread may have fetched the page while we waited
+        if use_cache:
+            cached_index = _bulletin_cache.get(index_key)
+            if cached_index is not None:
+                return cached_index
+            
+            # Negative cache: this prefix failed moments ago, don't wait for it again
+            failure = _bulletin_cache.get(f"{prefix.upper()}_failure")
+            if failure is not None:
+                raise BulletinUnavailable(failure['error'])
+        
+        if not _circuit_breaker.allow_request():
+            raise BulletinUnavailable(
+                "VCU Bulletin temporarily unavailable (circuit breaker open) - using pattern-only validation"
+            )
+        
+        try:
+            # Rate limited (per attempt) and with timeouts; see fetch_page
+            html = fetch_page(build_bulletin_url(prefix))
+        except requests.exceptions.RequestException as e:
+            if is_outage(e):
+                _circuit_breaker.record_failure()
+            else:
+                _circuit_breaker.record_success()
+            raise
+        except Exception:
+            # Always settle the breaker so a half-open probe is never left hanging
+            _circuit_breaker.record_failure()
+            raise
+        _circuit_breaker.record_success()
+        
+        # Parse HTML once for every course in the prefix
+        course_index = parse_course_index(html, prefix)
+        
+        _bulletin_cache.set(index_key, course_index)
+        
+        return course_index
+
+
+def _remember_failure(prefix, message):
+    """Negative-cache a failed prefix lookup for _failure_ttl seconds"""
+    _bulletin_cache.set(f"{prefix.upper()}_failure", {'error': message}, ttl_seconds=_failure_ttl)
+
+
 def scrape_course_data(prefix, number, use_cache=True):
     """
     Scrape course data from VCU Bulletin.
     
+    The prefix page is downloaded and parsed once into a course index
+    (see get_course_index), so later lookups of any course with the same
+    prefix are answered from the cache. Failed lookups are cached for a
+    short time too, and repeated outages open a circuit breaker, so a down
+    bulletin server does not cost every check a full timeout.
+    
     Args:
         prefix: Course prefix (e.g., "INFO")
         number: Course number (e.g., "370")
@@ -262,17 +1111,12 @@ def scrape_course_data(prefix, number, use_cache=True):
             'prerequisites': 'MATH 211...' or 'None',
             'title': 'Course Title',
             'credits': '3',
-            'error': 'Error message if any'
+            'error': 'Error message if any',
+            'unavailable': True if the bulletin could not be read (as opposed
+                           to the course not being in it), so the lookup
+                           may succeed later
         }
     """
-    course_key = f"{prefix}_{number}"
-    
-    # Check cache first
-    if use_cache:
-        cached_data = _bulletin_cache.get(course_key)
-        if cached_data:
-            return cached_data
-    
     result = {
         'found': False,
         'full_paragraph': None,
@@ -280,44 +1124,34 @@ def scrape_course_data(prefix, number, use_cache=True):
         'prerequisites': None,
         'title': None,
         'credits': None,
-        'error': None
+        'error': None,
+        'unavailable': False
     }
     
     try:
         # Build URL
         url = build_bulletin_url(prefix)
         
-        # Make request with timeout
-        response = requests.get(url, timeout=5)
-        response.raise_for_status()
-        
-        # Parse HTML
-        soup = BeautifulSoup(response.text, 'lxml')
-        
-        # Extract course paragraph
-        paragraph = extract_course_paragraph(soup, prefix, number)
+        course_index = get_course_index(prefix, use_cache=use_cache)
+        course = course_index.get(number)
         
-        if not paragraph:
+        if not course:
             result['error'] = f"Course {prefix} {number} not found in bulletin"
-            _bulletin_cache.set(course_key, result)
             return result
         
-        # Parse the paragraph
-        parsed_data = parse_course_paragraph(paragraph, prefix, number)
-        
-        result.update(parsed_data)
+        result.update(course)
         result['found'] = True
-        
-        # Cache the successful result
-        _bulletin_cache.set(course_key, result)
-        
-        # Rate limiting: be nice to VCU servers
-        time.sleep(0.5)
-        
         return result
         
+    except BulletinUnavailable as e:
+        result['error'] = str(e)
+        result['unavailable'] = True
+        return result
+    
     except requests.exceptions.Timeout:
         result['error'] = "Request timed out - VCU Bulletin server not responding"
+        _remember_failure(prefix, result['error'])
+        result['unavailable'] = True
         return result
     
     except requests.exceptions.HTTPError as e:
@@ -325,14 +1159,21 @@ def scrape_course_data(prefix, number, use_cache=True):
             result['error'] = f"URL not found - bulletin structure may have changed: {url}"
         else:
             result['error'] = f"HTTP error {e.response.status_code}: {str(e)}"
+        if is_outage(e):
+            _remember_failure(prefix, result['error'])
+            result['unavailable'] = True
+        # Otherwise the server answered (e.g. 404 for an unknown prefix): a definitive miss
         return result
     
     except requests.exceptions.RequestException as e:
         result['error'] = f"Network error: {str(e)}"
+        _remember_failure(prefix, result['error'])
+        result['unavailable'] = True
         return result
     
     except Exception as e:
         result['error'] = f"Parsing error: {str(e)}"
+        result['unavailable'] = True
         return result
 
 
@@ -345,12 +1186,19 @@ def clear_cache():
     _bulletin_cache.clear()
 
 
+def sweep_cache(vacuum=False):
+    """Remove expired entries from the bulletin cache"""
+    return _bulletin_cache.sweep(vacuum=vacuum)
+
+
+def get_circuit_breaker_stats():
+    """Get circuit breaker state and counters for monitoring"""
+    return _circuit_breaker.stats()
+
+
 def get_cache_stats():
-    """Get cache statistics for monitoring"""
-    return {
-        'entries': len(_bulletin_cache.cache),
-        'courses': list(_bulletin_cache.cache.keys())
-    }
+    """Get cache counters (hits, misses, evictions, expirations, size) for monitoring"""
+    return _bulletin_cache.stats()
 
 
 # ============================================================================